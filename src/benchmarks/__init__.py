@@ -0,0 +1,54 @@
+"""Wall-clock benchmarks, kept apart from the unit tests.
+
+The unit tests only assert behaviour. How long something takes depends on
+the machine, so timings are measured and printed here instead, and nothing
+is asserted. Run all benchmarks, or some of them by name, from the src
+directory:
+
+    python -m benchmarks
+    python -m benchmarks statement_cache
+    python -m benchmarks.statement_cache
+
+Every module in BENCHMARKS has a `main()` that prints its measurements.
+The module names do not start with "test", so pytest does not collect them.
+"""
+
+import time
+
+BENCHMARKS = (
+    "statement_cache",
+    "series_storage",
+    "recurrence",
+    "habit_dates",
+    "completion_index",
+    "output_formats",
+    "cli",
+    "startup",
+    "prompt_construction",
+)
+
+
+def best_of(function, repeat=5):
+    """Return the fastest of `repeat` timed calls of `function`, in seconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(label, seconds):
+    """Print one measurement, in milliseconds."""
+    print(f"    {label:<60} {seconds * 1000:10.1f} ms")
+
+
+def report_each(label, seconds, count):
+    """Print the time of one of `count` operations that took `seconds`, in microseconds."""
+    print(f"    {label:<60} {seconds / count * 1e6:10.1f} us")
+
+
+def report_rate(label, seconds, count):
+    """Print how many thousand items per second `count` items in `seconds` are."""
+    print(f"    {label:<60} {count / seconds / 1000:10.0f} k/s")
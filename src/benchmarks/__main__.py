@@ -0,0 +1,21 @@
+import importlib
+import sys
+
+from benchmarks import BENCHMARKS
+
+
+def main(names=None):
+    """Run the named benchmarks, or all of them.
+
+    Args:
+        names (list[str], optional): Modules from BENCHMARKS.
+    """
+    for name in names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            raise SystemExit(f"unknown benchmark '{name}', expected one of {', '.join(BENCHMARKS)}")
+        print(name)
+        importlib.import_module(f"benchmarks.{name}").main()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
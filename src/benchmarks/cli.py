@@ -0,0 +1,32 @@
+"""Headless bulk load and listing through the real cli.py entry point."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import report
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HABITS = 10_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, PYTHONPATH=SRC_DIR)
+        command = [sys.executable, os.path.join(SRC_DIR, "cli.py"), "--db", os.path.join(directory, "habit.db")]
+        rows = "".join(f"habit {number},2060-01-01 07:{number % 60:02d}:00,00:30:00\n" for number in range(HABITS))
+
+        started = time.perf_counter()
+        subprocess.run(command + ["add", "--file", "-"], input=rows, env=env, text=True, check=True,
+                       stdout=subprocess.DEVNULL, timeout=120)
+        report(f"cli.py add --file - of {HABITS} habits", time.perf_counter() - started)
+        started = time.perf_counter()
+        subprocess.run(command + ["list"], env=env, stdin=subprocess.DEVNULL, check=True,
+                       stdout=subprocess.DEVNULL, timeout=120)
+        report(f"cli.py list of {HABITS} habits", time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Building a PrefixIndex of 100k habit names and completing prefixes in it."""
+
+import time
+
+from benchmarks import report, report_each
+from services.completion_index import PrefixIndex
+
+NAMES = 100_000
+LOOKUPS = 1000
+
+
+def main():
+    names = [f"habit {number:06d} {'abcdefghij'[number % 10]}" for number in range(NAMES)]
+    started = time.perf_counter()
+    index = PrefixIndex(names)
+    report(f"build from {NAMES} names", time.perf_counter() - started)
+
+    prefixes = [f"habit {number:04d}" for number in range(LOOKUPS)]
+    started = time.perf_counter()
+    for prefix in prefixes:
+        index.complete(prefix)
+    report_each("one completion", time.perf_counter() - started, LOOKUPS)
+
+
+if __name__ == "__main__":
+    main()
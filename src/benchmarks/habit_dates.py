@@ -0,0 +1,74 @@
+"""Expanding a 12-month pattern by walking Habit dates day by day.
+
+The old Habit.next_day and Habit.weekday round-tripped the start datetime
+through DateTimeHandler strings; the date-native methods work on the
+datetime directly. RecurrenceRule, which AddHabitController uses now,
+skips the walk altogether.
+"""
+
+from datetime import datetime
+
+from benchmarks import best_of, report
+from models.habit import Habit
+from services.handle_time import DateTimeHandler
+from services.recurrence import RecurrenceRule
+
+MONTH = [{"a": ["mon", "wed", "fri"]}, {"skip": None}, {"b": ["tue", "thurs"]}, {"a": ["mon", "wed", "fri"]}]
+PATTERNS = [MONTH] * 12
+START = datetime(2060, 1, 5, 7, 0)
+
+
+def walk(next_day, weekday):
+    """Return the occurrences of PATTERNS found by walking a habit's days."""
+    habit = Habit("gym", START, "01:00:00")
+    occurrences = []
+    for monthly_pattern in PATTERNS:
+        for week_entry in monthly_pattern:
+            week_pattern = list(week_entry.values())[0]
+            if week_pattern is None:
+                next_day(habit, 7)
+                continue
+            for _ in range(7):
+                if weekday(habit) in week_pattern:
+                    occurrences.append(str(habit.get_start_datetime()))
+                next_day(habit, 1)
+    return occurrences
+
+
+def string_round_trip():
+    handler = DateTimeHandler()
+
+    def next_day(habit, days):
+        handler.set_start_datetime(habit.stringify_datetime(habit.get_start_datetime()))
+        handler.increase_by_day(days)
+        habit.set_start_datetime(handler.get_startdatetime())
+
+    def weekday(habit):
+        handler.set_start_datetime(habit.stringify_datetime(habit.get_start_datetime()))
+        return handler.get_weekday()
+
+    return walk(next_day, weekday)
+
+
+def date_native():
+    return walk(lambda habit, days: habit.next_day(days), lambda habit: habit.weekday())
+
+
+def recurrence_rule():
+    return [str(moment) for moment in RecurrenceRule.from_patterns(START, PATTERNS).occurrences()]
+
+
+def main():
+    expansions = {
+        "string round-trip": string_round_trip,
+        "date-native Habit": date_native,
+        "RecurrenceRule": recurrence_rule,
+    }
+    if len({tuple(expand()) for expand in expansions.values()}) != 1:
+        raise RuntimeError("the expansions disagree, their timings are not comparable")
+    for label, expand in expansions.items():
+        report(f"12-month expansion, {label}", best_of(expand))
+
+
+if __name__ == "__main__":
+    main()
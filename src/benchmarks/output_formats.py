@@ -0,0 +1,46 @@
+"""Rows per second written by each output format, and a streamed listing."""
+
+import io
+import os
+import tempfile
+import time
+
+from benchmarks import report_rate
+from models.habit import Habit
+from services.habit_factory import HabitFactory
+from services.output_formats import FORMATS, HABIT, get_format
+
+ROWS = 200_000
+BATCH = 500
+LISTED = 20_000
+
+
+def main():
+    batch = [
+        (number, number, f"habit {number}", "2060-01-01 07:00:00", "00:30:00", "UPCOMING", "description", "")
+        for number in range(BATCH)
+    ]
+    batches = [batch] * (ROWS // BATCH)
+    with open(os.devnull, "w") as devnull:
+        for name in FORMATS:
+            started = time.perf_counter()
+            get_format(name, devnull).write_batches(batches, HABIT)
+            report_rate(f"{name}, rows written", time.perf_counter() - started, ROWS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        habit_factory = HabitFactory(os.path.join(directory, "habit.db"))
+        try:
+            habit_factory.add_habits(
+                [Habit(f"habit {number}", "2060-01-01 07:00:00", "00:30:00") for number in range(LISTED)]
+            )
+            out = io.StringIO()
+            started = time.perf_counter()
+            get_format("ndjson", out).write_batches(habit_factory.iter_habit_batches(), HABIT)
+            elapsed = time.perf_counter() - started
+        finally:
+            habit_factory.close()
+    report_rate(f"ndjson listing of {LISTED} habits from the database, rows", elapsed, LISTED)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Getting a prompt session and loading its history, prompt after prompt.
+
+Each prompt of a console needs a session and the command history. This
+times PROMPTS prompts against a 1k and a 100k line history file, two
+ways:
+
+    pooled    AutoCompleter.pooled(...).get_session() and a load of the
+              shared CompactHistory, as the consoles do now: the file is
+              read once, in the first prompt.
+    per-prompt  a new PromptSession with a FileHistory and its load for
+              every prompt, as the consoles used to do: every prompt reads
+              the whole file.
+
+Each way starts from its own copy of the file, since the first
+CompactHistory load compacts the file it reads.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks import report
+from services.word_prediction import AutoCompleter
+
+COMMAND_SETS = 20
+PROMPTS = 50
+
+
+def write_history(path, lines, file_history=False):
+    """Write a history file holding `lines` distinct commands.
+
+    Args:
+        path (str): File to write.
+        lines (int): Number of commands.
+        file_history (bool): Use the format of prompt_toolkit's FileHistory
+            instead of the CompactHistory one.
+    """
+    with open(path, "w") as history_file:
+        for line in range(lines):
+            if file_history:
+                history_file.write(f"\n# 2060-01-01 07:00:00\n+get habits {line}\n")
+            else:
+                history_file.write(f"get habits {line}\n")
+
+
+def load(history):
+    """Load a history the way a prompt session does, returning its strings."""
+    async def drain():
+        return [item async for item in history.load()]
+    return asyncio.run(drain())
+
+
+def commands(lines, prompt):
+    return [f"command {lines} {prompt % COMMAND_SETS}", "clear_screen", "esc"]
+
+
+def pooled(history_file, lines):
+    started = time.perf_counter()
+    for prompt in range(PROMPTS):
+        session = AutoCompleter.pooled(commands(lines, prompt), history_file).get_session()
+        load(session.history)
+    return time.perf_counter() - started
+
+
+def per_prompt(history_file, lines):
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+
+    started = time.perf_counter()
+    for prompt in range(PROMPTS):
+        session = PromptSession(history=FileHistory(history_file))
+        load(session.history)
+    return time.perf_counter() - started
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for lines in (1_000, 100_000):
+            for label, prompts in (("pooled", pooled), ("per-prompt", per_prompt)):
+                history_file = os.path.join(directory, f"{label}_{lines}.txt")
+                write_history(history_file, lines, file_history=prompts is per_prompt)
+                report(f"{PROMPTS} prompts, {lines}-line history, {label}", prompts(history_file, lines))
+
+
+if __name__ == "__main__":
+    main()
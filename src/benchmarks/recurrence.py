@@ -0,0 +1,33 @@
+"""Expanding ten years of 10,000 daily habits with RecurrenceRule.
+
+`expand_rules` builds the 36.5 million start times as one NumPy array;
+`format_datetimes` then turns them into the text the database stores,
+which takes far longer than the expansion itself. Without NumPy both
+fall back to Python lists, and the rule count is reduced accordingly.
+"""
+
+from datetime import datetime, timedelta
+
+from benchmarks import best_of, report
+from services.recurrence import HAS_NUMPY, WEEKDAYS, RecurrenceRule, expand_rules, format_datetimes, weekday_mask
+
+ANCHOR = datetime(2060, 1, 7, 6, 30)
+DAYS = 3652
+
+
+def main():
+    count = 10000 if HAS_NUMPY else 100
+    rules = [
+        RecurrenceRule(ANCHOR + timedelta(minutes=index), [weekday_mask(WEEKDAYS)], repeat=True)
+        for index in range(count)
+    ]
+    end = ANCHOR + timedelta(days=DAYS)
+    _, start_times = expand_rules(rules, end=end)
+    numpy = "NumPy" if HAS_NUMPY else "no NumPy"
+    print(f"    {count} daily rules over {DAYS} days, {len(start_times)} start times, {numpy}")
+    report("expand_rules", best_of(lambda: expand_rules(rules, end=end), repeat=3))
+    report("format_datetimes", best_of(lambda: format_datetimes(start_times), repeat=1))
+
+
+if __name__ == "__main__":
+    main()
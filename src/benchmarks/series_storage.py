@@ -0,0 +1,74 @@
+"""Size and writes of a repeating habit stored as single habits and as a series.
+
+A series stores its name, description, duration and pattern once in
+habit_series, and its occurrences share one habit_content row. Every
+occurrence still has a habit row, which keeps the name and duration for the
+indexes. So the saving is a content row per occurrence, and grows with the
+length of the description.
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+from models.habit import Habit
+from services.habit_factory import HabitFactory
+from services.recurrence import RecurrenceRule, weekday_mask
+
+START = datetime(2060, 1, 1, 7)
+YEARS = 5
+DESCRIPTIONS = {"short": "stretch", "long": "stretch, then a slow 5k along the river and back " * 4}
+
+
+def daily_rule():
+    """Return the rule of a daily habit."""
+    return RecurrenceRule(START, [weekday_mask(["mon", "tue", "wed", "thurs", "fri", "sat", "sun"])], repeat=True)
+
+
+def stored_bytes(db_name):
+    """Return the bytes of a database file, and of its pages in use."""
+    connection = sqlite3.connect(db_name)
+    try:
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        free = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        pages = connection.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        connection.close()
+    return (pages - free) * page_size
+
+
+def store(db_name, description, as_series):
+    """Store five years of a daily habit and return the bytes it added."""
+    habit_factory = HabitFactory(db_name)
+    empty = stored_bytes(db_name)
+    end = START + timedelta(days=365 * YEARS)
+    habit = Habit("Morning stretch", str(START), "00:20:00")
+    habit.content.set_description(description)
+    if as_series:
+        habit_factory.add_series_rule(habit, daily_rule(), [["mon-sun"]], end)
+    else:
+        habits = []
+        for moment in daily_rule().occurrences(end=end):
+            occurrence = Habit("Morning stretch", moment.strftime("%Y-%m-%d %H:%M:%S"), "00:20:00")
+            occurrence.content.set_description(description)
+            habits.append(occurrence)
+        habit_factory.add_habits(habits)
+    habit_factory.close()
+    return stored_bytes(db_name) - empty
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for label, description in DESCRIPTIONS.items():
+            single = store(os.path.join(directory, f"single_{label}.db"), description, False)
+            series = store(os.path.join(directory, f"series_{label}.db"), description, True)
+            print(
+                f"    {YEARS} years daily, {len(description)}-character description:"
+                f" single habits {single / 1024:.0f} KiB, series {series / 1024:.0f} KiB"
+                f" ({series / single:.0%})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Import time of main.py and time until its first prompt.
+
+Both run in a fresh interpreter on an empty database in a temporary
+directory, so nothing cached by this process is measured.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import report
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def subprocess_env(db_path):
+    """Return the environment for running the application on `db_path`."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SRC_DIR, os.path.dirname(SRC_DIR)])
+    env["HABIT_TRACKER_DB"] = db_path
+    env["HABIT_TRACKER_HISTORY"] = os.path.join(os.path.dirname(db_path), "history")
+    return env
+
+
+def main_import_us(db_path):
+    """Return the cumulative `python -X importtime` microseconds of importing main."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        env=subprocess_env(db_path),
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "main":
+            return int(fields[1])
+    raise RuntimeError("main not found in the importtime report")
+
+
+def time_to_first_prompt(db_path, working_directory):
+    """Start main.py, wait for its first prompt, then exit it with 'esc'.
+
+    Returns:
+        tuple: Seconds until the home console was announced and until the
+            first "Enter command" prompt was printed.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SRC_DIR, "main.py")],
+        cwd=working_directory,
+        env=subprocess_env(db_path),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = b""
+    ready = None
+    try:
+        while b"Enter command" not in output:
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"main.py exited before prompting:\n{output.decode(errors='replace')}")
+            output += chunk
+            if ready is None and b"Switched to" in output:
+                ready = time.perf_counter() - started
+        prompted = time.perf_counter() - started
+        process.communicate(b"esc\n", timeout=30)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    return ready, prompted
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "habit.db")
+        report("import main (cumulative -X importtime)", main_import_us(db_path) / 1e6)
+        ready, prompted = time_to_first_prompt(db_path, directory)
+    report("main.py until the home console is ready", ready)
+    # the "Switched to" notice is shown for two seconds before the prompt
+    report("main.py until the first prompt", prompted)
+
+
+if __name__ == "__main__":
+    main()
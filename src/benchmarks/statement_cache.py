@@ -0,0 +1,74 @@
+"""Database searches with and without sqlite3's statement cache.
+
+Every search of Database runs a named statement whose text never changes,
+so sqlite3 compiles it once per connection and reuses it. This runs the
+same searches on a connection opened with `cached_statements=0`, which
+compiles every statement again on each call, like the interpolated queries
+the named statements replaced.
+"""
+
+import functools
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+from benchmarks import best_of, report
+from data.database import Database
+from data.database_interface import DatabaseInterface
+from models.habit import Habit
+
+HABITS = 2000
+SEARCHES = 300
+STATUSES = ("UPCOMING", "DONE", "MISSED", "TO_BE_CONFIRMED")
+WORDS = ("reading", "running", "coding", "cooking", "walking")
+
+
+def fill(db_name):
+    """Create a database of HABITS habits."""
+    db = DatabaseInterface(db_name)
+    habits = []
+    for i in range(HABITS):
+        habit = Habit(f"habit {i}", f"2060-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00", "00:30:00")
+        habit.set_status(STATUSES[i % len(STATUSES)])
+        habit.content.set_description(f"{WORDS[i % len(WORDS)]} session {i}")
+        habits.append(habit)
+    db.add_habits(habits)
+    db.close()
+
+
+def searches(db):
+    """Return the search workloads, one callable per Database method."""
+    return {
+        "get_habits_by_status": lambda: [db.get_habits_by_status(STATUSES[i % 4]) for i in range(SEARCHES)],
+        "get_by_name": lambda: [db.get_by_name(f"habit {i}") for i in range(SEARCHES)],
+        "get_name_with_text": lambda: [db.get_name_with_text(f"bit {i}") for i in range(SEARCHES)],
+        "search_by_content": lambda: [db.search_by_content(WORDS[i % 5]) for i in range(SEARCHES)],
+        "search_by_date": lambda: [db.search_by_date(f"2060-01-{i % 28 + 1:02d}") for i in range(SEARCHES)],
+        "search_by_month": lambda: [db.search_by_month(i % 12 + 1, 2060) for i in range(SEARCHES)],
+    }
+
+
+def measure(db_name):
+    """Time every search workload on a new connection to `db_name`."""
+    db = Database(db_name)
+    try:
+        return {name: best_of(workload) for name, workload in searches(db).items()}
+    finally:
+        db.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db_name = os.path.join(directory, "habit.db")
+        fill(db_name)
+        cached = measure(db_name)
+        with patch("sqlite3.connect", functools.partial(sqlite3.connect, cached_statements=0)):
+            uncached = measure(db_name)
+    for name in cached:
+        report(f"{SEARCHES} x {name}, statement cache", cached[name])
+        report(f"{SEARCHES} x {name}, no statement cache", uncached[name])
+
+
+if __name__ == "__main__":
+    main()
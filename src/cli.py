@@ -0,0 +1,321 @@
+"""Non-interactive command line for scripts, cron jobs and load tests.
+
+main.py runs the interactive consoles; this entry point runs one operation
+and exits, with no banner, prompts or screen clears:
+
+    python cli.py add "Morning run" "2060-01-01 07:00:00" 00:30:00
+    python cli.py add --file habits.csv          # name,start,duration[,description]
+    python cli.py add-series Gym "2060-01-05 18:00:00" 01:00:00 --week mon,wed --week skip
+    python cli.py list --status UPCOMING
+    python cli.py --format ndjson list > habits.ndjson
+    python cli.py search --name run
+    python cli.py update-status
+    python cli.py complete 12 13                 # or no ids: every TO_BE_CONFIRMED habit
+    cut -f1 ids.txt | python cli.py delete --file -
+    python cli.py analytics --name Gym
+
+Operations go straight to HabitFactory, SearchHabit and HabitAnalytics.
+Bulk input is read from a file, or from stdin when the file is "-"; bulk
+adds are written in one transaction. Habit rows are printed in the --format
+chosen (see services.output_formats), tab-separated fields by default; a
+full listing streams batch by batch from the database. The exit status is 0 on success, 1 when an
+operation failed and 2 for invalid arguments.
+"""
+
+import argparse
+import csv
+import sys
+from datetime import datetime
+
+from models.habit import Habit
+from services.habit_factory import HabitFactory
+from services.output_formats import CONTENT, FORMATS, HABIT, get_format
+from services.recurrence import RecurrenceRule, weekday_mask
+
+SKIP = "skip"
+
+
+class CommandError(Exception):
+    """An operation failed; the message is reported on stderr."""
+
+
+def open_input(path, stdin):
+    """Return the lines of a bulk input file, or of stdin when `path` is "-"."""
+    if path == "-":
+        return stdin
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_rows(path, stdin):
+    """Read CSV rows from a bulk input, skipping blank lines and # comments."""
+    source = open_input(path, stdin)
+    try:
+        return [row for row in csv.reader(source) if row and not row[0].lstrip().startswith("#")]
+    finally:
+        if source is not stdin:
+            source.close()
+
+
+def read_ids(ids, path, stdin):
+    """Return habit ids given as arguments and/or one per line of a bulk input."""
+    ids = list(ids)
+    if path:
+        ids.extend(row[0] for row in read_rows(path, stdin))
+    try:
+        return [int(str(id).split()[0]) for id in ids]
+    except (ValueError, IndexError):
+        raise CommandError(f"habit ids must be numbers, got {ids}")
+
+
+def new_habit(name, start_datetime, duration, description=""):
+    """Build a Habit from text fields, checking the start datetime parses."""
+    habit = Habit(name.strip(), start_datetime.strip(), duration.strip())
+    if not isinstance(habit.get_start_datetime(), datetime):
+        raise CommandError(f"invalid start datetime '{start_datetime}' for '{name}'")
+    habit.content.set_description(description)
+    return habit
+
+
+def habit_from_row(row):
+    """Rebuild the Habit of an entry row, as HabitFactory.delete_habit expects it."""
+    id, _, name, start_datetime, duration, status, description, reflections = row[:8]
+    habit = Habit(name, start_datetime, duration, id)
+    habit.content.set_description(description)
+    habit.content.set_reflections(reflections)
+    habit.set_status(status)
+    return habit
+
+
+def rows_by_id(habit_factory, ids):
+    """Return {id: entry row} for habit ids, raising CommandError if any is not found.
+
+    Every id is looked up before the caller changes anything, so a missing
+    id fails the whole command instead of stopping it halfway.
+    """
+    rows = {}
+    missing = []
+    for id in dict.fromkeys(ids):
+        row = habit_factory.get_habit(id)
+        if not row or row[0] == "error":
+            missing.append(str(id))
+        else:
+            rows[id] = row
+    if missing:
+        raise CommandError(f"habit{'s' if len(missing) > 1 else ''} {', '.join(missing)} not found")
+    return rows
+
+
+def checked(result):
+    """Return the value of a ("success", value) result, raising CommandError otherwise."""
+    status, value = result
+    if status != "success":
+        raise CommandError(str(value))
+    return value
+
+
+# -------------------- Commands --------------------
+
+def run_add(args, habit_factory, stdin, out):
+    """Add one habit from arguments, or many from a bulk input in one transaction."""
+    if args.file:
+        rows = read_rows(args.file, stdin)
+        if any(len(row) < 3 for row in rows):
+            raise CommandError("expected rows of name,start_datetime,duration[,description]")
+        habits = [new_habit(*row[:4]) for row in rows]
+    elif args.name and args.start_datetime and args.duration:
+        habits = [new_habit(args.name, args.start_datetime, args.duration, args.description)]
+    else:
+        raise CommandError("give name, start datetime and duration, or --file")
+    # the row count covers habit and content rows alike
+    checked(habit_factory.add_habits(habits))
+    out.write(f"added {len(habits)} habit(s)\n")
+
+
+def run_add_series(args, habit_factory, stdin, out):
+    """Add a repeating habit as one series from weekly patterns."""
+    habit = new_habit(args.name, args.start_datetime, args.duration, args.description)
+    try:
+        week_masks = [
+            0 if week == SKIP else weekday_mask(day.strip() for day in week.split(","))
+            for week in args.week
+        ]
+    except ValueError as e:
+        raise CommandError(str(e))
+    until = None
+    if args.until:
+        until = new_habit(args.name, args.until, args.duration).get_start_datetime()
+    rule = RecurrenceRule(habit.get_start_datetime(), week_masks, repeat=until is not None)
+    series_id, ids = checked(habit_factory.add_series_rule(habit, rule, args.week, until))
+    out.write(f"added series {series_id} with {len(ids)} habit(s)\n")
+
+
+def run_list(args, habit_factory, stdin, out):
+    """Print every habit, or those with one status."""
+    output = get_format(args.format, out)
+    if args.status:
+        output.write(habit_factory.get_habits_by_status(args.status.upper()), HABIT)
+        return
+    output.write_batches(
+        habit_factory.iter_habit_batches(order_by=args.order), HABIT, count=habit_factory.count_habits()
+    )
+
+
+def run_search(args, habit_factory, stdin, out):
+    """Print the habits matching one search."""
+    from components.search_habit.controller.search_habit_controller import SearchHabit
+
+    search_habit = SearchHabit(habit_factory)
+    shape = HABIT
+    if args.name is not None:
+        rows = search_habit.search_by_name(args.name)
+        # an exact name match comes back as a single row
+        rows = [rows] if isinstance(rows, tuple) else rows
+    elif args.content is not None:
+        rows = search_habit.search_by_content(args.content, highlight=True)
+        shape = CONTENT
+    elif args.date is not None:
+        rows = checked(search_habit.search_by_date(args.date))
+    elif args.month is not None:
+        month, year = args.month
+        if not 1 <= month <= 12:
+            raise CommandError(f"month must be between 1 and 12, got {month}")
+        rows = checked(search_habit.search_by_month(month, year))
+    else:
+        rows = search_habit.search_by_status(args.status.upper())
+    get_format(args.format, out).write(rows, shape)
+
+
+def run_update_status(args, habit_factory, stdin, out):
+    """Move open habits to the status matching their schedule."""
+    transitions = checked(habit_factory.update_statuses(full=args.full))
+    for (old_status, new_status), count in sorted(transitions.items()):
+        out.write(f"{old_status} -> {new_status}\t{count}\n")
+
+
+def run_complete(args, habit_factory, stdin, out):
+    """Mark TO_BE_CONFIRMED habits as DONE: the given ids, or all of them.
+
+    Nothing is completed when any given id is missing or not TO_BE_CONFIRMED.
+    """
+    ids = read_ids(args.ids, args.file, stdin)
+    if not ids and not args.file:
+        ids = [row[0] for row in habit_factory.get_habits_by_status("TO_BE_CONFIRMED")]
+    rows = rows_by_id(habit_factory, ids)
+    not_confirmable = [f"{id} is {row[5]}" for id, row in rows.items() if row[5] != "TO_BE_CONFIRMED"]
+    if not_confirmable:
+        raise CommandError(f"only TO_BE_CONFIRMED habits can be completed: {', '.join(not_confirmable)}")
+    for id in rows:
+        checked(habit_factory.update_habit("habit", id, status="DONE"))
+    out.write(f"completed {len(rows)} habit(s)\n")
+
+
+def run_delete(args, habit_factory, stdin, out):
+    """Delete habits by id; nothing is deleted when any id is not found."""
+    rows = rows_by_id(habit_factory, read_ids(args.ids, args.file, stdin))
+    for row in rows.values():
+        checked(habit_factory.delete_habit(habit_from_row(row)))
+    out.write(f"deleted {len(rows)} habit(s)\n")
+
+
+def run_analytics(args, habit_factory, stdin, out):
+    """Print the longest streak of every habit name, or the statistics of one."""
+    from components.analytics.view.analytics_habit_view import HabitAnalytics
+
+    analytics = HabitAnalytics(habit_factory)
+    if args.name:
+        habits = sorted(habit_factory.get_by_name(args.name), key=lambda row: str(row[3]))
+        out.write(f"longest streak\t{analytics.longest_streak(habits)}\n")
+        out.write(f"latest streaks\t{analytics.latest_streak(habits)}\n")
+        out.write(f"completion rate\t{analytics.completion_rate(habits)}\n")
+        return
+    for name, streak in sorted(analytics.longest_streaks_by_name().items()):
+        out.write(f"{name}\t{streak}\n")
+
+
+# -------------------- Parser --------------------
+
+def build_parser():
+    """Return the argument parser of every subcommand."""
+    parser = argparse.ArgumentParser(prog="cli.py", description="Habit tracker batch commands.")
+    parser.add_argument("--db", help="SQLite database file (default: the configured path)")
+    parser.add_argument("--format", choices=list(FORMATS), default="tsv", help="how list and search print habits")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add habits")
+    add.add_argument("name", nargs="?")
+    add.add_argument("start_datetime", nargs="?", help='"YYYY-MM-DD HH:MM:SS"')
+    add.add_argument("duration", nargs="?", help="HH:MM:SS")
+    add.add_argument("--description", default="")
+    add.add_argument("--file", help="CSV rows name,start_datetime,duration[,description]; - for stdin")
+    add.set_defaults(run=run_add)
+
+    add_series = commands.add_parser("add-series", help="add a repeating habit")
+    add_series.add_argument("name")
+    add_series.add_argument("start_datetime", help='"YYYY-MM-DD HH:MM:SS", start of the first week')
+    add_series.add_argument("duration", help="HH:MM:SS")
+    add_series.add_argument("--description", default="")
+    add_series.add_argument(
+        "--week", action="append", required=True,
+        help="weekdays of one 7-day slot, e.g. mon,wed, or 'skip'; repeat for each slot",
+    )
+    add_series.add_argument("--until", help="repeat the slots until this datetime instead of once")
+    add_series.set_defaults(run=run_add_series)
+
+    listing = commands.add_parser("list", help="list habits")
+    listing.add_argument("--status")
+    listing.add_argument("--order", choices=["id", "start_datetime"], default="id")
+    listing.set_defaults(run=run_list)
+
+    search = commands.add_parser("search", help="search habits")
+    criteria = search.add_mutually_exclusive_group(required=True)
+    criteria.add_argument("--name")
+    criteria.add_argument("--content")
+    criteria.add_argument("--date", help="YYYY-MM-DD")
+    criteria.add_argument("--month", nargs=2, type=int, metavar=("MONTH", "YEAR"))
+    criteria.add_argument("--status")
+    search.set_defaults(run=run_search)
+
+    update_status = commands.add_parser("update-status", help="apply due status transitions")
+    update_status.add_argument("--full", action="store_true", help="re-examine every open habit")
+    update_status.set_defaults(run=run_update_status)
+
+    for name, run, description in (
+        ("complete", run_complete, "mark TO_BE_CONFIRMED habits as DONE (default: all of them)"),
+        ("delete", run_delete, "delete habits"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("ids", nargs="*")
+        command.add_argument("--file", help="habit ids, one per line; - for stdin")
+        command.set_defaults(run=run)
+
+    analytics = commands.add_parser("analytics", help="streaks and completion rates")
+    analytics.add_argument("--name", help="statistics of one habit name")
+    analytics.set_defaults(run=run_analytics)
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    """Run one batch command.
+
+    Args:
+        argv (list[str], optional): Arguments; defaults to sys.argv[1:].
+        stdin, stdout, stderr (file, optional): Streams; default to sys's.
+
+    Returns:
+        int: Exit status, 0 on success and 1 when the operation failed.
+    """
+    stdin, stdout, stderr = stdin or sys.stdin, stdout or sys.stdout, stderr or sys.stderr
+    args = build_parser().parse_args(argv)
+    habit_factory = HabitFactory(args.db)
+    try:
+        args.run(args, habit_factory, stdin, stdout)
+    except (CommandError, OSError) as e:
+        stderr.write(f"{args.command}: {e}\n")
+        return 1
+    finally:
+        habit_factory.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
+from datetime import datetime
+
 from components.add_habit.view.add_habit_view import AddHabitView
 from services.habit_factory import HabitFactory, Habit
 from services.handle_time import DateTimeHandler
+from services.recurrence import RecurrenceRule
 
 
 class AddHabitController:
@@ -35,7 +38,8 @@ class AddHabitController:
         3. If repetition patterns were defined:
            - Generate repeated habit instances according to
              ordered monthly and weekly patterns.
-           - Store generated habits in the database.
+           - Store generated habits in the database, as one habit series
+             when there is more than one occurrence.
         """
         print('here')
         self.add_habit_view.execute()
@@ -55,24 +59,58 @@ class AddHabitController:
 
         # Generate repeated habits if patterns were defined
         if self.add_habit_view.save_called:
-            for monthly_pattern in self.add_habit_view.habit_time_repeats_view.ordered_monthly_patterns:
-                for week_entry in monthly_pattern:
-                    week_pattern = list(week_entry.values())[0]
-                    print("week begins--------------",week_pattern,habit.weekday())
-                    # Iterate through a 7-day window per week pattern
-                    for _ in range(7):
-                        # Skip empty weeks
-                        if week_pattern is None:
-                            habit.next_day(7)
-                            break
-
-                        print(habit.weekday(),week_pattern,habit.weekday() in week_pattern)
-                        # Save habit only if weekday matches the pattern
-                        if habit.weekday() in week_pattern:
-                            self.habit_factory.add_habit(habit)
-                    
-                        habit.next_day()
-                    print('end week')
+            rule = self.recurrence_rule(habit)
+            if rule.count() > 1:
+                # repeating habits store their shared definition once and are
+                # expanded straight into rows
+                self.habit_factory.add_series_rule(
+                    habit,
+                    rule,
+                    self.add_habit_view.habit_time_repeats_view.ordered_monthly_patterns,
+                )
+            else:
+                self.habit_factory.add_habits(self.expand_patterns(habit))
+
+    def recurrence_rule(self, habit):
+        """
+        Compile the ordered monthly patterns into a RecurrenceRule anchored
+        at the habit's start datetime.
+
+        Args:
+            habit (Habit): The base habit.
+
+        Returns:
+            RecurrenceRule: The compiled rule.
+        """
+        start = habit.get_start_datetime()
+        if not isinstance(start, datetime):
+            start = datetime.strptime(str(start), "%Y-%m-%d %H:%M:%S")
+        return RecurrenceRule.from_patterns(
+            start, self.add_habit_view.habit_time_repeats_view.ordered_monthly_patterns
+        )
+
+    def expand_patterns(self, habit):
+        """
+        Expand the ordered monthly patterns into one Habit per occurrence.
+
+        Every week entry of every ordered monthly pattern covers a 7-day
+        window, starting from the habit's start datetime, and keeps the days
+        whose weekday is part of that week's pattern. Empty ('skip') weeks
+        produce nothing.
+
+        Args:
+            habit (Habit): The base habit.
+
+        Returns:
+            list[Habit]: One new Habit object per matching day, ready to be
+                saved with HabitFactory.add_habits.
+        """
+        occurrences = []
+        for start in self.recurrence_rule(habit).occurrences():
+            occurrence = Habit(habit.get_name(), start, habit.get_duration())
+            occurrence.content.set_description(habit.content.get_description())
+            occurrences.append(occurrence)
+        return occurrences
 
 
 if __name__ == '__main__':
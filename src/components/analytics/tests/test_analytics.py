@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import MagicMock
 from ..view.analytics_habit_view import HabitAnalytics
 
 class TestAnalytics(unittest.TestCase):
@@ -21,5 +22,19 @@ class TestAnalytics(unittest.TestCase):
         ]
         self.assertEqual(analytics.completion_rate(habits), "66.66666666666666%, Missed=1, Done=2")
 
+    def test_longest_streaks_by_name(self):
+        analytics = HabitAnalytics()
+        habits = [
+            (1,None,"A","2025-01-03",None,"DONE"),
+            (2,None,"B","2025-01-01",None,"DONE"),
+            (3,None,"A","2025-01-01",None,"DONE"),
+            (4,None,"A","2025-01-02",None,"MISSED"),
+            (5,None,"A","2025-01-04",None,"DONE"),
+            (6,None,"B","2025-01-05",None,"UPCOMING"),
+        ]
+        analytics.habit_factory = MagicMock()
+        analytics.habit_factory.iter_habits.return_value = iter(sorted(habits, key=lambda habit:habit[3]))
+        self.assertEqual(analytics.longest_streaks_by_name(), {"A": 2, "B": 1})
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,20 @@
-from src.components.get_habit.view.get_habit_view import GetHabitView
-from src.components.search_habit.controller.search_habit_controller import SearchHabit, HabitFactory
+from services.habit_factory import HabitFactory
 from itertools import groupby
 
 class HabitAnalytics:
-    def __init__(self):
-        self.habit_factory = HabitFactory()
-        self.habits = self.habit_factory.get_habits()
-        self.habits.sort(key=lambda habit:habit[3])
+    def __init__(self, habit_factory=None):
+        self.__habit_factory = habit_factory
+
+    @property
+    def habit_factory(self):
+        """HabitFactory: Opened on first use, so building the analytics is free."""
+        if self.__habit_factory is None:
+            self.__habit_factory = HabitFactory()
+        return self.__habit_factory
+
+    @habit_factory.setter
+    def habit_factory(self, habit_factory):
+        self.__habit_factory = habit_factory
 
     def streaks(self,habits):
         all_statuses = [record[5] for record in habits]
@@ -31,7 +39,7 @@ class HabitAnalytics:
         return min(habit_streaks)
 
     def get_habit_names(self):
-        return {habit[2] for habit in self.habit_factory.get_habits()}
+        return {habit[2] for habit in self.habit_factory.iter_habits()}
 
     def completion_rate(self,habits):
         missed_sessions = list(filter(lambda habit:habit[5]=="MISSED",habits))
@@ -41,12 +49,21 @@ class HabitAnalytics:
         rate = (len(done_sessions)/total)*100
         return f"{rate}%, Missed={len(missed_sessions)}, Done={len(done_sessions)}"
 
+    def longest_streaks_by_name(self):
+        # single chronological pass over the stored habits, keeping only a running
+        # and a best streak per habit name instead of every record in memory
+        current_streaks = {}
+        longest_streaks = {}
+        for record in self.habit_factory.iter_habits(order_by="start_datetime"):
+            name, status = record[2], record[5]
+            if status == "UPCOMING":
+                continue
+            current_streaks[name] = current_streaks.get(name, 0) + 1 if status == "DONE" else 0
+            longest_streaks[name] = max(longest_streaks.get(name, 0), current_streaks[name])
+        return longest_streaks
+
     def habit_with_longest_streak(self):
-        habit_names = self.get_habit_names()
-        habit_names_long_streaks = { 
-            habit_name: self.longest_streak(self.habit_factory.get_name_with_text(habit_name))
-            for habit_name in habit_names
-        }
+        habit_names_long_streaks = self.longest_streaks_by_name()
         if len(habit_names_long_streaks) == 0: return "0%"
 
         highest_streak = max(habit_names_long_streaks.values())
@@ -57,9 +74,10 @@ class HabitAnalytics:
         # if 
         self.habit_factory.get_name_with_text(habit_name)
 
-x = HabitAnalytics()
-# print(habit_with_longest_streak())
-print(x.habit_with_longest_streak())
+if __name__ == "__main__":
+    x = HabitAnalytics()
+    # print(habit_with_longest_streak())
+    print(x.habit_with_longest_streak())
 
 
 # current_streak
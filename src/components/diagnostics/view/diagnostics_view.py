@@ -0,0 +1,48 @@
+"""View reporting the active database configuration.
+
+DiagnosticsView prints which database file the application is using, the
+selected performance profile (see data.config) and the pragma values that
+are actually in effect on the connection, so a deployment can be checked
+without opening the database by hand. It also lists how often each SQL
+statement ran in this session and how long it took (see data.queries).
+"""
+
+from services.colors import Colors
+from services.habit_factory import HabitFactory
+
+
+class DiagnosticsView:
+    """Prints database diagnostics to the console.
+
+    Attributes:
+        color (Colors): Terminal color helper.
+        habit_factory (HabitFactory): Source of the diagnostic information.
+    """
+
+    def __init__(self):
+        self.color = Colors()
+        self.habit_factory = HabitFactory()
+
+    def display_diagnostics(self):
+        """Print the database path, profile, schema version, pragma values and statement counters."""
+        diagnostics = self.habit_factory.diagnostics()
+        WHITE = self.color.choose_color("WHITE")
+        HELP = self.color.choose_color("HELP")
+        SUCCESSFUL = self.color.choose_color("SUCCESSFUL")
+
+        print(f"{WHITE}{'-'*107}")
+        print(f"    {HELP}database       {WHITE}: {SUCCESSFUL}{diagnostics['db_path']}")
+        print(f"    {HELP}profile        {WHITE}: {SUCCESSFUL}{diagnostics['profile']}")
+        print(f"    {HELP}schema version {WHITE}: {SUCCESSFUL}{diagnostics['schema_version']}")
+        for name, value in diagnostics["pragmas"].items():
+            print(f"    {HELP}{name:<15}{WHITE}: {SUCCESSFUL}{value}")
+        statements = diagnostics.get("statements", {})
+        if statements:
+            print(f"{WHITE}{'-'*107}")
+            print(f"    {HELP}{'statement':<40}{'calls':>8}{'hits':>8}{'total ms':>12}{'mean ms':>10}")
+            for name, counters in sorted(statements.items(), key=lambda item: -item[1]["total_ms"]):
+                print(
+                    f"    {WHITE}{name:<40}{SUCCESSFUL}{counters['calls']:>8}{counters['hits']:>8}"
+                    f"{counters['total_ms']:>12.2f}{counters['mean_ms']:>10.3f}"
+                )
+        print(f"{WHITE}{'-'*107}")
@@ -14,6 +14,7 @@ from components.search_habit.controller.search_habit_controller import (
     SearchHabit,
     HabitFactory
 )
+from services.output_formats import get_format, HABIT, HABIT_DETAILS, CONTENT
 
 
 class GetHabitView:
@@ -25,15 +26,21 @@ class GetHabitView:
     delegates searches to controller classes, and displays formatted results.
     """
 
-    def __init__(self):
+    def __init__(self, output_format=None):
         """
         Initializes the GetHabitView.
 
         Sets up color formatting, search controllers, internal state,
         and result storage for subsequent search operations.
+
+        Args:
+            output_format (str, optional): How results are written, one of
+                services.output_formats.FORMATS. Defaults to the
+                HABIT_TRACKER_OUTPUT environment variable, then "pretty".
         """
         self.color = Colors()
         self._init_colors()
+        self.output = get_format(output_format)
 
         self.search_habit = SearchHabit()
         self.habit_factory = HabitFactory()
@@ -105,54 +112,24 @@ class GetHabitView:
 
     def display_results(self):
         """
-        Displays summarized habit search results in formatted CLI output.
+        Displays summarized habit search results in the output format.
 
         Shows habit id, name, start datetime, duration, and status.
         If no results exist, a 'No results found' message is printed.
         """
-        results = self._normalize_results()
-
-        print(f"{'-'*107}")
-        print(f"{self.HELP}RESULTS {self.WHITE}: {self.SUCCESSFUL}{len(results)}")
-        print(f"{'-'*107}")
-
-        if not results:
-            print(self.UNSUCCESSFUL + "No results found!")
-            print(f"{'-'*107}")
-            return
-
-        for r in results:
-            print(self.BACK.CYAN + " " * 107, end="")
-            print(f"""{self.WHITE}
-    id             : {r[0]}
-    name           : {r[2]}
-    start datetime : {self.HELP + r[3] + self.WHITE}
-    duration       : {self.SUCCESSFUL + r[4] + self.WHITE}
-    status         : {r[5]}
-""")
-        print(f"{'-'*107}")
+        self.output.write(self._normalize_results(), HABIT)
 
     def content_display_results(self):
         """
-        Displays content-based search results.
+        Displays content-based search results in the output format.
 
-        Shows habit id, description, and reflection fields.
-        Used when searching by textual content.
+        Shows habit id, description, and reflection fields, followed by the
+        habit name and a highlighted snippet of the match when the search
+        returned them. Used when searching by textual content.
         """
-        results = self._normalize_results()
-        if not results:
-            print("No results found!")
-            return
-
-        for r in results:
-            print(self.BACK.CYAN + " " * 107, end="")
-            print(f"""
-    id             : {r[0]}
-    description    : {r[1]}
-    reflection     : {r[2]}
-""")
+        self.output.write(self._normalize_results(), CONTENT)
 
-    def _simple_search(self, prompt_msg, validator, search_function, display_function):
+    def _simple_search(self, prompt_msg, validator, search_function, display_function, completion_kinds=()):
         """
         Generic wrapper for simple search flows.
 
@@ -162,10 +139,13 @@ class GetHabitView:
         - Calling search function
         - Displaying results
 
+        Args:
+            completion_kinds (tuple): Kinds of stored value offered as completions.
+
         Returns:
             tuple: (command, message, success)
         """
-        command = prompt_input_for_commands(prompt_msg)
+        command = prompt_input_for_commands(prompt_msg, completion_kinds=completion_kinds)
 
         if command == "esc":
             ManageMainLoop.consoles.pop()
@@ -206,7 +186,8 @@ class GetHabitView:
             message,
             validator,
             self.search_habit.search_by_name,
-            self.display_results
+            self.display_results,
+            completion_kinds=("name",),
         )
 
     @run_until_successful
@@ -226,7 +207,7 @@ class GetHabitView:
         return self._simple_search(
             message,
             validator,
-            self.search_habit.search_by_content,
+            lambda content: self.search_habit.search_by_content(content, highlight=True),
             self.content_display_results
         )
 
@@ -325,7 +306,7 @@ class GetHabitView:
         Prints all stored fields including description and reflection.
         """
         message = "Enter habit id: "
-        habit_id = prompt_input_for_commands(message)
+        habit_id = prompt_input_for_commands(message, completion_kinds=("id",))
 
         if habit_id == "esc":
             ManageMainLoop.consoles.pop()
@@ -339,18 +320,7 @@ class GetHabitView:
         if not result:
             return habit_id, "No results found!", True
 
-        print(f"{'-'*107}")
-        print(self.HELP + "RESULTS " + self.WHITE + ": " + self.SUCCESSFUL + "1")
-        print(f"{'-'*107}")
-        print(self.BACK.CYAN + " " * 107)
-        print(f"""    id             : {result[1]}
-    name           : {result[2]}
-    start datetime : {result[3]}
-    duration       : {result[4]}
-    description    : {result[6]}
-    reflection     : {result[7]}
-    status         : {result[5]}
-{self.WHITE}{'-'*107}""")
+        self.output.write([result], HABIT_DETAILS)
 
         return habit_id, "success", True
 
@@ -368,7 +338,8 @@ class GetHabitView:
             tuple: (command, message, success)
         """
         habit_id = prompt_input_for_commands(
-            f"Enter the id of what you decided to {method_name}: "
+            f"Enter the id of what you decided to {method_name}: ",
+            completion_kinds=("id",),
         )
 
         if habit_id == "esc":
@@ -396,9 +367,15 @@ is not an upcoming event, you can only modify an upcoming event""", False
     def get_habits_display(self):
         """
         Retrieves and displays all stored habits.
+
+        Habits are streamed from the database in batches instead of being
+        loaded into memory at once, and each batch is written in one go.
         """
-        self.search_results = self.habit_factory.get_habits()
-        self.display_results()
+        self.output.write_batches(
+            self.habit_factory.iter_habit_batches(),
+            HABIT,
+            count=self.habit_factory.count_habits(),
+        )
         ManageMainLoop.consoles.pop()
 
 
@@ -14,11 +14,12 @@ Typical usage:
     view = HabitTimeRepeatsView()
     view.execute()
 
-This file only contains presentation and interaction logic; it does not
-perform database operations.
+Patterns are saved through a PatternRepository as soon as they are created,
+edited or deleted, so they are available to every habit and later sessions.
 """
 
 from services.colors import Colors
+from services.pattern_repository import PatternRepository
 from services.inputs import ManageMainLoop,run_until_successful,command_once,prompt_input_for_commands,display_habit, unsuccessful
 
 
@@ -37,9 +38,11 @@ class HabitTimeRepeatsView:
         week_pattern_collection (dict): Saved named week patterns.
         ordered_monthly_patterns (list): List of month patterns in user order.
 
+        pattern_repository (PatternRepository): Saved patterns library.
+
     The class methods use the project's input decorators to manage prompting
-    and validation loops. This class contains no persistence logic; it only
-    collects and formats patterns in memory.
+    and validation loops. `week_pattern_collection` and `month_pattern` are
+    loaded from the pattern library and every change is written back to it.
     """
     def __init__(self):
         self.color             = Colors()
@@ -51,6 +54,20 @@ class HabitTimeRepeatsView:
         self.use_auto_go_back   = False
         self.week_pattern_collection = {}
         self.ordered_monthly_patterns = []
+        self.pattern_repository = PatternRepository()
+        self.load_patterns()
+
+    def load_patterns(self, refresh=False):
+        """Load the saved week and month patterns from the pattern library.
+
+        Args:
+            refresh (bool): Re-read the library instead of using its cache,
+                to pick up patterns saved by another view.
+        """
+        if refresh:
+            self.pattern_repository.refresh()
+        self.week_pattern_collection = self.pattern_repository.week_patterns()
+        self.month_pattern = self.pattern_repository.month_patterns()
 
     def set_field_logic(self,field_to_update,month_pattern_to_edit):
         """Handle updating a field for a named week pattern.
@@ -69,7 +86,10 @@ class HabitTimeRepeatsView:
         """
         if field_to_update=="body":
             self.set_week_pattern(False)
-            self.week_pattern_collection.update({month_pattern_to_edit:self.week_pattern})
+            status, result = self.pattern_repository.save_week_pattern(month_pattern_to_edit,self.week_pattern)
+            if status == "error":
+                return '', f"{result}", False
+            self.load_patterns()
             return '','',True
 
         chosen_field = prompt_input_for_commands(f"Enter the new {field_to_update}")
@@ -80,8 +100,10 @@ class HabitTimeRepeatsView:
             return chosen_field, "name already used, use another one...", False
 
         if field_to_update=="title":
-            self.week_pattern_collection.update({chosen_field:self.week_pattern_collection.get(month_pattern_to_edit)})
-            self.week_pattern_collection.pop(month_pattern_to_edit) 
+            status, result = self.pattern_repository.rename_week_pattern(month_pattern_to_edit,chosen_field)
+            if status == "error":
+                return chosen_field, f"{result}", False
+            self.load_patterns()
             return chosen_field, "success",True   
 
     @run_until_successful
@@ -110,6 +132,9 @@ class HabitTimeRepeatsView:
             return command, "name already used, use another one...",False
 
         if command!="esc":
+            status, result = self.pattern_repository.save_week_pattern(command,self.week_pattern)
+            if status == "error":
+                return command, f"{result}", False
             self.week_pattern_collection.update({command:self.week_pattern})
         return command, "success",True
 
@@ -195,7 +220,7 @@ class HabitTimeRepeatsView:
         except Exception:
             return command,"First create a week pattern",False
         
-        week_pattern_to_delete = prompt_input_for_commands("Enter the name of the week pattern: ",self.week_pattern_collection.keys())
+        week_pattern_to_delete = prompt_input_for_commands("Enter the name of the week pattern: ",self.week_pattern_collection.keys(),completion_kinds=("week",))
         
         if week_pattern_to_delete == "esc":
             return week_pattern_to_delete,"", True
@@ -207,6 +232,9 @@ class HabitTimeRepeatsView:
             return command, f"{week_pattern_to_delete} is not found in saved week pattern",False
         
         elif week_pattern_to_delete in self.week_pattern_collection.keys():
+            status, result = self.pattern_repository.delete_week_pattern(week_pattern_to_delete)
+            if status == "error":
+                return command, f"{result}", False
             self.week_pattern_collection.pop(week_pattern_to_delete)
             return command,f"successfully deleted {week_pattern_to_delete}",True
 
@@ -269,7 +297,7 @@ class HabitTimeRepeatsView:
         except Exception:
             return month_pattern,"First create a week pattern",True
 
-        month_pattern = prompt_input_for_commands(f"Enter the pattern of a month from created week patterns : e.g week1 week2 week3 week4\n{self.color.choose_color('WHITE')+self.color.choose_color('DARK')}💡 press space to get the months you have saved. Use the word skip for an empty week",[*self.week_pattern_collection.keys(),'skip','esc'])
+        month_pattern = prompt_input_for_commands(f"Enter the pattern of a month from created week patterns : e.g week1 week2 week3 week4\n{self.color.choose_color('WHITE')+self.color.choose_color('DARK')}💡 press space to get the months you have saved. Use the word skip for an empty week",[*self.week_pattern_collection.keys(),'skip','esc'],completion_kinds=("week",))
 
         if month_pattern == 'clear_screen':
             return month_pattern,"",False
@@ -286,6 +314,9 @@ class HabitTimeRepeatsView:
 
         self.set_month_pattern_name()
         # if self.month_pattern_name=="":
+        status, result = self.pattern_repository.save_month_pattern(self.month_pattern_name,month_pattern)
+        if status == "error":
+            return month_pattern, f"{result}", False
         self.month_pattern.update({self.month_pattern_name:[
             {i:self.week_pattern_collection.get(i,None)} for i in month_pattern
         ]})
@@ -367,7 +398,7 @@ class HabitTimeRepeatsView:
             return '',f"First create a week pattern:Unsuccessful",True
 
         month_pattern_to_edit = prompt_input_for_commands("Enter the name of the month pattern you want to edit: ",[
-        *self.week_pattern_collection.keys()])
+        *self.week_pattern_collection.keys()],completion_kinds=("month",))
 
         if month_pattern_to_edit == 'esc':
             return month_pattern_to_edit,"SKIP DISPLAY",False
@@ -407,7 +438,7 @@ class HabitTimeRepeatsView:
         
         monthly_order = prompt_input_for_commands("Enter the order you want your month patterns to be arranged in: e.g month1 month2 month3",[
             *self.month_pattern.keys()
-        ])
+        ],completion_kinds=("month",))
         monthly_ordered_pattern = [i.strip() for i in monthly_order.split(' ')]
         
         if not all(map(lambda element:element in [*self.month_pattern.keys(),'skip'],monthly_ordered_pattern)):
@@ -447,7 +478,10 @@ class HabitTimeRepeatsView:
 
         Maps user-friendly command strings to internal handler methods and
         delegates to `command_loop` which manages user I/O and navigation.
+        Saved patterns are reloaded first so that names created elsewhere
+        are offered for completion.
         """
+        self.load_patterns(refresh=True)
         commands = {
             "create week pattern": self.set_week_pattern,
             "view week patterns": self.view_week_patterns,
@@ -7,13 +7,23 @@ class SearchHabit:
     Responsibilities:
         - Search habits by various criteria including name, status, content, date, or month.
         - Acts as a layer between the habit database and user-facing commands.
+
+    Content search snippets wrap the matched words in HIGHLIGHT_START and
+    HIGHLIGHT_END, which views replace with their own styling.
     """
 
-    def __init__(self):
+    HIGHLIGHT_START = HabitFactory.HIGHLIGHT_START
+    HIGHLIGHT_END = HabitFactory.HIGHLIGHT_END
+
+    def __init__(self, habit_factory=None):
         """
         Initialize the SearchHabit controller with a HabitFactory instance.
+
+        Parameters:
+            habit_factory (HabitFactory, optional): Factory to search through.
+                A new one on the configured database by default.
         """
-        self.habit_factory = HabitFactory()
+        self.habit_factory = habit_factory or HabitFactory()
 
     def search_by_name(self, name):
         """
@@ -27,9 +37,9 @@ class SearchHabit:
                 - If a habit with the exact name exists, returns the habit tuple.
                 - If no exact match, returns search results containing the name text.
         """
-        for habit in self.habit_factory.get_habits():
-            if habit[2] == name:
-                return habit
+        exact = self.habit_factory.get_by_name(name)
+        if exact:
+            return exact[0]
         return self.habit_factory.get_name_with_text(name)
 
     def search_by_status(self, status):
@@ -44,17 +54,19 @@ class SearchHabit:
         """
         return self.habit_factory.get_habits_by_status(status)
 
-    def search_by_content(self, content):
+    def search_by_content(self, content, highlight=False):
         """
         Search habits by their content (description or reflections).
 
         Parameters:
             content (str): Text to search within habit content.
+            highlight (bool): Include a snippet with the matched words
+                between HIGHLIGHT_START and HIGHLIGHT_END.
 
         Returns:
-            list: List of habits containing the search content.
+            list: List of habits containing the search content, best matches first.
         """
-        return self.habit_factory.db.search_by_content(content)
+        return self.habit_factory.db.search_by_content(content, highlight)
 
     def search_by_date(self, date):
         """
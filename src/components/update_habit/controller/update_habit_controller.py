@@ -37,24 +37,27 @@ class UpdateHabitController:
             id, _, name, start_datetime, duration, status = habit
             self.habit_factory.update_habit(table_name="habit", id=id, status="DONE")
 
-    def update_statuses(self):
+    def update_statuses(self, full=False):
         """
-        Update the status of all habits currently marked as 'UPCOMING'.
+        Update the status of open habits (UPCOMING, TO_BE_CONFIRMED, ONGOING).
 
         Status is determined based on the current datetime and the habit's
-        start datetime and duration. Updates status in the database if it
-        has changed from 'UPCOMING' or is no longer unknown.
+        start datetime and duration, using the same rules as
+        DateTimeHandler.map_time_to_status. Habits are updated by a single
+        set-based statement in the database. Unless `full` is True, only
+        habits that can have changed since the previous sweep are examined.
+
+        Args:
+            full (bool): Re-examine every open habit.
+
+        Returns:
+            dict: Maps (old_status, new_status) to the number of habits moved.
+                Empty if nothing changed or the update failed.
         """
-        habits_to_update = [
-            *self.habit_factory.get_habits_by_status("UPCOMING"),
-            *self.habit_factory.get_habits_by_status("TO_BE_CONFIRMED"),
-            *self.habit_factory.get_habits_by_status("ONGOING")
-            ]
-        for habit_to_update in habits_to_update:
-            id, _, name, start_datetime, duration, status = habit_to_update
-            status = self.datetime_handler.map_time_to_status(start_datetime, duration)
-            if status != "UPCOMING":
-                self.habit_factory.update_habit(table_name="habit", id=id, status=status)
+        message, transitions = self.habit_factory.update_statuses(full=full)
+        if message == "success":
+            return transitions
+        return {}
     
     def view_habit(self):
         """
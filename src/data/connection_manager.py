@@ -0,0 +1,115 @@
+"""Process-wide registry of shared SQLite connections.
+
+Every Database object used to open its own `sqlite3.connect`, so one CLI
+session held around ten connections to the same file, each with its own page
+cache. ConnectionManager hands out one shared connection per database path and
+thread instead. SQLite connections may only be used by the thread that created
+them, which is why the thread is part of the key.
+
+Connections are reference counted: `acquire` increments the count and
+`release` decrements it, closing the connection when it drops to zero. Any
+connection still open when the interpreter exits is closed by `close_all`.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+
+
+class ConnectionManager:
+    """Hands out shared, reference-counted SQLite connections.
+
+    All state lives on the class, so every caller in the process shares the
+    same registry.
+    """
+
+    _connections = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(db_name):
+        """Return the registry key for a database path in the current thread."""
+        path = db_name if db_name == ":memory:" else os.path.abspath(db_name)
+        return path, threading.current_thread()
+
+    @classmethod
+    def acquire(cls, db_name, on_connect=None):
+        """Return the shared connection for a database path in this thread.
+
+        Args:
+            db_name (str): Path of the SQLite database file.
+            on_connect (callable, optional): Called with the connection when it
+                is newly opened, to set pragmas or create tables. It is not
+                called again for callers that reuse the connection. If it
+                raises, the connection is closed and unregistered, and the
+                exception propagates.
+
+        Returns:
+            sqlite3.Connection: The shared connection.
+        """
+        key = cls._key(db_name)
+        with cls._lock:
+            entry = cls._connections.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+            connection = sqlite3.connect(db_name)
+            cls._connections[key] = [connection, 1]
+        if on_connect is not None:
+            try:
+                on_connect(connection)
+            except Exception:
+                with cls._lock:
+                    cls._connections.pop(key, None)
+                connection.close()
+                raise
+        return connection
+
+    @classmethod
+    def release(cls, db_name):
+        """Give back a connection obtained with `acquire`.
+
+        The connection is closed once every holder in this thread released it.
+
+        Args:
+            db_name (str): Path that was passed to `acquire`.
+        """
+        key = cls._key(db_name)
+        with cls._lock:
+            entry = cls._connections.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del cls._connections[key]
+        entry[0].close()
+
+    @classmethod
+    def reference_count(cls, db_name):
+        """Return how many holders share the connection for a path in this thread.
+
+        Args:
+            db_name (str): Path of the SQLite database file.
+
+        Returns:
+            int: Number of outstanding `acquire` calls, 0 if not connected.
+        """
+        entry = cls._connections.get(cls._key(db_name))
+        return entry[1] if entry else 0
+
+    @classmethod
+    def close_all(cls):
+        """Close every registered connection. Registered to run at exit."""
+        with cls._lock:
+            entries = list(cls._connections.values())
+            cls._connections.clear()
+        for connection, _ in entries:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+atexit.register(ConnectionManager.close_all)
@@ -1,5 +1,19 @@
-import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
+from data.migrations import run_migrations, get_schema_version
+from data.connection_manager import ConnectionManager
+from data import config
+from data.queries import (
+    statement_cache,
+    insert_statement,
+    update_statement,
+    delete_statement,
+    max_id_statement,
+    epoch_seconds,
+    epoch_columns,
+    EPOCH_COLUMNS,
+    HIGHLIGHT_START,
+    HIGHLIGHT_END,
+)
 
 class Database:
     """
@@ -10,42 +24,132 @@ class Database:
         - Add, update, delete, and query habit records.
         - Provide utility methods to search habits by status, date, month, or content.
         - Ensures foreign key integrity between `habit` and `habit_content` tables.
+
+    All SQL is declared in data.queries and run by name through the shared
+    StatementCache, with values always passed as parameters.
     """
 
-    def __init__(self, db_name="habit.db") -> None:
+    def __init__(self, db_name=None) -> None:
         """
-        Initialize the database connection and create required tables if they don't exist.
+        Obtain the shared database connection for `db_name` from the ConnectionManager.
+
+        The first Database opened on a file in a thread creates the connection,
+        applies the configured performance profile, creates the required tables
+        and applies any pending schema migrations; later instances reuse that
+        connection.
 
         Args:
-            db_name (str): Name of the SQLite database file. Defaults to "habit.db".
+            db_name (str, optional): Name of the SQLite database file. Defaults to
+                the configured path (see data.config), "habit.db" unless overridden.
         """
-        self.__connect = sqlite3.connect(db_name)
+        self.__db_name = db_name or config.get_db_path()
+        self.__connect = ConnectionManager.acquire(self.__db_name, on_connect=self.__initialise)
         self.__cursor = self.__connect.cursor()
-        self.__connect.execute("PRAGMA foreign_keys = ON")
-        self.__create_tables()
 
-    def __create_table(self, sql_query):
+    def __run(self, statement, parameters=()):
+        """
+        Execute a named statement from data.queries on this object's cursor.
+
+        Args:
+            statement (str): Statement name.
+            parameters (sequence|dict): Values for the placeholders.
+
+        Returns:
+            sqlite3.Cursor: The cursor, ready to fetch results.
+        """
+        return statement_cache.execute(self.__cursor, statement, parameters)
+
+    def __initialise(self, connection):
+        """
+        Prepare a newly opened connection: apply the performance profile, enable
+        foreign keys, create the tables, run the schema migrations and fill in
+        the integer times of habits that lack them.
+
+        Args:
+            connection (sqlite3.Connection): The new connection.
+        """
+        config.apply_pragmas(connection, config.get_pragmas())
+        connection.execute("PRAGMA foreign_keys = ON")
+        self.__create_tables(connection)
+        run_migrations(connection)
+        self.__fill_epoch_columns(connection)
+
+    def __fill_epoch_columns(self, connection):
+        """
+        Compute start_ts, duration_s and end_ts of habits without an end_ts.
+
+        Those are rows written before migration 8 added the columns, or
+        inserted outside Database. Rows that cannot be parsed are left as
+        they are.
+
+        Args:
+            connection (sqlite3.Connection): Connection to update.
+        """
+        cursor = connection.cursor()
+        rows = statement_cache.execute(cursor, "habits_without_end_ts").fetchall()
+        updates = [(*epoch_columns(start, duration), id) for id, start, duration in rows]
+        updates = [update for update in updates if update[2] is not None]
+        if updates:
+            with connection:
+                statement_cache.executemany(cursor, "set_epoch_columns", updates)
+
+    def __with_epoch_columns(self, table_name, field_names, rows):
+        """
+        Append start_ts, duration_s and end_ts to habit rows.
+
+        The integer times are computed here rather than by a trigger, so each
+        row is written once.
+
+        Args:
+            table_name (str): Table the rows go to.
+            field_names (tuple): Column names of the rows.
+            rows (iterable): Value sequences matching `field_names`.
+
+        Returns:
+            tuple: (field_names, rows), extended when the rows are habits
+                with a start_datetime and duration.
+        """
+        if (
+            table_name != "habit"
+            or "start_datetime" not in field_names
+            or "duration" not in field_names
+            or "start_ts" in field_names
+        ):
+            return field_names, rows
+        start = field_names.index("start_datetime")
+        duration = field_names.index("duration")
+        return (
+            (*field_names, *EPOCH_COLUMNS),
+            ((*row, *epoch_columns(row[start], row[duration])) for row in rows),
+        )
+
+    def __create_table(self, connection, sql_query):
         """
         Execute a SQL query to create a single table.
 
         Args:
+            connection (sqlite3.Connection): Connection to create the table on.
             sql_query (str): SQL CREATE TABLE statement.
 
         Returns:
             tuple: ("success", None) on success, ("error", Exception) on failure.
         """
         try:
-            with self.__connect:
-                self.__cursor.execute(sql_query)
+            with connection:
+                connection.execute(sql_query)
                 return "success", None
         except Exception as e:
             return "error", e
 
-    def __create_tables(self):
+    def __create_tables(self, connection):
         """
         Create `habit` and `habit_content` tables if they do not exist.
+
+        Args:
+            connection (sqlite3.Connection): Connection to create the tables on.
         """
         self.__create_table(
+            connection,
             """
             CREATE TABLE IF NOT EXISTS habit_content
             (
@@ -57,6 +161,7 @@ class Database:
         )
 
         self.__create_table(
+            connection,
             """
             CREATE TABLE IF NOT EXISTS habit
             (
@@ -83,18 +188,80 @@ class Database:
         Returns:
             tuple: ("success", lastrowid) on success, ("error", Exception) on failure.
         """
-        values = ",".join(["?" for _ in field_names])
-        fields = ",".join(field_names)
         try:
-            entry_obj = self.__cursor.execute(
-                f"INSERT INTO {table_name} ({fields}) VALUES ({values})",
-                field_values,
-            )
+            field_names, (field_values,) = self.__with_epoch_columns(table_name, tuple(field_names), [field_values])
+            entry_obj = self.__run(insert_statement(table_name, field_names), field_values)
             self.__connect.commit()
             return "success", entry_obj.lastrowid
         except Exception as e:
             return "error", e
 
+    def add_entries(self, entries):
+        """
+        Add many rows to one or more tables inside a single transaction.
+
+        Each table is written with one `executemany` call. If any insert fails
+        the whole batch is rolled back, so either every row is stored or none is.
+
+        The transaction takes the write lock before anything is read. When
+        `entries` is a function it is called inside that transaction, so ids
+        it derives from `get_max_id` cannot also be handed out by a
+        concurrent writer on another connection.
+
+        Args:
+            entries (list|callable): List of (table_name, field_names, rows)
+                tuples, where `rows` is an iterable of value sequences matching
+                `field_names`, or a function without arguments returning that
+                list. Tables are written in the given order.
+
+        Returns:
+            tuple: ("success", row_count) on success, ("error", Exception) on failure.
+        """
+        row_count = 0
+        try:
+            self.__begin_write()
+            try:
+                if callable(entries):
+                    entries = entries()
+                for table_name, field_names, rows in entries:
+                    field_names, rows = self.__with_epoch_columns(table_name, tuple(field_names), rows)
+                    statement_cache.executemany(self.__cursor, insert_statement(table_name, field_names), rows)
+                    row_count += self.__cursor.rowcount
+                self.__connect.commit()
+            except Exception:
+                self.__connect.rollback()
+                raise
+            return "success", row_count
+        except Exception as e:
+            return "error", e
+
+    def __begin_write(self):
+        """
+        Start a transaction holding SQLite's write lock from its first statement.
+
+        BEGIN IMMEDIATE makes other writers wait (up to the profile's
+        busy_timeout) until this transaction ends, so values read inside it
+        stay valid until the commit. A transaction that is already open on
+        the connection is joined instead of nested.
+        """
+        if not self.__connect.in_transaction:
+            self.__connect.execute("BEGIN IMMEDIATE")
+
+    def get_max_id(self, table_name):
+        """
+        Retrieve the highest id currently stored in a table.
+
+        Ids derived from it for new rows are only safe when it is read inside
+        the write transaction that inserts them, see `add_entries`.
+
+        Args:
+            table_name (str): Table to inspect.
+
+        Returns:
+            int: The highest id, or 0 when the table is empty.
+        """
+        return self.__run(max_id_statement(table_name)).fetchone()[0]
+
     def delete_entry(self, table_name, id):
         """
         Delete an entry from a table by its ID.
@@ -107,12 +274,33 @@ class Database:
             tuple: ("success", None) on success, ("error", Exception) on failure.
         """
         try:
-            self.__cursor.execute(f"DELETE FROM {table_name} WHERE id=?", (id,))
+            self.__run(delete_statement(table_name), (id,))
             self.__connect.commit()
             return "success", None
         except Exception as e:
             return "error", e
 
+    def delete_occurrence(self, id, habit_content_id):
+        """
+        Delete a habit that shares its content row with other habits.
+
+        The content row is deleted with the last habit pointing at it.
+
+        Args:
+            id (int): ID of the habit.
+            habit_content_id (int): ID of its content row.
+
+        Returns:
+            tuple: ("success", None) on success, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run(delete_statement("habit"), (id,))
+                self.__run("delete_unused_content", (habit_content_id, habit_content_id))
+            return "success", None
+        except Exception as e:
+            return "error", e
+
     def __make_double_digit(self, month):
         """
         Ensure a month is represented as a two-digit string (e.g., 1 -> '01').
@@ -131,6 +319,12 @@ class Database:
         """
         Update fields of an existing entry in the specified table.
 
+        Changing the start or duration of a habit also updates its integer
+        times, and makes the next status sweep a full one. Editing the
+        content of a series occurrence that shares the content row of its
+        series first gives the occurrence a copy of that row under its own
+        id, so the other occurrences keep theirs.
+
         Args:
             table_name (str): Table to update.
             id (int): ID of the entry to update.
@@ -140,16 +334,25 @@ class Database:
             tuple: ("success", None) on success, ("error", Exception) on failure.
         """
         try:
-            fields = [(f"{field_name}=?", value) for field_name, value in zip(kwargs.keys(), kwargs.values())]
-            field_names = [i[0] for i in fields]
-            field_values = [i[1] for i in fields]
-            self.__cursor.execute(
-                f"UPDATE {table_name} SET {','.join(field_names) if len(field_names) > 1 else field_names[0]} WHERE id=?",
-                [*field_values, id]
-            )
+            rescheduled = table_name == "habit" and ("start_datetime" in kwargs or "duration" in kwargs)
+            if rescheduled:
+                self.__begin_write()
+                current = self.__run("habit_schedule", (id,)).fetchone()
+                if current is not None:
+                    start = kwargs.get("start_datetime", current[0])
+                    duration = kwargs.get("duration", current[1])
+                    kwargs.update(zip(EPOCH_COLUMNS, epoch_columns(start, duration)))
+            if table_name == "habit_content":
+                self.__run("copy_shared_content", (id,))
+                self.__run("own_content", (id,))
+            self.__run(update_statement(table_name, tuple(kwargs)), [*kwargs.values(), id])
+            if rescheduled:
+                # the habit may have moved before the incremental sweep window
+                self.__run("delete_state", (self.__WATERMARK_KEY,))
             self.__connect.commit()
             return "success", None
         except Exception as e:
+            self.__connect.rollback()
             return "error", e
 
     def get_all_entries(self):
@@ -159,9 +362,72 @@ class Database:
         Returns:
             list: List of tuples combining habit and habit_content fields.
         """
-        habits = self.__cursor.execute("SELECT * FROM habit").fetchall()
-        habit_content = self.__cursor.execute("SELECT * FROM habit_content").fetchall()
-        return list(map(lambda habit, content: (*habit, *content[1:]), habits, habit_content))
+        return self.__run(self.__entries_statement("id")).fetchall()
+
+    def iter_all_entries(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits along with their content, one row at a time.
+
+        Args:
+            batch_size (int): Number of rows fetched from SQLite per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Yields:
+            tuple: Habit and habit_content fields, same shape as `get_all_entries`.
+        """
+        for rows in self.iter_entry_batches(batch_size, order_by):
+            yield from rows
+
+    def iter_entry_batches(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits along with their content, one batch at a time.
+
+        Rows are pulled with `fetchmany` on a dedicated cursor, so memory use
+        stays bounded by `batch_size` regardless of the number of habits.
+
+        Args:
+            batch_size (int): Number of rows fetched from SQLite per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Yields:
+            list: Up to `batch_size` tuples shaped like `get_all_entries` rows.
+        """
+        cursor = self.__connect.cursor()
+        try:
+            statement_cache.execute(cursor, self.__entries_statement(order_by))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def count_entries(self):
+        """
+        Count the habits stored in the database.
+
+        Returns:
+            int: Number of habit rows.
+        """
+        return self.__run("count_habits").fetchone()[0]
+
+    def __entries_statement(self, order_by):
+        """
+        Name the habit/habit_content join statement for an ordering.
+
+        Args:
+            order_by (str): Either "id" or "start_datetime".
+
+        Returns:
+            str: Statement name.
+
+        Raises:
+            ValueError: If `order_by` is not a supported ordering.
+        """
+        if order_by not in ("id", "start_datetime"):
+            raise ValueError(f"cannot order entries by '{order_by}'")
+        return f"entries_by_{order_by}"
 
     def get_habits_by_status(self, status):
         """
@@ -173,11 +439,123 @@ class Database:
         Returns:
             list: List of habits with matching status.
         """
-        return self.__cursor.execute(f"SELECT * FROM habit WHERE status = '{status}'").fetchall()
+        return self.__run("habits_by_status", (status,)).fetchall()
+
+    # A habit changes status at its start, at its end and one day after its end,
+    # so one that started more than a day plus its duration before the last
+    # sweep cannot have changed since. The window reaches back that far for
+    # the longest stored duration, and never less than two days.
+    __MIN_SWEEP_LOOKBACK = timedelta(days=2)
+    __WATERMARK_KEY = "last_status_sweep"
+    # highest habit id at the last sweep: rows added later are always swept
+    __LAST_ID_KEY = "last_status_sweep_id"
+
+    def get_state(self, key):
+        """
+        Read a value from the `app_state` key/value table.
+
+        Args:
+            key (str): Name of the stored value.
+
+        Returns:
+            str|None: The stored value, or None if it was never set.
+        """
+        row = self.__run("get_state", (key,)).fetchone()
+        return row[0] if row else None
+
+    def __set_state(self, key, value):
+        """
+        Store a value in the `app_state` key/value table without committing.
+
+        Args:
+            key (str): Name of the value.
+            value (str): Value to store.
+        """
+        self.__run("set_state", (key, value))
+
+    def update_statuses(self, now, incremental=True):
+        """
+        Move open habits (UPCOMING, TO_BE_CONFIRMED, ONGOING) to the status
+        matching the given time, using one set-based UPDATE in one transaction.
+
+        The time of every sweep is stored as a watermark, together with the
+        highest habit id at that time. An incremental sweep only looks at
+        habits that started between the previous watermark (minus the longest
+        possible transition delay) and `now`, found through the
+        (start_ts, end_ts) index, and at habits inserted since the previous
+        sweep, whatever their start. A full sweep of every open habit runs
+        instead when there is no watermark yet, when the clock moved backwards
+        since the last sweep, after the start or duration of a habit was
+        edited (see `update_entry`), or when `incremental` is False.
+
+        Args:
+            now (datetime): The current time.
+            incremental (bool): Allow limiting the sweep to the watermark window.
+
+        Returns:
+            tuple: ("success", transitions) where transitions maps
+                (old_status, new_status) to the number of habits moved,
+                or ("error", Exception) on failure.
+        """
+        now_text = now.strftime("%Y-%m-%d %H:%M:%S")
+        parameters = {"now": epoch_seconds(now)}
+        sweep = "all"
+        try:
+            self.__begin_write()
+            watermark = self.get_state(self.__WATERMARK_KEY)
+            last_id = self.get_state(self.__LAST_ID_KEY)
+            if incremental and watermark is not None and last_id is not None and watermark <= now_text:
+                window_start = datetime.strptime(watermark, "%Y-%m-%d %H:%M:%S") - self.__sweep_lookback()
+                parameters["window_start"] = epoch_seconds(window_start)
+                parameters["last_id"] = int(last_id)
+                sweep = "window"
+
+            transitions = self.__run(f"count_transitions_{sweep}", parameters).fetchall()
+            self.__run(f"apply_transitions_{sweep}", parameters)
+            self.__set_state(self.__WATERMARK_KEY, now_text)
+            self.__set_state(self.__LAST_ID_KEY, str(self.get_max_id("habit")))
+            self.__connect.commit()
+        except Exception as e:
+            self.__connect.rollback()
+            return "error", e
+        return "success", {(old_status, new_status): count for old_status, new_status, count in transitions}
+
+    def __sweep_lookback(self):
+        """
+        Return how far before the last sweep a habit can start and still change status.
+
+        Returns:
+            timedelta: One day plus the longest stored duration, at least two days.
+        """
+        longest = self.__run("longest_duration").fetchone()[0] or 0
+        return max(self.__MIN_SWEEP_LOOKBACK, timedelta(days=1, seconds=longest))
+
+    def transition_status(self, id, status):
+        """
+        Set the status of a habit, but only while it is still open
+        (UPCOMING, TO_BE_CONFIRMED, ONGOING). Final statuses are never overwritten.
+
+        Args:
+            id (int): ID of the habit.
+            status (str): New status.
+
+        Returns:
+            tuple: ("success", bool) telling whether a row changed, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run("transition_status", (status, id))
+            return "success", self.__cursor.rowcount > 0
+        except Exception as e:
+            return "error", e
 
     def get_name_with_text(self, name):
         """
-        Search habits by name substring.
+        Search habits by name substring, case-insensitively.
+
+        Patterns of three or more characters are looked up in the
+        habit_name_fts trigram index, so the cost grows with the number of
+        matches rather than the size of the table.
 
         Args:
             name (str): Substring to search for in habit names.
@@ -185,7 +563,25 @@ class Database:
         Returns:
             list: List of matching habits.
         """
-        return self.__cursor.execute(f"SELECT * FROM habit WHERE name LIKE '%{name}%'").fetchall()
+        if len(name) < 3:
+            # trigrams need at least three characters; short patterns scan instead
+            return self.__run("habits_by_name_like", (self.__like_pattern(name),)).fetchall()
+        return self.__run("habits_by_name_trigram", ('"' + name.replace('"', '""') + '"',)).fetchall()
+
+    def get_by_name(self, name):
+        """
+        Retrieve habits whose name is exactly `name`.
+
+        Uses the case-insensitive name index to find candidates, then keeps
+        only the exact, case-sensitive matches.
+
+        Args:
+            name (str): Full habit name.
+
+        Returns:
+            list: List of matching habits, ordered by id.
+        """
+        return self.__run("habits_by_exact_name", (name, name)).fetchall()
 
     def get_entry(self, id):
         """
@@ -200,11 +596,10 @@ class Database:
         if id is None:
             return "error", "the habit does not exist in the database"
         try:
-            habit = self.__cursor.execute(f"SELECT * FROM habit WHERE id={id}").fetchone()
-            if habit is None:
+            entry = self.__run("entry_by_id", (id,)).fetchone()
+            if entry is None:
                 return "error", f"the habit with id={id} does not exist in the database"
-            habit_content = self.__cursor.execute(f"SELECT * FROM habit_content WHERE id={id}").fetchone()
-            return "success", (*habit, *habit_content[1:])
+            return "success", entry
         except Exception as e:
             return "error", e
 
@@ -224,7 +619,14 @@ class Database:
         message, result = self.__make_double_digit(month)
         if message == "error":
             return message, result
-        return "success", self.__cursor.execute(f"SELECT * FROM habit WHERE start_datetime LIKE '{year}-{result}-%'").fetchall()
+        try:
+            first_day = datetime(int(year), int(result), 1)
+        except ValueError as e:
+            return "error", e
+        next_month = datetime(first_day.year + first_day.month // 12, first_day.month % 12 + 1, 1)
+        return "success", self.__run(
+            "habits_in_range", (epoch_seconds(first_day), epoch_seconds(next_month))
+        ).fetchall()
 
     def search_by_date(self, input_date):
         """
@@ -237,41 +639,238 @@ class Database:
             tuple: ("success", list_of_habits) or ("error", Exception)
         """
         try:
-            datetime.strptime(input_date, "%Y-%m-%d")
+            day = datetime.strptime(input_date, "%Y-%m-%d")
         except Exception as e:
             return "error", e
-        
-        result = self.__cursor.execute(f"SELECT * FROM habit WHERE start_datetime LIKE '{input_date}%'").fetchall()
+
+        next_day = day + timedelta(days=1)
+        result = self.__run("habits_in_range", (epoch_seconds(day), epoch_seconds(next_day))).fetchall()
         return "success", result
 
-    def search_by_content(self, content_field):
+    # Markers placed around matched terms by `search_by_content(highlight=True)`.
+    HIGHLIGHT_START = HIGHLIGHT_START
+    HIGHLIGHT_END = HIGHLIGHT_END
+
+    def __full_text_query(self, text):
+        """
+        Turn free user text into an FTS5 MATCH expression.
+
+        Every word becomes a quoted prefix term, so FTS5 operators and quotes in
+        the input are matched literally, and all words must appear.
+
+        Args:
+            text (str): User search text.
+
+        Returns:
+            str: MATCH expression, empty if the text has no words.
+        """
+        words = text.split()
+        return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+    def search_by_content(self, content_field, highlight=False):
         """
         Search habit content by description or reflection text.
 
+        Uses the habit_content_fts and habit_series_fts full-text indexes;
+        results are ranked by bm25, best match first, and joined back to their
+        habit row. A series whose shared description matches is reported once,
+        through its first occurrence.
+
+        Every word of the text is matched as a word prefix. When that finds
+        nothing, the text is looked for as a plain substring instead (so
+        "ead" still finds "reading"), which scans habit_content and returns
+        matches by id without ranking.
+
         Args:
             content_field (str): Text to search for in habit descriptions or reflections.
+            highlight (bool): Also return a snippet of the best matching field with
+                matched terms wrapped in HIGHLIGHT_START / HIGHLIGHT_END.
 
         Returns:
-            list: List of matching habit_content entries.
+            list: Tuples of (habit id, description, reflection, habit name,
+                start datetime, status, snippet). The snippet is None unless
+                `highlight` is set.
         """
-        return self.__cursor.execute(
-            f"SELECT * FROM habit_content WHERE description LIKE '%{content_field}%' OR reflection LIKE '%{content_field}%'"
-        ).fetchall()
+        match = self.__full_text_query(content_field)
+        if not match:
+            return []
+        statement = "search_content_highlight" if highlight else "search_content"
+        rows = self.__run(statement, {"match": match}).fetchall()
+        if rows:
+            return rows
+        rows = self.__run("search_content_substring", {"pattern": self.__like_pattern(content_field)}).fetchall()
+        if highlight:
+            rows = [(*row[:6], self.__mark_substring(row, content_field)) for row in rows]
+        return rows
+
+    def __like_pattern(self, text):
+        """
+        Build a LIKE pattern matching `text` anywhere, with its wildcards escaped.
 
-    def close(self):
+        Args:
+            text (str): Literal text.
+
+        Returns:
+            str: Pattern for `LIKE ? ESCAPE '\\'`.
+        """
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    def __mark_substring(self, row, text):
+        """
+        Return the field of a substring match with the matched text highlighted.
+
+        Args:
+            row (tuple): A `search_content_substring` row.
+            text (str): The searched text.
+
+        Returns:
+            str|None: Description or reflection containing `text`, wrapped
+                in HIGHLIGHT_START / HIGHLIGHT_END.
         """
-        Close the SQLite database connection and cursor.
+        needle = text.lower()
+        for field in (row[1], row[2]):
+            position = (field or "").lower().find(needle)
+            if position >= 0:
+                end = position + len(text)
+                return f"{field[:position]}{HIGHLIGHT_START}{field[position:end]}{HIGHLIGHT_END}{field[end:]}"
+        return None
+
+    def get_series(self, series_id):
+        """
+        Retrieve a habit series and all of its occurrences.
+
+        Args:
+            series_id (int): ID of the series.
+
+        Returns:
+            tuple: ("success", (series_row, occurrences)) where series_row is
+                (id, name, description, duration, pattern) and occurrences are
+                entry tuples ordered by start time, or ("error", str/Exception).
         """
         try:
-            if hasattr(self, "__cursor") and self.__cursor:
-                self.__cursor.close()
-        except Exception:
-            pass
+            series = self.__run("series_by_id", (series_id,)).fetchone()
+            if series is None:
+                return "error", f"the series with id={series_id} does not exist in the database"
+            return "success", (series, self.__run("series_occurrences", (series_id,)).fetchall())
+        except Exception as e:
+            return "error", e
+
+    def delete_series(self, series_id):
+        """
+        Delete a habit series together with every occurrence and its content.
+
+        Args:
+            series_id (int): ID of the series.
+
+        Returns:
+            tuple: ("success", None) on success, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run("delete_series_content", (series_id,))
+                self.__run(delete_statement("habit_series"), (series_id,))
+            return "success", None
+        except Exception as e:
+            return "error", e
+
+    def get_patterns(self):
+        """
+        Retrieve every saved repeat pattern.
+
+        Returns:
+            list: Tuples of (id, kind, name, mask, weeks), in creation order.
+        """
+        return self.__run("patterns").fetchall()
+
+    def save_pattern(self, kind, name, mask=None, weeks=None):
+        """
+        Create a repeat pattern, or replace the body of the one with that name.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Pattern name, unique per kind.
+            mask (int, optional): Weekday mask of a week pattern.
+            weeks (str, optional): JSON array of week pattern ids of a month pattern.
+
+        Returns:
+            tuple: ("success", id) on success, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run("save_pattern", (kind, name, mask, weeks))
+                return "success", self.__run("pattern_id", (kind, name)).fetchone()[0]
+        except Exception as e:
+            return "error", e
+
+    def rename_pattern(self, kind, name, new_name):
+        """
+        Rename a repeat pattern. References to it by id are unaffected.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Current name.
+            new_name (str): New name.
+
+        Returns:
+            tuple: ("success", None) on success, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run("rename_pattern", (new_name, kind, name))
+            return "success", None
+        except Exception as e:
+            return "error", e
+
+    def delete_pattern(self, kind, name):
+        """
+        Delete a repeat pattern by name.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Pattern name.
+
+        Returns:
+            tuple: ("success", None) on success, ("error", Exception) on failure.
+        """
+        try:
+            with self.__connect:
+                self.__run("delete_pattern", (kind, name))
+            return "success", None
+        except Exception as e:
+            return "error", e
+
+    def diagnostics(self):
+        """
+        Describe the database file and the settings active on its connection.
+
+        Returns:
+            dict: Database path, configured profile name, current pragma values,
+                schema version and per-statement counters (see data.queries).
+        """
+        return {
+            "db_path": self.__db_name,
+            "profile": config.get_profile_name(),
+            "pragmas": config.read_pragmas(self.__connect),
+            "schema_version": get_schema_version(self.__connect),
+            "statements": statement_cache.stats(),
+        }
+
+    def close(self):
+        """
+        Close this object's cursor and release its shared connection.
+
+        The connection itself is closed by the ConnectionManager once no other
+        Database in the same thread still uses it. Calling close twice is safe.
+        """
+        if self.__cursor is None:
+            return
         try:
-            if hasattr(self, "__connect") and self.__connect:
-                self.__connect.close()
+            self.__cursor.close()
         except Exception:
             pass
+        self.__cursor = None
+        ConnectionManager.release(self.__db_name)
 
 
 if __name__ == "__main__":
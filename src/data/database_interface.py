@@ -1,3 +1,5 @@
+import json
+from datetime import datetime
 from data.database import Database
 
 class DatabaseInterface:
@@ -18,12 +20,38 @@ class DatabaseInterface:
     - Business rules such as patterns or scheduling
     """
 
-    def __init__(self,name="habit.db") -> None:
+    # markers around the matched words of content search snippets
+    HIGHLIGHT_START = Database.HIGHLIGHT_START
+    HIGHLIGHT_END = Database.HIGHLIGHT_END
+
+    def __init__(self,name=None) -> None:
         """
         Initialize the database interface and underlying database connection.
+
+        Args:
+            name (str, optional): SQLite database file. Defaults to the configured
+                path (see data.config).
+
+        The connection is shared with every other Database opened on the same
+        file in this thread (see ConnectionManager).
         """
         self.database = Database(name)
 
+    def close(self):
+        """
+        Release the underlying shared database connection.
+        """
+        self.database.close()
+
+    def diagnostics(self):
+        """
+        Report the database path, performance profile, pragma values and schema version.
+
+        Returns:
+            dict: Diagnostic information about the database connection.
+        """
+        return self.database.diagnostics()
+
     def get_all_habits(self):
         """
         Retrieve all habits stored in the database.
@@ -33,6 +61,41 @@ class DatabaseInterface:
         """
         return self.database.get_all_entries()
 
+    def iter_all_habits(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits stored in the database without loading them at once.
+
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Returns:
+            generator: Database rows representing habits and their content.
+        """
+        return self.database.iter_all_entries(batch_size, order_by)
+
+    def iter_habit_batches(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits stored in the database as the batches fetched.
+
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Returns:
+            generator: Lists of up to `batch_size` habit rows.
+        """
+        return self.database.iter_entry_batches(batch_size, order_by)
+
+    def count_habits(self):
+        """
+        Count the habits stored in the database.
+
+        Returns:
+            int: Number of habits.
+        """
+        return self.database.count_entries()
+
     def get_habit(self, id):
         """
         Retrieve a single habit by its unique identifier.
@@ -61,6 +124,18 @@ class DatabaseInterface:
         """
         return self.database.get_name_with_text(name)
 
+    def get_by_name(self, name):
+        """
+        Retrieve habits with exactly the given name.
+
+        Args:
+            name (str): Full habit name.
+
+        Returns:
+            list: Matching habit records.
+        """
+        return self.database.get_by_name(name)
+
     def add_habit(self, habit):
         """
         Persist a new Habit object to the database.
@@ -68,7 +143,7 @@ class DatabaseInterface:
         This operation:
         1. Ensures the habit name is unique
         2. Saves the habit content
-        3. Saves the habit metadata
+        3. Saves the habit metadata under the id of its content row
         4. Assigns generated IDs back to the Habit object
 
         Args:
@@ -97,8 +172,9 @@ class DatabaseInterface:
 
             status, expected_result = self.database.add_entry(
                 "habit",
-                ["habit_content_id", "name", "start_datetime", "duration", "status"],
+                ["id", "habit_content_id", "name", "start_datetime", "duration", "status"],
                 [
+                    habit.get_id(),
                     habit.get_id(),
                     habit.get_name(),
                     str(habit.get_start_datetime()),
@@ -115,6 +191,306 @@ class DatabaseInterface:
 
         return "error", expected_result
 
+    def add_habits(self, habits):
+        """
+        Persist many Habit objects in a single transaction.
+
+        Ids are assigned up front so that every habit row shares its id with
+        its habit_content row, the same pairing `add_habit` produces. All
+        content rows and all habit rows are then written with one batch
+        insert each. On failure nothing is stored and no ids are assigned.
+
+        Args:
+            habits (iterable[Habit]): The habit domain objects to be saved.
+
+        Returns:
+            tuple:
+                ("success", row_count) on success, where row_count counts both
+                habit_content and habit rows
+                ("error", message) on failure
+        """
+        habits = list(habits)
+        if not habits:
+            return "success", 0
+        ids = None
+
+        def entries():
+            # runs inside the write transaction, see Database.add_entries
+            nonlocal ids
+            ids = self.__reserve_habit_ids(len(habits))
+            content_rows = [
+                (id, habit.content.get_description(), habit.content.get_reflections())
+                for id, habit in zip(ids, habits)
+            ]
+            habit_rows = [
+                (
+                    id,
+                    id,
+                    habit.get_name(),
+                    str(habit.get_start_datetime()),
+                    str(habit.get_duration()),
+                    habit.get_status(),
+                )
+                for id, habit in zip(ids, habits)
+            ]
+            return [
+                ("habit_content", ["id", "description", "reflection"], content_rows),
+                ("habit", ["id", "habit_content_id", "name", "start_datetime", "duration", "status"], habit_rows),
+            ]
+
+        status, result = self.database.add_entries(entries)
+        if status == "success":
+            for id, habit in zip(ids, habits):
+                habit.set_id(id)
+        return status, result
+
+    def __reserve_habit_ids(self, count):
+        """
+        Return `count` ids that are free in both habit and habit_content.
+
+        A single habit shares its id with its content row. Must be called
+        inside the write transaction that inserts the rows.
+
+        Args:
+            count (int): Number of ids.
+
+        Returns:
+            range: Consecutive free ids.
+        """
+        first_id = max(
+            self.database.get_max_id("habit_content"),
+            self.database.get_max_id("habit"),
+        ) + 1
+        return range(first_id, first_id + count)
+
+    def add_series(self, habits, pattern=None):
+        """
+        Persist the occurrences of a repeating habit as one series.
+
+        Name, description, duration and the repeat pattern are stored once in
+        `habit_series`. Each occurrence gets its own habit row (name and
+        duration are kept there for the indexes), and all of them point at one
+        shared habit_content row holding the reflections. Editing the content
+        of an occurrence gives it a row of its own, see
+        `Database.update_entry`. Everything is written in a single
+        transaction.
+
+        Args:
+            habits (iterable[Habit]): The occurrences, all sharing the
+                definition of the first one.
+            pattern (optional): JSON-serializable repeat pattern the
+                occurrences were generated from.
+
+        Returns:
+            tuple:
+                ("success", series_id) on success
+                ("error", message) on failure
+        """
+        habits = list(habits)
+        if not habits:
+            return "error", "a series needs at least one occurrence"
+
+        definition = habits[0]
+        series_id = ids = None
+
+        def entries():
+            # runs inside the write transaction, see Database.add_entries
+            nonlocal series_id, ids
+            series_id = self.database.get_max_id("habit_series") + 1
+            ids = self.__reserve_habit_ids(len(habits) + 1)
+            # the content row takes the last id, so the next content row's id
+            # is still free in habit, see add_habit
+            ids, content_id = ids[:-1], ids[-1]
+            series_row = (
+                series_id,
+                definition.get_name(),
+                definition.content.get_description(),
+                str(definition.get_duration()),
+                None if pattern is None else json.dumps(pattern, default=sorted),
+            )
+            habit_rows = [
+                (
+                    id,
+                    content_id,
+                    habit.get_name(),
+                    str(habit.get_start_datetime()),
+                    str(habit.get_duration()),
+                    habit.get_status(),
+                    series_id,
+                )
+                for id, habit in zip(ids, habits)
+            ]
+            return [
+                ("habit_series", ["id", "name", "description", "duration", "pattern"], [series_row]),
+                ("habit_content", ["id", "reflection"], [(content_id, definition.content.get_reflections())]),
+                (
+                    "habit",
+                    ["id", "habit_content_id", "name", "start_datetime", "duration", "status", "series_id"],
+                    habit_rows,
+                ),
+            ]
+
+        status, result = self.database.add_entries(entries)
+        if status == "error":
+            return status, result
+        for id, habit in zip(ids, habits):
+            habit.set_id(id)
+        return "success", series_id
+
+    def add_series_occurrences(self, habit, start_datetimes, pattern=None):
+        """
+        Persist a repeating habit as one series from the start times of its occurrences.
+
+        Unlike `add_series` no Habit object is built per occurrence: the rows
+        are generated from the start times while they are written, in a
+        single transaction. HabitFactory.add_series_rule expands a recurrence
+        rule into those start times.
+
+        Args:
+            habit (Habit): The habit definition: name, description, duration,
+                status and reflections shared by the occurrences.
+            start_datetimes (list[str]): "YYYY-MM-DD HH:MM:SS" start of each
+                occurrence, in start time order.
+            pattern (optional): JSON-serializable repeat pattern behind the
+                occurrences.
+
+        Returns:
+            tuple:
+                ("success", (series_id, ids)) on success, ids being the range
+                of the new habit ids in start time order
+                ("error", message) on failure
+        """
+        if not start_datetimes:
+            return "error", "a series needs at least one occurrence"
+
+        name, duration, status = habit.get_name(), str(habit.get_duration()), habit.get_status()
+        reflections = habit.content.get_reflections()
+        series_id = ids = None
+
+        def entries():
+            # runs inside the write transaction, see Database.add_entries
+            nonlocal series_id, ids
+            series_id = self.database.get_max_id("habit_series") + 1
+            ids = self.__reserve_habit_ids(len(start_datetimes) + 1)
+            # the shared content row takes the last id, as in add_series
+            ids, content_id = ids[:-1], ids[-1]
+            return [
+                (
+                    "habit_series",
+                    ["id", "name", "description", "duration", "pattern"],
+                    [(
+                        series_id,
+                        name,
+                        habit.content.get_description(),
+                        duration,
+                        None if pattern is None else json.dumps(pattern, default=sorted),
+                    )],
+                ),
+                ("habit_content", ["id", "reflection"], [(content_id, reflections)]),
+                (
+                    "habit",
+                    ["id", "habit_content_id", "name", "start_datetime", "duration", "status", "series_id"],
+                    (
+                        (id, content_id, name, start_datetime, duration, status, series_id)
+                        for id, start_datetime in zip(ids, start_datetimes)
+                    ),
+                ),
+            ]
+
+        result_status, result = self.database.add_entries(entries)
+        if result_status == "error":
+            return result_status, result
+        return "success", (series_id, ids)
+
+    def get_series(self, series_id):
+        """
+        Retrieve a habit series and its occurrences.
+
+        Args:
+            series_id (int): The series ID.
+
+        Returns:
+            tuple:
+                ("success", (series, occurrences)) where series is
+                (id, name, description, duration, pattern) with the pattern
+                decoded, and occurrences are habit rows with their content
+                ("error", message) if the series does not exist
+        """
+        status, result = self.database.get_series(series_id)
+        if status == "error":
+            return status, result
+        (id, name, description, duration, pattern), occurrences = result
+        pattern = None if pattern is None else json.loads(pattern)
+        return "success", ((id, name, description, duration, pattern), occurrences)
+
+    def delete_series(self, series_id):
+        """
+        Delete a habit series with all of its occurrences.
+
+        Args:
+            series_id (int): The series ID.
+
+        Returns:
+            tuple: ("success", None) or ("error", exception).
+        """
+        return self.database.delete_series(series_id)
+
+    def get_patterns(self):
+        """
+        Retrieve every saved week and month repeat pattern.
+
+        Returns:
+            list: (id, kind, name, mask, weeks) records, with the week pattern
+                ids of month patterns decoded into a list.
+        """
+        return [
+            (id, kind, name, mask, None if weeks is None else json.loads(weeks))
+            for id, kind, name, mask, weeks in self.database.get_patterns()
+        ]
+
+    def save_pattern(self, kind, name, mask=None, weeks=None):
+        """
+        Create or replace a named repeat pattern.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Pattern name.
+            mask (int, optional): Weekday mask of a week pattern.
+            weeks (list, optional): Week pattern ids of a month pattern, None
+                for a skipped week.
+
+        Returns:
+            tuple: ("success", id) or ("error", exception).
+        """
+        return self.database.save_pattern(kind, name, mask, None if weeks is None else json.dumps(weeks))
+
+    def rename_pattern(self, kind, name, new_name):
+        """
+        Rename a repeat pattern.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Current name.
+            new_name (str): New name.
+
+        Returns:
+            tuple: ("success", None) or ("error", exception).
+        """
+        return self.database.rename_pattern(kind, name, new_name)
+
+    def delete_pattern(self, kind, name):
+        """
+        Delete a repeat pattern.
+
+        Args:
+            kind (str): "week" or "month".
+            name (str): Pattern name.
+
+        Returns:
+            tuple: ("success", None) or ("error", exception).
+        """
+        return self.database.delete_pattern(kind, name)
+
     def get_habits_by_status(self, status):
         """
         Retrieve all habits matching a given status.
@@ -127,6 +503,23 @@ class DatabaseInterface:
         """
         return self.database.get_habits_by_status(status.upper())
 
+    def update_statuses(self, now=None, full=False):
+        """
+        Recompute the status of open habits from their schedule.
+
+        By default only habits whose status can have changed since the last
+        sweep are examined.
+
+        Args:
+            now (datetime, optional): Reference time. Defaults to the current time.
+            full (bool): Re-examine every open habit regardless of the last sweep.
+
+        Returns:
+            tuple: ("success", transitions) mapping (old_status, new_status)
+                to the number of habits moved, or ("error", message).
+        """
+        return self.database.update_statuses(now or datetime.now(), incremental=not full)
+
     def delete_habit(self, habit, table_name="habit_content"):
         """
         Delete a habit from the database after verifying its integrity.
@@ -171,6 +564,9 @@ class DatabaseInterface:
         habit_obj.content.set_id(habit_content_id)
 
         if habit == habit_obj:
+            if table_name == "habit_content" and habit_content_id != habit_id:
+                # a series occurrence sharing the content row of its series
+                return self.database.delete_occurrence(habit_id, habit_content_id)
             return self.database.delete_entry(table_name, habit_id)
 
         return "error", "objects do not match!"
@@ -183,20 +579,38 @@ class DatabaseInterface:
             table_name (str): Database table name.
             id (int): Habit ID.
             **kwargs: Fields and values to update.
+
+        Returns:
+            tuple: ("success", None) or ("error", exception).
+        """
+        return self.database.update_entry(table_name=table_name, id=id, **kwargs)
+
+    def transition_status(self, id, status):
+        """
+        Change the status of a habit only while it is still open.
+
+        Args:
+            id (int): Habit ID.
+            status (str): New status.
+
+        Returns:
+            tuple: ("success", changed) where changed tells whether the habit
+                was still open and got updated, or ("error", exception).
         """
-        self.database.update_entry(table_name=table_name, id=id, **kwargs)
+        return self.database.transition_status(id, status)
 
-    def search_by_content(self, content):
+    def search_by_content(self, content, highlight=False):
         """
-        Search habit content by text.
+        Search habit content by text, best matches first.
 
         Args:
             content (str): Text to search for.
+            highlight (bool): Include a highlighted snippet of the match.
 
         Returns:
             list: Matching habit content records.
         """
-        return self.database.search_by_content(content)
+        return self.database.search_by_content(content, highlight)
 
     def search_by_month(self, month, year=None):
         """
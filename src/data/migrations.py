@@ -0,0 +1,225 @@
+"""Versioned schema migrations for the habit database.
+
+Every migration is a numbered list of SQL statements. The number of the last
+migration applied to a database file is stored in SQLite's
+`PRAGMA user_version`, so starting the application only runs the migrations
+that the file has not seen yet. Migrations are applied in ascending order and
+each one runs in its own savepoint together with the version bump, so it can
+be rolled back on its own even when the caller already has a transaction
+open on the connection.
+
+To change the schema, append a new (version, description, statements) entry
+to `MIGRATIONS`. Never edit or reorder an entry that has already shipped.
+"""
+
+MIGRATIONS = [
+    (
+        1,
+        "index habit status lookups",
+        ["CREATE INDEX IF NOT EXISTS idx_habit_status ON habit(status)"],
+    ),
+    (
+        2,
+        "index habit start datetime for date and month searches",
+        ["CREATE INDEX IF NOT EXISTS idx_habit_start_datetime ON habit(start_datetime)"],
+    ),
+    (
+        3,
+        "index habit names case-insensitively",
+        ["CREATE INDEX IF NOT EXISTS idx_habit_name_nocase ON habit(name COLLATE NOCASE)"],
+    ),
+    (
+        4,
+        "index the habit_content foreign key used by cascading deletes",
+        ["CREATE INDEX IF NOT EXISTS idx_habit_content_id ON habit(habit_content_id)"],
+    ),
+    (
+        5,
+        "key/value table for application state such as the status sweep watermark",
+        ["CREATE TABLE IF NOT EXISTS app_state (key TEXT PRIMARY KEY, value TEXT)"],
+    ),
+    (
+        6,
+        "FTS5 full-text index over habit descriptions and reflections",
+        [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS habit_content_fts
+            USING fts5(description, reflection, content='habit_content', content_rowid='id')
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_content_fts_insert AFTER INSERT ON habit_content BEGIN
+                INSERT INTO habit_content_fts(rowid, description, reflection)
+                VALUES (new.id, new.description, new.reflection);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_content_fts_delete AFTER DELETE ON habit_content BEGIN
+                INSERT INTO habit_content_fts(habit_content_fts, rowid, description, reflection)
+                VALUES ('delete', old.id, old.description, old.reflection);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_content_fts_update AFTER UPDATE ON habit_content BEGIN
+                INSERT INTO habit_content_fts(habit_content_fts, rowid, description, reflection)
+                VALUES ('delete', old.id, old.description, old.reflection);
+                INSERT INTO habit_content_fts(rowid, description, reflection)
+                VALUES (new.id, new.description, new.reflection);
+            END
+            """,
+            "INSERT INTO habit_content_fts(habit_content_fts) VALUES ('rebuild')",
+        ],
+    ),
+    (
+        7,
+        "trigram index over habit names for substring search",
+        [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS habit_name_fts
+            USING fts5(name, content='habit', content_rowid='id', tokenize='trigram')
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_name_fts_insert AFTER INSERT ON habit BEGIN
+                INSERT INTO habit_name_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_name_fts_delete AFTER DELETE ON habit BEGIN
+                INSERT INTO habit_name_fts(habit_name_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_name_fts_update AFTER UPDATE OF name ON habit BEGIN
+                INSERT INTO habit_name_fts(habit_name_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO habit_name_fts(rowid, name) VALUES (new.id, new.name);
+            END
+            """,
+            "INSERT INTO habit_name_fts(habit_name_fts) VALUES ('rebuild')",
+        ],
+    ),
+    (
+        8,
+        "integer start, end and duration columns for range queries",
+        [
+            "ALTER TABLE habit ADD COLUMN start_ts INTEGER",
+            "ALTER TABLE habit ADD COLUMN end_ts INTEGER",
+            "ALTER TABLE habit ADD COLUMN duration_s INTEGER",
+            "CREATE INDEX IF NOT EXISTS idx_habit_start_end_ts ON habit(start_ts, end_ts)",
+            # lets the status sweep read the longest duration without a scan
+            "CREATE INDEX IF NOT EXISTS idx_habit_duration_s ON habit(duration_s)",
+            # Database writes the values with each row and fills in rows
+            # without an end_ts, such as the existing ones, when it connects
+            "CREATE INDEX IF NOT EXISTS idx_habit_end_ts_missing ON habit(end_ts) WHERE end_ts IS NULL",
+        ],
+    ),
+    (
+        9,
+        "habit_series table holding the shared definition of repeating habits",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS habit_series
+            (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                description TEXT,
+                duration TEXT,
+                pattern TEXT
+            )
+            """,
+            # existing habits stay single: matching name, duration and
+            # description does not tell that they were added as a series
+            "ALTER TABLE habit ADD COLUMN series_id INTEGER REFERENCES habit_series(id) ON DELETE CASCADE",
+            "CREATE INDEX IF NOT EXISTS idx_habit_series_id ON habit(series_id)",
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS habit_series_fts
+            USING fts5(description, content='habit_series', content_rowid='id')
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_series_fts_insert AFTER INSERT ON habit_series BEGIN
+                INSERT INTO habit_series_fts(rowid, description) VALUES (new.id, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_series_fts_delete AFTER DELETE ON habit_series BEGIN
+                INSERT INTO habit_series_fts(habit_series_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS habit_series_fts_update AFTER UPDATE ON habit_series BEGIN
+                INSERT INTO habit_series_fts(habit_series_fts, rowid, description)
+                VALUES ('delete', old.id, old.description);
+                INSERT INTO habit_series_fts(rowid, description) VALUES (new.id, new.description);
+            END
+            """,
+        ],
+    ),
+    (
+        10,
+        "named week and month repeat patterns shared across habits",
+        [
+            # week patterns store a 7-bit weekday mask (Monday is bit 0); month
+            # patterns store a JSON array of week pattern ids, null for a skipped week
+            """
+            CREATE TABLE IF NOT EXISTS pattern
+            (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL CHECK (kind IN ('week', 'month')),
+                name TEXT NOT NULL,
+                mask INTEGER,
+                weeks TEXT,
+                UNIQUE (kind, name)
+            )
+            """,
+        ],
+    ),
+]
+
+
+def get_schema_version(connection):
+    """
+    Read the schema version stored in the database file.
+
+    Args:
+        connection (sqlite3.Connection): Open database connection.
+
+    Returns:
+        int: The version of the last applied migration, 0 for a new database.
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(connection, migrations=MIGRATIONS):
+    """
+    Apply every migration newer than the database's schema version.
+
+    Args:
+        connection (sqlite3.Connection): Open database connection.
+        migrations (list): (version, description, statements) entries.
+            Defaults to `MIGRATIONS`.
+
+    Returns:
+        tuple: ("success", version) with the resulting schema version, or
+            ("error", Exception) if a migration failed. A failed migration is
+            rolled back and leaves the version at the last successful one.
+            Inside a transaction opened by the caller, the applied migrations
+            are committed with that transaction.
+    """
+    current_version = get_schema_version(connection)
+    for version, description, statements in sorted(migrations, key=lambda migration: migration[0]):
+        if version <= current_version:
+            continue
+        # a savepoint is a transaction of its own when none is open, and
+        # nests inside the caller's otherwise, where a plain BEGIN would fail
+        savepoint = f"migration_{int(version)}"
+        connection.execute(f"SAVEPOINT {savepoint}")
+        try:
+            for statement in statements:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {int(version)}")
+            connection.execute(f"RELEASE {savepoint}")
+        except Exception as e:
+            connection.execute(f"ROLLBACK TO {savepoint}")
+            connection.execute(f"RELEASE {savepoint}")
+            return "error", e
+        current_version = version
+    return "success", current_version
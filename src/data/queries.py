@@ -0,0 +1,515 @@
+"""Named SQL statements used by Database, and per-statement counters.
+
+Every query Database runs is declared once in `STATEMENTS` with `?` or
+`:name` placeholders, and values are always passed as parameters. The text
+of a statement therefore never changes between calls, which lets sqlite3's
+per-connection statement cache reuse the compiled statement instead of
+parsing the SQL again, and keeps quotes in user input from breaking a query.
+
+Statements whose shape depends on the caller (inserts and updates of a
+chosen set of columns) are built by `insert_statement`/`update_statement`,
+which register each distinct shape once and return its name.
+
+`StatementCache.execute` runs a statement by name and records how often it
+ran, how often the compiled statement could be reused, and how long the
+executions took. `statement_cache` is the instance shared by every Database.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+
+HABIT_COLUMNS = (
+    "habit.id, habit.habit_content_id, habit.name, habit.start_datetime, habit.duration, habit.status"
+)
+# Occurrences of a series store no description of their own; theirs is read
+# from habit_series unless it was overridden on the occurrence.
+ENTRY_COLUMNS = (
+    f"{HABIT_COLUMNS}, COALESCE(habit_content.description, habit_series.description), habit_content.reflection"
+)
+ENTRY_TABLES = """
+    habit
+    JOIN habit_content ON habit_content.id = habit.habit_content_id
+    LEFT JOIN habit_series ON habit_series.id = habit.series_id
+"""
+SERIES_COLUMNS = "habit_series.id, habit_series.name, habit_series.description, habit_series.duration, habit_series.pattern"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_seconds(moment):
+    """Return a naive datetime as seconds since 1970-01-01 00:00:00.
+
+    This is how the habit start_ts and end_ts columns store the local
+    wall-clock times of start_datetime: no timezone conversion is applied.
+
+    Args:
+        moment (datetime): Naive local datetime.
+
+    Returns:
+        int: Whole seconds since 1970-01-01.
+    """
+    return int((moment - _EPOCH).total_seconds())
+
+
+@lru_cache(maxsize=1024)
+def duration_seconds(duration):
+    """Return a stored "H:M:S" duration in whole seconds.
+
+    Parsed like DateTimeHandler.map_time_to_status does: hours may exceed
+    23 and no field needs zero padding.
+
+    Args:
+        duration (str): Duration text.
+
+    Returns:
+        int|None: Seconds, or None when the text cannot be parsed.
+    """
+    try:
+        hours, minutes, seconds = map(int, str(duration).split(":"))
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds
+
+
+EPOCH_COLUMNS = ("start_ts", "duration_s", "end_ts")
+
+
+def epoch_columns(start_datetime, duration):
+    """Return the start_ts, duration_s and end_ts values of a habit row.
+
+    Database writes them along with start_datetime and duration, so the
+    status sweep and range searches can compare plain integers.
+
+    Args:
+        start_datetime (str): Start in "YYYY-MM-DD HH:MM:SS" format; other
+            ISO 8601 forms without a timezone are read the same way.
+        duration (str): Duration in "H:M:S" format.
+
+    Returns:
+        tuple: (start_ts, duration_s, end_ts); a value is None when the
+            text it is derived from cannot be parsed.
+    """
+    try:
+        start_ts = epoch_seconds(datetime.fromisoformat(str(start_datetime)))
+    except (TypeError, ValueError):
+        # TypeError: a timezone-aware datetime
+        start_ts = None
+    duration_s = duration_seconds(duration)
+    end_ts = None if start_ts is None or duration_s is None else start_ts + duration_s
+    return start_ts, duration_s, end_ts
+
+
+# Status of an open habit derived from its integer start and end times.
+# Mirrors DateTimeHandler.map_time_to_status; rows whose datetime or duration
+# could not be parsed have no end_ts and keep their current status.
+_STATUS_CASE = """
+    CASE
+        WHEN end_ts IS NULL THEN status
+        WHEN start_ts <= :now AND :now < end_ts THEN 'ONGOING'
+        WHEN start_ts > :now THEN 'UPCOMING'
+        WHEN :now - end_ts > 86400 THEN 'MISSED'
+        ELSE 'TO_BE_CONFIRMED'
+    END
+"""
+_OPEN_STATUSES = "('UPCOMING', 'TO_BE_CONFIRMED', 'ONGOING')"
+_SWEEP_ALL = f"status IN {_OPEN_STATUSES}"
+# Habits that started inside the window, plus every habit inserted since the
+# last sweep whatever its start. The unary + keeps SQLite on the start_ts
+# index and the rowid instead of the status index.
+_SWEEP_WINDOW = (
+    f"+status IN {_OPEN_STATUSES} AND ((start_ts > :window_start AND start_ts <= :now) OR id > :last_id)"
+)
+
+
+def _count_transitions(habits_to_sweep):
+    return f"""
+        SELECT status, new_status, COUNT(*) FROM (
+            SELECT status, {_STATUS_CASE} AS new_status
+            FROM habit WHERE {habits_to_sweep}
+        )
+        WHERE new_status != status
+        GROUP BY status, new_status
+    """
+
+
+def _apply_transitions(habits_to_sweep):
+    return f"""
+        UPDATE habit SET status = {_STATUS_CASE}
+        WHERE {habits_to_sweep} AND status != {_STATUS_CASE}
+    """
+
+
+def _entries(order_by):
+    return f"""
+        SELECT {ENTRY_COLUMNS}
+        FROM {ENTRY_TABLES}
+        ORDER BY {order_by}
+    """
+
+
+def _search_content(content_snippet, series_snippet):
+    # bm25() and snippet() only work next to their MATCH, so both full-text
+    # tables are ranked in their own CTE before the results are joined
+    return f"""
+        WITH content_matches AS (
+            SELECT rowid AS id, bm25(habit_content_fts) AS rank, {content_snippet} AS snippet
+            FROM habit_content_fts WHERE habit_content_fts MATCH :match
+        ),
+        series_matches AS (
+            SELECT rowid AS id, bm25(habit_series_fts) AS rank, {series_snippet} AS snippet
+            FROM habit_series_fts WHERE habit_series_fts MATCH :match
+        )
+        SELECT id, description, reflection, name, start_datetime, status, snippet FROM (
+            SELECT COALESCE(habit.id, habit_content.id) AS id,
+                   COALESCE(habit_content.description, habit_series.description) AS description,
+                   habit_content.reflection AS reflection, habit.name AS name,
+                   habit.start_datetime AS start_datetime, habit.status AS status,
+                   content_matches.snippet AS snippet, content_matches.rank AS rank
+            FROM content_matches
+            JOIN habit_content ON habit_content.id = content_matches.id
+            LEFT JOIN habit ON habit.habit_content_id = habit_content.id
+            LEFT JOIN habit_series ON habit_series.id = habit.series_id
+            UNION ALL
+            -- a matching series is reported once, through its first occurrence
+            SELECT habit.id, habit_series.description, NULL, habit_series.name,
+                   habit.start_datetime, habit.status, series_matches.snippet, series_matches.rank
+            FROM series_matches
+            JOIN habit_series ON habit_series.id = series_matches.id
+            JOIN habit ON habit.id = (
+                SELECT id FROM habit WHERE series_id = habit_series.id ORDER BY start_ts, id LIMIT 1
+            )
+        )
+        ORDER BY rank
+    """
+
+
+# Markers placed around matched terms by highlighted content searches.
+# Control characters are used so they can never clash with user text.
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+STATEMENTS = {
+    "entries_by_id": _entries("habit.id"),
+    "entries_by_start_datetime": _entries("habit.start_ts, habit.id"),
+    "count_habits": "SELECT COUNT(*) FROM habit",
+    "habit_by_id": f"SELECT {HABIT_COLUMNS} FROM habit WHERE id = ?",
+    "entry_by_id": f"""
+        SELECT {ENTRY_COLUMNS}
+        FROM {ENTRY_TABLES}
+        WHERE habit.id = ?
+    """,
+    "series_by_id": f"SELECT {SERIES_COLUMNS} FROM habit_series WHERE id = ?",
+    "series_occurrences": f"""
+        SELECT {ENTRY_COLUMNS}
+        FROM {ENTRY_TABLES}
+        WHERE habit.series_id = ?
+        ORDER BY habit.start_ts, habit.id
+    """,
+    "delete_series_content": (
+        "DELETE FROM habit_content WHERE id IN (SELECT habit_content_id FROM habit WHERE series_id = ?)"
+    ),
+    # an occurrence that still shares the content row of its series gets a
+    # copy of it under its own id before its content is edited
+    "copy_shared_content": """
+        INSERT INTO habit_content (id, description, reflection)
+        SELECT habit.id, habit_content.description, habit_content.reflection
+        FROM habit JOIN habit_content ON habit_content.id = habit.habit_content_id
+        WHERE habit.id = ? AND habit.habit_content_id != habit.id
+    """,
+    "own_content": "UPDATE habit SET habit_content_id = id WHERE id = ? AND habit_content_id != id",
+    "delete_unused_content": (
+        "DELETE FROM habit_content WHERE id = ? AND NOT EXISTS (SELECT 1 FROM habit WHERE habit_content_id = ?)"
+    ),
+    "habits_by_status": f"SELECT {HABIT_COLUMNS} FROM habit WHERE status = ?",
+    "habits_by_exact_name": (
+        f"SELECT {HABIT_COLUMNS} FROM habit WHERE name = ? COLLATE NOCASE AND name = ? ORDER BY id"
+    ),
+    "habits_by_name_like": f"SELECT {HABIT_COLUMNS} FROM habit WHERE name LIKE ? ESCAPE '\\' ORDER BY id",
+    "habits_by_name_trigram": f"""
+        SELECT {HABIT_COLUMNS} FROM habit WHERE id IN (
+            SELECT rowid FROM habit_name_fts WHERE habit_name_fts MATCH ?
+        ) ORDER BY id
+    """,
+    "habits_in_range": f"SELECT {HABIT_COLUMNS} FROM habit WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts",
+    "search_content": _search_content("NULL", "NULL"),
+    "search_content_highlight": _search_content(
+        f"snippet(habit_content_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '...', 12)",
+        f"snippet(habit_series_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '...', 12)",
+    ),
+    "longest_duration": "SELECT MAX(duration_s) FROM habit",
+    "habit_schedule": "SELECT start_datetime, duration FROM habit WHERE id = ?",
+    # rows without an end time: unparsable, written by hand, or older than
+    # the columns (see migration 8)
+    "habits_without_end_ts": "SELECT id, start_datetime, duration FROM habit WHERE end_ts IS NULL",
+    "set_epoch_columns": "UPDATE habit SET start_ts = ?, duration_s = ?, end_ts = ? WHERE id = ?",
+    # Substring fallback for text that is no prefix of an indexed word, such
+    # as the middle of a word: a scan of habit_content, like the search the
+    # full-text index replaced.
+    "search_content_substring": """
+        SELECT COALESCE(habit.id, habit_content.id),
+               COALESCE(habit_content.description, habit_series.description),
+               habit_content.reflection, habit.name, habit.start_datetime, habit.status, NULL
+        FROM habit_content
+        LEFT JOIN habit ON habit.habit_content_id = habit_content.id
+        LEFT JOIN habit_series ON habit_series.id = habit.series_id
+        WHERE COALESCE(habit_content.description, habit_series.description) LIKE :pattern ESCAPE '\\'
+           OR habit_content.reflection LIKE :pattern ESCAPE '\\'
+        ORDER BY 1
+    """,
+    "get_state": "SELECT value FROM app_state WHERE key = ?",
+    "delete_state": "DELETE FROM app_state WHERE key = ?",
+    "set_state": (
+        "INSERT INTO app_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+    ),
+    "count_transitions_all": _count_transitions(_SWEEP_ALL),
+    "count_transitions_window": _count_transitions(_SWEEP_WINDOW),
+    "apply_transitions_all": _apply_transitions(_SWEEP_ALL),
+    "apply_transitions_window": _apply_transitions(_SWEEP_WINDOW),
+    "transition_status": f"UPDATE habit SET status = ? WHERE id = ? AND status IN {_OPEN_STATUSES}",
+    "patterns": "SELECT id, kind, name, mask, weeks FROM pattern ORDER BY id",
+    "save_pattern": (
+        "INSERT INTO pattern (kind, name, mask, weeks) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(kind, name) DO UPDATE SET mask = excluded.mask, weeks = excluded.weeks"
+    ),
+    "pattern_id": "SELECT id FROM pattern WHERE kind = ? AND name = ?",
+    "rename_pattern": "UPDATE pattern SET name = ? WHERE kind = ? AND name = ?",
+    "delete_pattern": "DELETE FROM pattern WHERE kind = ? AND name = ?",
+}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+
+def _check_identifiers(*names):
+    """Raise ValueError unless every name is a plain SQL identifier."""
+    for name in names:
+        if not _IDENTIFIER.fullmatch(str(name)):
+            raise ValueError(f"invalid table or column name '{name}'")
+
+
+@lru_cache(maxsize=None)
+def insert_statement(table_name, field_names):
+    """Register an INSERT for a table and column list, and return its name.
+
+    Args:
+        table_name (str): Table to insert into.
+        field_names (tuple): Column names, in the order values are passed.
+
+    Returns:
+        str: Statement name to pass to `StatementCache.execute`.
+
+    Raises:
+        ValueError: If a table or column name is not a plain identifier.
+    """
+    _check_identifiers(table_name, *field_names)
+    name = f"insert:{table_name}({','.join(field_names)})"
+    STATEMENTS[name] = (
+        f"INSERT INTO {table_name} ({', '.join(field_names)}) VALUES ({', '.join('?' for _ in field_names)})"
+    )
+    return name
+
+
+@lru_cache(maxsize=None)
+def update_statement(table_name, field_names):
+    """Register an UPDATE of some columns of one row by id, and return its name.
+
+    The id is the last parameter, after the new column values.
+
+    Args:
+        table_name (str): Table to update.
+        field_names (tuple): Columns to set.
+
+    Returns:
+        str: Statement name to pass to `StatementCache.execute`.
+
+    Raises:
+        ValueError: If a table or column name is not a plain identifier, or no
+            column is given.
+    """
+    if not field_names:
+        raise ValueError("no fields to update")
+    _check_identifiers(table_name, *field_names)
+    name = f"update:{table_name}({','.join(field_names)})"
+    STATEMENTS[name] = (
+        f"UPDATE {table_name} SET {', '.join(f'{field} = ?' for field in field_names)} WHERE id = ?"
+    )
+    return name
+
+
+@lru_cache(maxsize=None)
+def delete_statement(table_name):
+    """Register a DELETE of one row by id, and return its name.
+
+    Args:
+        table_name (str): Table to delete from.
+
+    Returns:
+        str: Statement name to pass to `StatementCache.execute`.
+
+    Raises:
+        ValueError: If the table name is not a plain identifier.
+    """
+    _check_identifiers(table_name)
+    name = f"delete:{table_name}"
+    STATEMENTS[name] = f"DELETE FROM {table_name} WHERE id = ?"
+    return name
+
+
+@lru_cache(maxsize=None)
+def max_id_statement(table_name):
+    """Register a query for the highest id of a table, and return its name.
+
+    Args:
+        table_name (str): Table to inspect.
+
+    Returns:
+        str: Statement name to pass to `StatementCache.execute`.
+
+    Raises:
+        ValueError: If the table name is not a plain identifier.
+    """
+    _check_identifiers(table_name)
+    name = f"max_id:{table_name}"
+    STATEMENTS[name] = f"SELECT COALESCE(MAX(id), 0) FROM {table_name}"
+    return name
+
+
+class StatementCache:
+    """Runs named statements and keeps per-statement counters.
+
+    sqlite3 compiles a statement the first time its text is executed on a
+    connection and keeps the compiled form in a per-connection LRU cache of
+    CACHED_STATEMENTS entries. A "hit" is an execution whose SQL text is in
+    that cache, so its compiled form is reused. The cache is mirrored here
+    for every connection seen; a record holds on to its connection, so a
+    closed connection's id cannot be taken by a new one while the record
+    exists. Records of closed connections are dropped when a new
+    connection shows up.
+
+    Attributes:
+        statements (dict): Statement name -> SQL text.
+    """
+
+    # size of sqlite3's statement cache, the `cached_statements` default
+    CACHED_STATEMENTS = 128
+
+    def __init__(self, statements=STATEMENTS):
+        """
+        Args:
+            statements (dict): Statement name -> SQL text. Defaults to `STATEMENTS`.
+        """
+        self.statements = statements
+        self.__lock = threading.Lock()
+        # id(connection) -> (connection, OrderedDict of cached SQL texts)
+        self.__prepared = {}
+        self.__counters = {}
+
+    def sql(self, name):
+        """Return the SQL text of a named statement.
+
+        Raises:
+            KeyError: If no statement has that name.
+        """
+        return self.statements[name]
+
+    def __cached(self, connection, sql):
+        """Note an execution of `sql` on a connection; return whether it was a hit."""
+        record = self.__prepared.get(id(connection))
+        if record is None or record[0] is not connection:
+            self.__forget_closed()
+            record = self.__prepared[id(connection)] = (connection, OrderedDict())
+        texts = record[1]
+        if sql in texts:
+            texts.move_to_end(sql)
+            return True
+        texts[sql] = None
+        if len(texts) > self.CACHED_STATEMENTS:
+            texts.popitem(last=False)
+        return False
+
+    def __forget_closed(self):
+        """Drop the records of connections that have been closed."""
+        for key, (connection, _) in list(self.__prepared.items()):
+            try:
+                connection.total_changes
+            except sqlite3.ProgrammingError:
+                del self.__prepared[key]
+
+    def __record(self, cursor, name, elapsed):
+        """Add one execution to the counters of a statement."""
+        with self.__lock:
+            counters = self.__counters.setdefault(name, [0, 0, 0.0])
+            counters[0] += 1
+            if self.__cached(cursor.connection, self.statements[name]):
+                counters[1] += 1
+            counters[2] += elapsed
+
+    def execute(self, cursor, name, parameters=()):
+        """Execute a named statement on a cursor.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor to run the statement on.
+            name (str): Statement name.
+            parameters (sequence|dict): Values for the placeholders.
+
+        Returns:
+            sqlite3.Cursor: The cursor, ready to fetch results.
+        """
+        sql = self.statements[name]
+        started = time.perf_counter()
+        try:
+            return cursor.execute(sql, parameters)
+        finally:
+            self.__record(cursor, name, time.perf_counter() - started)
+
+    def executemany(self, cursor, name, rows):
+        """Execute a named statement once for every row of parameters.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor to run the statement on.
+            name (str): Statement name.
+            rows (iterable): Parameter sequences.
+
+        Returns:
+            sqlite3.Cursor: The cursor.
+        """
+        sql = self.statements[name]
+        started = time.perf_counter()
+        try:
+            return cursor.executemany(sql, rows)
+        finally:
+            self.__record(cursor, name, time.perf_counter() - started)
+
+    def stats(self):
+        """Return the counters of every statement executed so far.
+
+        Returns:
+            dict: Statement name -> {"calls", "hits", "total_ms", "mean_ms"}.
+        """
+        with self.__lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "hits": hits,
+                    "total_ms": total * 1000,
+                    "mean_ms": total * 1000 / calls,
+                }
+                for name, (calls, hits, total) in self.__counters.items()
+            }
+
+    def reset(self):
+        """Clear all counters.
+
+        The mirrored statement caches are kept: what sqlite3 has compiled
+        stays compiled.
+        """
+        with self.__lock:
+            self.__counters.clear()
+
+
+statement_cache = StatementCache()
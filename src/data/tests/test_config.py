@@ -0,0 +1,71 @@
+import unittest
+import sqlite3
+import json
+import os
+from unittest.mock import patch
+
+from src.data import config
+from src.data.database_interface import DatabaseInterface
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        self.config_file = "test_habit_config.json"
+        self.test_db_name = "test_habit_config.db"
+
+    def tearDown(self):
+        config.load_config(refresh=True)
+        for file_name in [self.config_file, self.test_db_name, f"{self.test_db_name}-wal", f"{self.test_db_name}-shm"]:
+            try:
+                os.remove(file_name)
+            except:
+                pass
+
+    def load(self, **environment):
+        """Load the config with only the given HABIT_TRACKER_* variables set."""
+        unrelated = {key: value for key, value in os.environ.items() if not key.startswith("HABIT_TRACKER_")}
+        with patch.dict(os.environ, {**unrelated, "HABIT_TRACKER_CONFIG": self.config_file, **environment}, clear=True):
+            return config.load_config(refresh=True)
+
+    def test_defaults(self):
+        self.assertEqual(self.load(), {"db_path": "habit.db", "profile": "default", "pragmas": {}})
+
+    def test_config_file_and_environment(self):
+        with open(self.config_file, "w") as f:
+            json.dump({"db_path": "from_file.db", "profile": "durable", "pragmas": {"cache_size": -4096}}, f)
+        loaded = self.load(HABIT_TRACKER_DB_PROFILE="performance")
+        self.assertEqual(loaded["db_path"], "from_file.db")
+        self.assertEqual(loaded["profile"], "performance")
+        self.assertEqual(config.get_pragmas()["cache_size"], -4096)
+        self.assertEqual(config.get_pragmas()["journal_mode"], "WAL")
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            self.load(HABIT_TRACKER_DB_PROFILE="turbo")
+
+    def test_apply_pragmas(self):
+        connection = sqlite3.connect(self.test_db_name)
+        config.apply_pragmas(connection, config.PROFILES["performance"])
+        pragmas = config.read_pragmas(connection)
+        connection.close()
+        self.assertEqual(pragmas["journal_mode"], "wal")
+        self.assertEqual(pragmas["synchronous"], 1)
+        self.assertEqual(pragmas["cache_size"], -65536)
+
+    def test_apply_pragmas_rejects_injection(self):
+        connection = sqlite3.connect(":memory:")
+        with self.assertRaises(ValueError):
+            config.apply_pragmas(connection, {"cache_size": "1; DROP TABLE habit"})
+        connection.close()
+
+    def test_database_diagnostics(self):
+        db = DatabaseInterface(self.test_db_name)
+        diagnostics = db.diagnostics()
+        db.close()
+        self.assertEqual(diagnostics["db_path"], self.test_db_name)
+        self.assertIn("journal_mode", diagnostics["pragmas"])
+        self.assertGreater(diagnostics["schema_version"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sqlite3
+import threading
+import os
+
+from src.data.connection_manager import ConnectionManager
+from src.data.database_interface import DatabaseInterface
+from src.data import database
+
+
+class TestConnectionManager(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_connections.db"
+
+    def tearDown(self):
+        while ConnectionManager.reference_count(self.test_db_name):
+            ConnectionManager.release(self.test_db_name)
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_connection_shared_and_counted(self):
+        first = ConnectionManager.acquire(self.test_db_name)
+        second = ConnectionManager.acquire(self.test_db_name)
+        self.assertIs(first, second)
+        self.assertEqual(ConnectionManager.reference_count(self.test_db_name), 2)
+
+    def test_connection_closed_after_last_release(self):
+        connection = ConnectionManager.acquire(self.test_db_name)
+        ConnectionManager.acquire(self.test_db_name)
+        ConnectionManager.release(self.test_db_name)
+        connection.execute("SELECT 1")
+        ConnectionManager.release(self.test_db_name)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+    def test_on_connect_runs_once(self):
+        calls = []
+        ConnectionManager.acquire(self.test_db_name, on_connect=calls.append)
+        ConnectionManager.acquire(self.test_db_name, on_connect=calls.append)
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_on_connect_unregisters_the_connection(self):
+        failed = []
+
+        def fail(connection):
+            failed.append(connection)
+            raise sqlite3.OperationalError("disk I/O error")
+
+        with self.assertRaises(sqlite3.OperationalError):
+            ConnectionManager.acquire(self.test_db_name, on_connect=fail)
+        self.assertEqual(ConnectionManager.reference_count(self.test_db_name), 0)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            failed[0].execute("SELECT 1")
+        calls = []
+        ConnectionManager.acquire(self.test_db_name, on_connect=calls.append)
+        self.assertEqual(len(calls), 1)
+
+    def test_threads_get_their_own_connection(self):
+        connections = []
+        connections.append(ConnectionManager.acquire(self.test_db_name))
+
+        def worker():
+            connections.append(ConnectionManager.acquire(self.test_db_name))
+            connections[-1].execute("SELECT 1")
+            ConnectionManager.release(self.test_db_name)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], connections[1])
+
+    def test_database_interfaces_share_connection(self):
+        # the manager instance the Database module itself uses
+        manager = database.ConnectionManager
+        first = DatabaseInterface(self.test_db_name)
+        second = DatabaseInterface(self.test_db_name)
+        self.assertEqual(manager.reference_count(self.test_db_name), 2)
+        first.close()
+        first.close()
+        self.assertEqual(manager.reference_count(self.test_db_name), 1)
+        second.close()
+        self.assertEqual(manager.reference_count(self.test_db_name), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import threading
+
+from src.data.database_interface import DatabaseInterface
+from src.models.habit import Habit
+
+
+class TestDatabaseBatch(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_batch.db"
+        self.db = DatabaseInterface(self.test_db_name)
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def make_habits(self, count):
+        habits = []
+        for day in range(1, count + 1):
+            habit = Habit("Reading", f"2060-03-{day:02d} 10:00:00", "01:00:00")
+            habit.content.set_description("Read Python book")
+            habits.append(habit)
+        return habits
+
+    def test_add_habits_reports_rows_written(self):
+        status, result = self.db.add_habits(self.make_habits(5))
+        self.assertEqual(status, "success")
+        self.assertEqual(result, 10)
+        self.assertEqual(len(self.db.get_all_habits()), 5)
+
+    def test_add_habits_assigns_matching_ids(self):
+        self.db.add_habit(self.make_habits(1)[0])
+        habits = self.make_habits(3)
+        self.db.add_habits(habits)
+        for habit in habits:
+            row = self.db.get_habit(habit.get_id())
+            self.assertEqual(row[0], habit.get_id())
+            self.assertEqual(row[1], habit.get_id())
+            self.assertEqual(row[6], "Read Python book")
+
+    def test_add_habits_rolls_back_on_failure(self):
+        habits = self.make_habits(3)
+        habits[2].set_name(["not", "bindable"])
+        status, _ = self.db.add_habits(habits)
+        self.assertEqual(status, "error")
+        self.assertEqual(self.db.get_all_habits(), [])
+        self.assertIsNone(habits[0].get_id())
+
+    def test_concurrent_batches_get_distinct_ids(self):
+        barrier = threading.Barrier(4)
+        results = []
+
+        def writer():
+            db = DatabaseInterface(self.test_db_name)
+            try:
+                barrier.wait()
+                for _ in range(5):
+                    results.append(db.add_habits(self.make_habits(20))[0])
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["success"] * 20)
+        rows = self.db.get_all_habits()
+        self.assertEqual(len(rows), 400)
+        self.assertTrue(all(row[0] == row[1] for row in rows))
+
+    def test_add_habits_empty(self):
+        self.assertEqual(self.db.add_habits([]), ("success", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
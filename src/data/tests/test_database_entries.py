@@ -0,0 +1,52 @@
+import unittest
+import os
+
+from src.data.database_interface import DatabaseInterface
+from src.models.habit import Habit
+
+
+class TestDatabaseEntries(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_entries.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.habits = []
+        for day, name in zip(range(5, 0, -1), ["A", "B", "C", "D", "E"]):
+            habit = Habit(name, f"2060-03-{day:02d} 10:00:00", "01:00:00")
+            habit.content.set_description(f"about {name}")
+            self.db.add_habit(habit)
+            self.habits.append(habit)
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_entries_stay_aligned_after_delete(self):
+        self.db.delete_habit(self.habits[1])
+        for row in self.db.get_all_habits():
+            self.assertEqual(row[6], f"about {row[2]}")
+
+    def test_iter_matches_get_all(self):
+        self.assertEqual(list(self.db.iter_all_habits(batch_size=2)), self.db.get_all_habits())
+
+    def test_iter_batches(self):
+        batches = list(self.db.iter_habit_batches(batch_size=2))
+        self.assertEqual([len(rows) for rows in batches], [2, 2, 1])
+        self.assertEqual([row for rows in batches for row in rows], self.db.get_all_habits())
+
+    def test_iter_by_start_datetime(self):
+        names = [row[2] for row in self.db.iter_all_habits(order_by="start_datetime")]
+        self.assertEqual(names, ["E", "D", "C", "B", "A"])
+
+    def test_iter_rejects_unknown_order(self):
+        with self.assertRaises(ValueError):
+            list(self.db.iter_all_habits(order_by="name; DROP TABLE habit"))
+
+    def test_count_habits(self):
+        self.assertEqual(self.db.count_habits(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+
+from src.data.database import Database
+from src.data.database_interface import DatabaseInterface
+from src.models.habit import Habit
+
+
+class TestDatabaseFullTextSearch(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_fts.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.habits = []
+        for day, (name, description, reflection) in enumerate([
+            ("Reading", "read a python book", "python python python"),
+            ("Running", "run in the park", "felt good after reading"),
+            ("Coding", "write python scripts", "fixed a bug"),
+        ], start=1):
+            habit = Habit(name, f"2060-04-{day:02d} 10:00:00", "01:00:00")
+            habit.content.set_description(description)
+            habit.content.set_reflections(reflection)
+            self.db.add_habit(habit)
+            self.habits.append(habit)
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_results_are_ranked(self):
+        names = [row[3] for row in self.db.search_by_content("python")]
+        self.assertEqual(names[0], "Reading")
+        self.assertEqual(sorted(names), ["Coding", "Reading"])
+
+    def test_prefix_and_all_words_match(self):
+        self.assertEqual([row[3] for row in self.db.search_by_content("rea good")], ["Running"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.db.update_habit("habit_content", self.habits[2].get_id(), description="write rust scripts")
+        self.assertEqual([row[3] for row in self.db.search_by_content("python")], ["Reading"])
+        self.assertEqual([row[3] for row in self.db.search_by_content("rust")], ["Coding"])
+        self.db.delete_habit(self.habits[0])
+        self.assertEqual(self.db.search_by_content("python"), [])
+
+    def test_highlight_marks_matched_words(self):
+        row = self.db.search_by_content("park", highlight=True)[0]
+        self.assertIn(f"{Database.HIGHLIGHT_START}park{Database.HIGHLIGHT_END}", row[6])
+        self.assertIsNone(self.db.search_by_content("park")[0][6])
+
+    def test_substring_fallback(self):
+        self.assertEqual([row[3] for row in self.db.search_by_content("ead")], ["Reading", "Running"])
+        row = self.db.search_by_content("YTHON SCR", highlight=True)[0]
+        self.assertEqual(row[3], "Coding")
+        self.assertEqual(row[6], f"write p{Database.HIGHLIGHT_START}ython scr{Database.HIGHLIGHT_END}ipts")
+        self.assertEqual(self.db.search_by_content("100%"), [])
+
+    def test_query_syntax_is_literal(self):
+        self.assertEqual(self.db.search_by_content('"python OR NOT ('), [])
+        self.assertEqual(self.db.search_by_content("   "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
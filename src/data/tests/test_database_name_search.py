@@ -0,0 +1,56 @@
+import unittest
+import os
+import sqlite3
+
+from src.data.database_interface import DatabaseInterface
+from src.models.habit import Habit
+
+
+class TestDatabaseNameSearch(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_names.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.habits = []
+        for day, name in enumerate(["Morning Run", "Evening run", "Reading", "run"], start=1):
+            habit = Habit(name, f"2060-05-{day:02d} 10:00:00", "01:00:00")
+            self.db.add_habit(habit)
+            self.habits.append(habit)
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_substring_is_case_insensitive(self):
+        names = [row[2] for row in self.db.get_name_with_text("RUN")]
+        self.assertEqual(names, ["Morning Run", "Evening run", "run"])
+
+    def test_short_patterns_are_literal(self):
+        self.assertEqual([row[2] for row in self.db.get_name_with_text("ad")], ["Reading"])
+        self.assertEqual(self.db.get_name_with_text("%"), [])
+
+    def test_index_follows_renames_and_deletes(self):
+        self.db.update_habit("habit", self.habits[2].get_id(), name="Writing")
+        self.assertEqual(self.db.get_name_with_text("Read"), [])
+        self.assertEqual([row[2] for row in self.db.get_name_with_text("riti")], ["Writing"])
+        self.db.delete_habit(self.habits[0])
+        self.assertEqual([row[2] for row in self.db.get_name_with_text("run")], ["Evening run", "run"])
+
+    def test_exact_name_is_case_sensitive(self):
+        self.assertEqual([row[2] for row in self.db.get_by_name("run")], ["run"])
+        self.assertEqual(self.db.get_by_name("RUN"), [])
+
+    def test_exact_name_uses_index(self):
+        connection = sqlite3.connect(self.test_db_name)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM habit WHERE name = ? COLLATE NOCASE AND name = ?",
+            ("run", "run"),
+        ).fetchall()
+        connection.close()
+        self.assertIn("idx_habit_name_nocase", " ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
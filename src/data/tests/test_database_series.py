@@ -0,0 +1,143 @@
+import unittest
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from src.data.database_interface import DatabaseInterface
+from src.data.migrations import run_migrations
+from src.models.habit import Habit
+from src.services.recurrence import RecurrenceRule, format_datetimes, weekday_mask
+
+
+class TestDatabaseSeries(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_series.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.pattern = [[{"week1": ["mon", "wed"]}]]
+        self.habits = []
+        for day in range(1, 11):
+            habit = Habit("Gym", f"2060-07-{day:02d} 07:00:00", "01:00:00")
+            habit.content.set_description("lift heavy things")
+            self.habits.append(habit)
+        self.status, self.series_id = self.db.add_series(self.habits, self.pattern)
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_definition_is_stored_once(self):
+        self.assertEqual(self.status, "success")
+        connection = sqlite3.connect(self.test_db_name)
+        stored = connection.execute("SELECT id, description FROM habit_content").fetchall()
+        content_ids = connection.execute("SELECT DISTINCT habit_content_id FROM habit").fetchall()
+        series = connection.execute("SELECT name, description, duration FROM habit_series").fetchall()
+        connection.close()
+        self.assertEqual(stored, [(11, None)])
+        self.assertEqual(content_ids, [(11,)])
+        self.assertEqual(series, [("Gym", "lift heavy things", "01:00:00")])
+
+    def test_add_series_occurrences(self):
+        habit = Habit("Swim", "2060-08-02 18:00:00", "00:45:00")
+        habit.content.set_description("laps")
+        rule = RecurrenceRule(datetime(2060, 8, 2, 18), [weekday_mask(["mon", "thurs"])], repeat=True)
+        start_datetimes = format_datetimes(rule.occurrence_array(end=datetime(2060, 8, 2, 18) + timedelta(days=28)))
+        status, (series_id, ids) = self.db.add_series_occurrences(habit, start_datetimes, self.pattern)
+        self.assertEqual(status, "success")
+        self.assertEqual(list(ids), list(range(12, 20)))
+        series, occurrences = self.db.get_series(series_id)[1]
+        self.assertEqual(series[1:4], ("Swim", "laps", "00:45:00"))
+        self.assertEqual(
+            [row[3] for row in occurrences],
+            [moment.strftime("%Y-%m-%d %H:%M:%S") for moment in rule.occurrences(end=datetime(2060, 8, 30, 18))],
+        )
+        self.assertEqual(self.db.get_habit(ids[0])[6], "laps")
+
+    def test_add_series_without_occurrences(self):
+        habit = Habit("Swim", "2060-08-02 18:00:00", "00:45:00")
+        status, _ = self.db.add_series_occurrences(habit, [])
+        self.assertEqual(status, "error")
+
+    def test_occurrences_read_the_series_description(self):
+        row = self.db.get_habit(self.habits[3].get_id())
+        self.assertEqual(row[6], "lift heavy things")
+        self.assertEqual(len(self.db.get_all_habits()), 10)
+
+    def test_get_series(self):
+        status, (series, occurrences) = self.db.get_series(self.series_id)
+        self.assertEqual(status, "success")
+        self.assertEqual(series, (self.series_id, "Gym", "lift heavy things", "01:00:00", self.pattern))
+        self.assertEqual([row[0] for row in occurrences], [habit.get_id() for habit in self.habits])
+
+    def test_reflections_stay_per_occurrence(self):
+        first, second = self.habits[0].get_id(), self.habits[1].get_id()
+        self.assertEqual(self.db.update_habit("habit_content", first, reflection="too tired")[0], "success")
+        self.assertEqual(self.db.update_habit("habit_content", first, reflection="slept in")[0], "success")
+        self.assertEqual(self.db.get_habit(first)[1], first)
+        self.assertEqual(self.db.get_habit(first)[6:8], ("lift heavy things", "slept in"))
+        self.assertEqual(self.db.get_habit(second)[1], 11)
+        self.assertNotEqual(self.db.get_habit(second)[7], "slept in")
+        self.assertEqual([row[0] for row in self.db.search_by_content("slept")], [first])
+
+    def test_single_habits_keep_their_content_id_after_a_series(self):
+        habit = Habit("Read", "2060-08-01 21:00:00", "00:30:00")
+        self.assertEqual(self.db.add_habit(habit)[0], "success")
+        self.assertEqual(habit.get_id(), 12)
+        self.assertEqual(self.db.get_habit(12)[1], 12)
+
+    def test_content_search_finds_series_once(self):
+        results = self.db.search_by_content("heavy")
+        self.assertEqual([(row[0], row[3]) for row in results], [(self.habits[0].get_id(), "Gym")])
+
+    def test_delete_occurrence_and_series(self):
+        self.assertEqual(self.db.delete_habit(self.habits[0])[0], "success")
+        self.assertEqual(len(self.db.get_series(self.series_id)[1][1]), 9)
+        self.db.update_habit("habit_content", self.habits[1].get_id(), reflection="sore")
+        self.assertEqual(self.db.delete_habit(self.habits[2])[0], "success")
+        self.assertEqual(self.db.database.get_max_id("habit_content"), 11)
+        self.assertEqual(self.db.delete_series(self.series_id), ("success", None))
+        self.assertEqual(self.db.get_all_habits(), [])
+        self.assertEqual(self.db.get_series(self.series_id)[0], "error")
+        self.assertEqual(self.db.database.get_max_id("habit_content"), 0)
+
+
+class TestSeriesMigration(unittest.TestCase):
+    def setUp(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE habit_content (id INTEGER PRIMARY KEY, description TEXT, reflection TEXT)")
+        self.connection.execute(
+            "CREATE TABLE habit (id INTEGER PRIMARY KEY, habit_content_id INTEGER, name TEXT,"
+            " start_datetime TEXT, duration TEXT, status TEXT)"
+        )
+
+    def tearDown(self):
+        self.connection.close()
+
+    def add(self, id, name, description):
+        self.connection.execute("INSERT INTO habit_content (id, description) VALUES (?, ?)", (id, description))
+        self.connection.execute(
+            "INSERT INTO habit (id, habit_content_id, name, start_datetime, duration, status)"
+            " VALUES (?, ?, ?, ?, '00:30:00', 'UPCOMING')",
+            (id, id, name, f"2060-01-0{id} 06:00:00"),
+        )
+
+    def test_existing_habits_stay_single(self):
+        for id, (name, description) in enumerate([("Run", "5k"), ("Run", "5k"), ("Run", "10k"), ("Read", "5k")], 1):
+            self.add(id, name, description)
+        self.connection.commit()
+        self.assertEqual(run_migrations(self.connection)[0], "success")
+
+        self.assertEqual(self.connection.execute("SELECT * FROM habit_series").fetchall(), [])
+        self.assertEqual(
+            self.connection.execute("SELECT series_id FROM habit ORDER BY id").fetchall(), [(None,)] * 4
+        )
+        self.assertEqual(
+            self.connection.execute("SELECT description FROM habit_content ORDER BY id").fetchall(),
+            [("5k",), ("5k",), ("10k",), ("5k",)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
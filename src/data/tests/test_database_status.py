@@ -0,0 +1,124 @@
+import unittest
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+from src.data.database_interface import DatabaseInterface
+from src.data.queries import statement_cache
+from src.models.habit import Habit
+from src.services.handle_time import DateTimeHandler
+
+
+class TestDatabaseStatus(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_status.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.now = datetime.now().replace(microsecond=0)
+        self.cases = {
+            "upcoming": (self.now + timedelta(hours=2), "01:00:00", "UPCOMING"),
+            "ongoing": (self.now - timedelta(minutes=10), "01:00:00", "UPCOMING"),
+            "ongoing_for_a_day": (self.now - timedelta(hours=20), "30:00:00", "UPCOMING"),
+            "ongoing_unpadded": (self.now - timedelta(minutes=10), "1:0:0", "UPCOMING"),
+            "to_be_confirmed": (self.now - timedelta(hours=3), "01:00:00", "ONGOING"),
+            "missed": (self.now - timedelta(days=3), "00:10:00", "TO_BE_CONFIRMED"),
+            "done": (self.now - timedelta(days=3), "00:10:00", "DONE"),
+            "malformed": ("someday", "00:10:00", "UPCOMING"),
+        }
+        self.habits = {}
+        for name, (start_datetime, duration, status) in self.cases.items():
+            habit = Habit(name, str(start_datetime), duration)
+            self.db.add_habit(habit)
+            self.db.update_habit("habit", habit.get_id(), status=status)
+            self.habits[name] = habit
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def status_of(self, name):
+        return self.db.get_habit(self.habits[name].get_id())[5]
+
+    def test_transitions_counted(self):
+        status, transitions = self.db.update_statuses(self.now)
+        self.assertEqual(status, "success")
+        self.assertEqual(transitions, {
+            ("UPCOMING", "ONGOING"): 3,
+            ("ONGOING", "TO_BE_CONFIRMED"): 1,
+            ("TO_BE_CONFIRMED", "MISSED"): 1,
+        })
+
+    def test_statuses_match_datetime_handler(self):
+        self.db.update_statuses(self.now)
+        handler = DateTimeHandler()
+        for name in ["upcoming", "ongoing", "ongoing_for_a_day", "ongoing_unpadded", "to_be_confirmed", "missed"]:
+            start_datetime, duration, _ = self.cases[name]
+            self.assertEqual(self.status_of(name), handler.map_time_to_status(str(start_datetime), duration))
+
+    def test_final_and_malformed_rows_untouched(self):
+        self.db.update_statuses(self.now)
+        self.assertEqual(self.status_of("done"), "DONE")
+        self.assertEqual(self.status_of("malformed"), "UPCOMING")
+
+    def test_second_sweep_changes_nothing(self):
+        self.db.update_statuses(self.now)
+        self.assertEqual(self.db.update_statuses(self.now), ("success", {}))
+
+    def add_stale_habit(self):
+        habit = Habit("stale", str(self.now - timedelta(days=10)), "00:10:00")
+        self.db.add_habit(habit)
+        return habit
+
+    def test_watermark_recorded(self):
+        self.db.update_statuses(self.now)
+        self.assertEqual(self.db.database.get_state("last_status_sweep"), self.now.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def test_incremental_sweep_includes_habits_added_since(self):
+        self.db.update_statuses(self.now)
+        stale = self.add_stale_habit()
+        self.db.update_statuses(self.now + timedelta(minutes=1))
+        self.assertEqual(self.db.get_habit(stale.get_id())[5], "MISSED")
+
+    def test_incremental_sweep_after_a_habit_moved_back(self):
+        self.db.update_statuses(self.now)
+        habit = self.habits["upcoming"]
+        self.db.update_habit("habit", habit.get_id(), start_datetime=str(self.now - timedelta(days=10)))
+        self.db.update_statuses(self.now + timedelta(minutes=1))
+        self.assertEqual(self.status_of("upcoming"), "MISSED")
+
+    def test_window_sweep_uses_indexes(self):
+        self.db.update_statuses(self.now)
+        connection = sqlite3.connect(self.test_db_name)
+        try:
+            plan = connection.execute(
+                "EXPLAIN QUERY PLAN " + statement_cache.sql("apply_transitions_window"),
+                {"now": 0, "window_start": 0, "last_id": 0},
+            ).fetchall()
+        finally:
+            connection.close()
+        plan = " ".join(row[-1] for row in plan)
+        self.assertIn("idx_habit_start_end_ts", plan)
+        self.assertIn("INTEGER PRIMARY KEY (rowid>?)", plan)
+
+    def test_incremental_sweep_picks_up_new_transitions(self):
+        self.db.update_statuses(self.now)
+        status, transitions = self.db.update_statuses(self.now + timedelta(hours=2, minutes=30))
+        self.assertEqual(transitions, {("UPCOMING", "ONGOING"): 1, ("ONGOING", "TO_BE_CONFIRMED"): 2})
+
+    def test_full_sweep(self):
+        self.db.update_statuses(self.now)
+        stale = self.add_stale_habit()
+        self.db.update_statuses(self.now, full=True)
+        self.assertEqual(self.db.get_habit(stale.get_id())[5], "MISSED")
+
+    def test_clock_skew_falls_back_to_full_sweep(self):
+        self.db.update_statuses(self.now + timedelta(days=30))
+        stale = self.add_stale_habit()
+        self.db.update_statuses(self.now)
+        self.assertEqual(self.db.get_habit(stale.get_id())[5], "MISSED")
+
+
+if __name__ == "__main__":
+    unittest.main()
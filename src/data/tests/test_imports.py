@@ -0,0 +1,30 @@
+import ast
+import os
+import unittest
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(path):
+    """Return the names of the modules a source file imports."""
+    with open(path, encoding="utf-8") as source:
+        tree = ast.parse(source.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            yield node.module
+
+
+class TestDataLayerImports(unittest.TestCase):
+    def test_data_does_not_import_services_or_components(self):
+        for file_name in os.listdir(DATA_DIR):
+            if not file_name.endswith(".py"):
+                continue
+            for module in imported_modules(os.path.join(DATA_DIR, file_name)):
+                with self.subTest(file=file_name, module=module):
+                    self.assertNotIn(module.split(".")[0], ("services", "components"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import sqlite3
+import os
+
+from src.data.database import Database
+from src.data.migrations import MIGRATIONS, run_migrations, get_schema_version
+from src.data.queries import statement_cache
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_migrations.db"
+        self.database = Database(self.test_db_name)
+        self.connection = sqlite3.connect(self.test_db_name)
+
+    def tearDown(self):
+        self.connection.close()
+        self.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def query_plan(self, sql, parameters=()):
+        rows = self.connection.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        return " ".join(row[-1] for row in rows)
+
+    def test_schema_version_recorded(self):
+        latest = max(version for version, _, _ in MIGRATIONS)
+        self.assertEqual(get_schema_version(self.connection), latest)
+
+    def test_migrations_are_not_reapplied(self):
+        self.assertEqual(run_migrations(self.connection), ("success", get_schema_version(self.connection)))
+
+    def test_failed_migration_rolls_back(self):
+        version = get_schema_version(self.connection)
+        broken = [(version + 1, "broken", ["CREATE INDEX idx_broken ON habit(status)", "CREATE INDEX oops ON missing(x)"])]
+        status, _ = run_migrations(self.connection, broken)
+        self.assertEqual(status, "error")
+        self.assertEqual(get_schema_version(self.connection), version)
+        indexes = [row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type='index'")]
+        self.assertNotIn("idx_broken", indexes)
+
+    def test_runs_inside_an_open_transaction(self):
+        version = get_schema_version(self.connection)
+        self.connection.execute("INSERT INTO habit_content (id) VALUES (1)")
+        self.assertTrue(self.connection.in_transaction)
+        added = [(version + 1, "added", ["CREATE INDEX idx_added ON habit(name)"])]
+        broken = [(version + 2, "broken", ["CREATE INDEX oops ON missing(x)"])]
+        self.assertEqual(run_migrations(self.connection, added), ("success", version + 1))
+        self.assertEqual(run_migrations(self.connection, broken)[0], "error")
+        self.assertTrue(self.connection.in_transaction)
+        self.connection.commit()
+        self.assertEqual(get_schema_version(self.connection), version + 1)
+        self.assertEqual(self.connection.execute("SELECT id FROM habit_content").fetchall(), [(1,)])
+
+    def test_status_lookup_uses_index(self):
+        plan = self.query_plan("SELECT * FROM habit WHERE status = ?", ("UPCOMING",))
+        self.assertIn("SEARCH habit USING INDEX idx_habit_status", plan)
+
+    def test_date_lookup_uses_index(self):
+        plan = self.query_plan(
+            "SELECT * FROM habit WHERE start_datetime >= ? AND start_datetime < ?",
+            ("2025-04-15", "2025-04-16"),
+        )
+        self.assertIn("SEARCH habit USING INDEX idx_habit_start_datetime", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_epoch_range_lookup_uses_index(self):
+        plan = self.query_plan("SELECT * FROM habit WHERE start_ts >= ? AND start_ts < ?", (0, 86400))
+        self.assertIn("SEARCH habit USING INDEX idx_habit_start_end_ts", plan)
+
+    def test_epoch_columns_follow_writes(self):
+        self.database.add_entry("habit_content", ["id"], [1])
+        self.database.add_entry(
+            "habit", ["id", "habit_content_id", "name", "start_datetime", "duration", "status"],
+            [1, 1, "gym", "1970-01-02 00:00:00", "01:30:00", "UPCOMING"],
+        )
+        columns = "SELECT start_ts, end_ts, duration_s FROM habit WHERE id = 1"
+        self.assertEqual(self.connection.execute(columns).fetchone(), (86400, 86400 + 5400, 5400))
+        self.database.update_entry("habit", 1, duration="00:00:10")
+        self.assertEqual(self.connection.execute(columns).fetchone(), (86400, 86410, 10))
+        self.database.update_entry("habit", 1, start_datetime="not a date")
+        self.assertEqual(self.connection.execute(columns).fetchone(), (None, None, 10))
+
+    def test_epoch_columns_backfilled(self):
+        legacy_db_name = "test_habit_migrations_legacy.db"
+        connection = sqlite3.connect(legacy_db_name)
+        connection.execute("CREATE TABLE habit_content (id INTEGER PRIMARY KEY, description TEXT, reflection TEXT)")
+        connection.execute(
+            "CREATE TABLE habit (id INTEGER PRIMARY KEY, habit_content_id INTEGER, name TEXT,"
+            " start_datetime TEXT, duration TEXT, status TEXT)"
+        )
+        connection.execute("INSERT INTO habit VALUES (1, 1, 'gym', '1970-01-01 01:00:00', '00:01:00', 'DONE')")
+        connection.commit()
+        self.assertEqual(run_migrations(connection)[0], "success")
+        columns = "SELECT start_ts, end_ts, duration_s FROM habit"
+        self.assertEqual(connection.execute(columns).fetchone(), (None, None, None))
+        database = Database(legacy_db_name)
+        try:
+            self.assertEqual(connection.execute(columns).fetchone(), (3600, 3660, 60))
+        finally:
+            database.close()
+            connection.close()
+            os.remove(legacy_db_name)
+
+    def test_epoch_columns_of_long_and_unpadded_durations(self):
+        self.database.add_entry("habit_content", ["id"], [1])
+        self.database.add_entries([(
+            "habit", ["id", "habit_content_id", "name", "start_datetime", "duration", "status"],
+            [[1, 1, "hike", "1970-01-02 00:00:00", "26:00:00", "UPCOMING"],
+             [2, 1, "nap", "1970-01-02 00:00:00", "1:5:0", "UPCOMING"]],
+        )])
+        rows = self.connection.execute("SELECT start_ts, end_ts, duration_s FROM habit ORDER BY id").fetchall()
+        self.assertEqual(rows, [(86400, 86400 + 93600, 93600), (86400, 86400 + 3900, 3900)])
+
+    def test_habit_rows_are_written_without_triggers(self):
+        triggers = [row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type='trigger'")]
+        self.assertNotIn("habit_epoch_insert", triggers)
+        self.assertNotIn("habit_epoch_update", triggers)
+
+    def test_missing_epoch_columns_filled_on_connect(self):
+        self.database.close()
+        self.connection.execute(
+            "INSERT INTO habit (id, habit_content_id, name, start_datetime, duration, status)"
+            " VALUES (1, 1, 'hike', '1970-01-02 00:00:00', '26:00:00', 'UPCOMING'),"
+            " (2, 1, 'odd', 'someday', '01:00:00', 'UPCOMING')"
+        )
+        self.connection.commit()
+        self.database = Database(self.test_db_name)
+        rows = self.connection.execute("SELECT start_ts, end_ts, duration_s FROM habit ORDER BY id").fetchall()
+        self.assertEqual(rows, [(86400, 86400 + 93600, 93600), (None, None, None)])
+        plan = self.query_plan(statement_cache.sql("habits_without_end_ts"))
+        self.assertIn("idx_habit_end_ts_missing", plan)
+
+    def test_name_lookup_uses_index(self):
+        plan = self.query_plan("SELECT * FROM habit WHERE name = ? COLLATE NOCASE", ("gym",))
+        self.assertIn("SEARCH habit USING INDEX idx_habit_name_nocase", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
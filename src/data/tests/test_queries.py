@@ -0,0 +1,81 @@
+import unittest
+import os
+import sqlite3
+
+from src.data import database
+from src.data.queries import StatementCache
+from src.data.database_interface import DatabaseInterface
+from src.models.habit import Habit
+
+
+class TestStatementCache(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_queries.db"
+        self.db = DatabaseInterface(self.test_db_name)
+        self.statement_cache = database.statement_cache
+        self.statement_cache.reset()
+
+    def tearDown(self):
+        self.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_repeated_statement_counts_hits(self):
+        for status in ["UPCOMING", "DONE", "MISSED"]:
+            self.db.get_habits_by_status(status)
+        counters = self.statement_cache.stats()["habits_by_status"]
+        self.assertEqual(counters["calls"], 3)
+        self.assertEqual(counters["hits"], 2)
+        self.assertGreaterEqual(counters["total_ms"], 0)
+
+    def test_hits_need_the_text_cached_on_that_connection(self):
+        cache = StatementCache({"one": "SELECT 1", "same_text": "SELECT 1", "two": "SELECT 2"})
+        for _ in range(3):
+            # a closed connection's id is often given to the next one
+            connection = sqlite3.connect(":memory:")
+            cache.execute(connection.cursor(), "one")
+            connection.close()
+        self.assertEqual(cache.stats()["one"]["hits"], 0)
+
+        connection = sqlite3.connect(":memory:")
+        cursor = connection.cursor()
+        cache.execute(cursor, "one")
+        cache.execute(cursor, "same_text")
+        cache.execute(cursor, "two")
+        connection.close()
+        stats = cache.stats()
+        self.assertEqual(stats["same_text"]["hits"], 1)
+        self.assertEqual(stats["two"]["hits"], 0)
+
+    def test_hits_follow_the_lru_eviction(self):
+        statements = {f"s{i}": f"SELECT {i}" for i in range(StatementCache.CACHED_STATEMENTS + 1)}
+        cache = StatementCache(statements)
+        connection = sqlite3.connect(":memory:")
+        cursor = connection.cursor()
+        for name in statements:
+            cache.execute(cursor, name)
+        cache.execute(cursor, "s0")
+        connection.close()
+        self.assertEqual(cache.stats()["s0"]["hits"], 0)
+
+    def test_quotes_in_input_are_values(self):
+        habit = Habit("it's \"quoted\"", "2060-06-01 10:00:00", "01:00:00")
+        self.db.add_habit(habit)
+        self.assertEqual(self.db.get_habits_by_status("it's"), [])
+        self.assertEqual(self.db.get_by_name("it's \"quoted\"")[0][2], "it's \"quoted\"")
+        self.assertEqual(self.db.get_habit(habit.get_id())[2], "it's \"quoted\"")
+
+    def test_update_rejects_bad_column_names(self):
+        message, error = self.db.database.update_entry("habit", 1, **{"name = 'x'; --": "y"})
+        self.assertEqual(message, "error")
+        self.assertIsInstance(error, ValueError)
+
+    def test_diagnostics_report_statements(self):
+        self.db.get_habits_by_status("DONE")
+        self.assertIn("habits_by_status", self.db.diagnostics()["statements"])
+
+
+if __name__ == "__main__":
+    unittest.main()
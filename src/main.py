@@ -1,23 +1,9 @@
-from components.add_habit.controller import add_habit_controller
-from components.delete_habit.controller import delete_habit_controller
-from components.update_habit.controller import update_habit_controller
-from components.get_habit.view import get_habit_view
+from services.command_registry import CommandRegistry
+from services.habit_factory import HabitFactory
 from services.inputs import ManageMainLoop
+from services.status_scheduler import StatusScheduler
 
-add_habit = add_habit_controller.AddHabitController()
-update_habit = update_habit_controller.UpdateHabitController()
-get_habit = get_habit_view.GetHabitView()
-delete_habit = delete_habit_controller.DeleteHabitController()
-
-commands = {
-    'create habit':add_habit.execute,
-    'update habit':update_habit.execute,
-    'get habits':get_habit.get_habit,
-    'delete habit':delete_habit.execute
-}
-
-print(
-r"""
+BANNER = r"""
 ===========================================================================================================
 
     ██╗  ██╗ █████╗ ██████╗ ██╗████████╗    ████████╗██████╗  █████╗  ██████╗██╗  ██╗███████╗██████╗ 
@@ -29,12 +15,8 @@ r"""
                                 [🚀 Build consistency. Track growth.]
 ===========================================================================================================
 """
-)
 
-update_habit.update_statuses()
-ManageMainLoop().command_loop(commands,switched_to="home")
-
-print(r"""
+FAREWELL = r"""
 ===========================================================================================================
 
     Thanks for using HABIT TRACKER 🙌
@@ -44,5 +26,49 @@ print(r"""
 
                                 [ Exit complete. Stay disciplined. ]
 ===========================================================================================================
-""")
-update_habit.update_statuses()
+"""
+
+
+def build_commands():
+    """Register the home console commands.
+
+    Controllers and views are only imported and constructed when one of
+    their commands is first entered.
+
+    Returns:
+        CommandRegistry: The home console commands.
+    """
+    commands = CommandRegistry()
+    commands.register('create habit', 'components.add_habit.controller.add_habit_controller:AddHabitController', 'execute')
+    commands.register('update habit', 'components.update_habit.controller.update_habit_controller:UpdateHabitController', 'execute')
+    commands.register('get habits', 'components.get_habit.view.get_habit_view:GetHabitView', 'get_habit')
+    commands.register('delete habit', 'components.delete_habit.controller.delete_habit_controller:DeleteHabitController', 'execute')
+    commands.register('diagnostics', 'components.diagnostics.view.diagnostics_view:DiagnosticsView', 'display_diagnostics')
+    return commands
+
+
+def main():
+    """Run the interactive habit tracker until the user exits.
+
+    The database connection and the status scheduler are created here
+    rather than at import time, and each console is built the first time
+    its command is used, so the first prompt shows up quickly.
+    """
+    commands = build_commands()
+    habit_factory = HabitFactory()
+
+    print(BANNER)
+
+    habit_factory.update_statuses()
+    status_scheduler = StatusScheduler()
+    status_scheduler.start()
+    ManageMainLoop().command_loop(commands,switched_to="home")
+    status_scheduler.stop()
+
+    print(FAREWELL)
+    habit_factory.update_statuses()
+    habit_factory.close()
+
+
+if __name__ == "__main__":
+    main()
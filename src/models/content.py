@@ -14,6 +14,9 @@ class HabitContent:
     accessor methods. If a value has not been set, the getters return a
     human-friendly placeholder string.
     """
+
+    __slots__ = ("__description", "__reflections", "_id")
+
     def __init__(self, description="", id=None) -> None:
         """Create a HabitContent instance.
 
@@ -1,45 +1,80 @@
 """Model representing a Habit and its core attributes.
 
 This module defines the Habit class which encapsulates the name, start
-datetime, duration, status and content for a habit. The class includes
-convenience methods for manipulating the habit's datetime (e.g. moving to
-the next day) and for converting the stored datetime into a human-readable
-string. Equality and representation helpers are provided to make instances
-easy to compare in tests.
+datetime, duration, status and content for a habit. The start datetime is
+kept as a `datetime`, so moving to the next day or reading the weekday is
+plain date arithmetic; it is only turned into text when the habit is stored
+or displayed. Habits are slotted and create their HabitContent on first use,
+so listing or analysing large histories does not pay for a per-instance
+`__dict__` or for content that is never read. Equality and representation helpers are provided to make
+instances easy to compare in tests.
 """
 
+from datetime import datetime, timedelta
+
 from models.status import HabitStatus
 from models.content import HabitContent
-from data.database_interface import DatabaseInterface
-from services.handle_time import DateTimeHandler
+from services.recurrence import WEEKDAYS
+
+# Accepted textual start datetimes: the stored format and the input format.
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d, %H:%M", "%Y-%m-%d %H:%M")
+
+
+def parse_datetime(value):
+    """Convert a start datetime to a `datetime` when possible.
+
+    Args:
+        value: A datetime, or a string in one of DATETIME_FORMATS.
+
+    Returns:
+        datetime: The parsed value, or `value` unchanged if it is neither.
+    """
+    if isinstance(value, datetime):
+        return value
+    for datetime_format in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(str(value), datetime_format)
+        except ValueError:
+            continue
+    return value
 
 class Habit:
     """Data model for a habit.
 
-    Attributes:
-        db (DatabaseInterface): Class-level database interface used by
-            higher-level services (kept here for historical reasons).
+    Habits hold no database handle; persistence goes through HabitFactory.
     """
-    db = DatabaseInterface()
+
+    __slots__ = ("__name", "__start_datetime", "__duration", "__status", "__content", "__id")
 
     def __init__(self, name, start_datetime, duration, id=None) -> None:
         """Initialize a Habit instance.
 
         Args:
             name (str): Name of the habit.
-            start_datetime: Datetime representation used by the project
-                (usually a string produced by the input flow).
+            start_datetime: A datetime, or a string in one of
+                DATETIME_FORMATS which is parsed once here. Other values are
+                kept as given.
             duration: Duration value for the habit session (string/number).
             id: Optional external identifier for the habit.
         """
         self.__name = name
-        self.__start_datetime = start_datetime
+        self.__start_datetime = parse_datetime(start_datetime)
         self.__duration = duration
         self.__status = HabitStatus.UPCOMING
-        self.content = HabitContent()
-        self.date_time_handler = DateTimeHandler()
+        self.__content = None
         self.__id = id
 
+    @property
+    def content(self):
+        """HabitContent: Description and reflections, created on first access."""
+        if self.__content is None:
+            self.__content = HabitContent()
+        return self.__content
+
+    @content.setter
+    def content(self, content):
+        self.__content = content
+
     def get_name(self):
         """Return the habit's name."""
         return self.__name
@@ -53,7 +88,7 @@ class Habit:
         self.__name = name
 
     def get_start_datetime(self):
-        """Return the stored start datetime."""
+        """Return the start datetime, a `datetime` unless it could not be parsed."""
         return self.__start_datetime
     
     def stringify_datetime(self,datetime):
@@ -71,31 +106,35 @@ class Habit:
         year,month,day= year.split('-')
         return f'{year}-{month}-{day}, {time}'
     
+    def __checked_start_datetime(self):
+        """Return the start datetime, raising ValueError if it is not a datetime."""
+        if not isinstance(self.__start_datetime, datetime):
+            raise ValueError(f"invalid start datetime '{self.__start_datetime}'")
+        return self.__start_datetime
+
     def next_day(self, days=1):
         """Advance the habit's start datetime by a number of days.
 
         Args:
             days (int): Number of days to advance (default 1).
         """
-        self.date_time_handler.set_start_datetime( self.stringify_datetime(self.__start_datetime))
-        self.date_time_handler.increase_by_day(days)
-        self.__start_datetime = self.date_time_handler.get_startdatetime()
+        self.__start_datetime = self.__checked_start_datetime() + timedelta(days=days)
     
     def weekday(self):
         """Return the weekday name of the habit's start datetime.
 
-        Delegates to DateTimeHandler.get_weekday().
+        Returns:
+            str: One of WEEKDAYS, the names DateTimeHandler.get_weekday() uses.
         """
-        self.date_time_handler.set_start_datetime(self.stringify_datetime(self.__start_datetime))
-        return self.date_time_handler.get_weekday()
+        return WEEKDAYS[self.__checked_start_datetime().weekday()]
 
     def set_start_datetime(self, start_datetime):
         """Set a new start datetime for the habit.
 
         Args:
-            start_datetime: New start datetime value.
+            start_datetime: New start datetime, parsed like in `__init__`.
         """
-        self.__start_datetime = start_datetime
+        self.__start_datetime = parse_datetime(start_datetime)
     
     def get_duration(self):
         """Return the habit's duration."""
@@ -149,8 +188,8 @@ class Habit:
             self.__name == habit.get_name(), 
             self.__id == habit.get_id(), 
             self.content==habit.content,
-            str(self.__duration)==habit.get_duration(),
-            str(self.__start_datetime)==habit.get_start_datetime(),
+            str(self.__duration)==str(habit.get_duration()),
+            str(self.__start_datetime)==str(habit.get_start_datetime()),
             str(self.get_status())==habit.get_status(),
             ])
 
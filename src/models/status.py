@@ -18,6 +18,7 @@ class HabitStatus(enum.Enum):
         DONE: Habit completed.
         DEAD: Habit terminated or cancelled.
         MISSED: Habit that has been missed.
+        TO_BE_CONFIRMED: Habit whose session has ended, awaiting confirmation.
     """
 
     ONGOING = "ONGOING"
@@ -26,6 +27,7 @@ class HabitStatus(enum.Enum):
     DONE = "DONE"
     DEAD = "DEAD"
     MISSED = "MISSED"
+    TO_BE_CONFIRMED = "TO_BE_CONFIRMED"
 
     @classmethod
     def get_status(cls, status):
@@ -40,14 +42,8 @@ class HabitStatus(enum.Enum):
                 found.
         """
 
-        match status.upper():
-            case "ONGOING":
-                return cls.ONGOING
-            case "UPCOMING":
-                return cls.UPCOMING
-            case "ACTIVE":
-                return cls.ACTIVE
-            case "MISSED":
-                return cls.MISSED
-            case "DONE":
-                return cls.DONE
\ No newline at end of file
+        return _STATUS_LOOKUP.get(str(status).upper())
+
+
+# Built once; get_status runs for every habit row that is loaded.
+_STATUS_LOOKUP = {member.value: member for member in HabitStatus}
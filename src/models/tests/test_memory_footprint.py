@@ -0,0 +1,62 @@
+import unittest
+import tracemalloc
+from datetime import datetime
+
+from src.models.habit import Habit
+from src.models.content import HabitContent
+from src.models.status import HabitStatus
+from src.services.handle_time import DateTimeHandler
+
+
+OBJECTS = 1_000_000
+
+# Bytes per instance, list slot included, measured with everything the
+# constructor allocates (DateTimeHandler includes its creation timestamp).
+BUDGETS = {
+    "Habit": 160,
+    "HabitContent": 96,
+    "DateTimeHandler": 128,
+}
+
+
+def footprint(make):
+    """Return the bytes allocated per object when building OBJECTS of them."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [make() for _ in range(OBJECTS)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objects
+    return allocated / OBJECTS
+
+
+class TestMemoryFootprint(unittest.TestCase):
+    def test_classes_are_slotted(self):
+        for instance in (Habit("Run", "2060-01-01 07:00:00", "01:00:00"), HabitContent(), DateTimeHandler()):
+            self.assertFalse(hasattr(instance, "__dict__"), type(instance).__name__)
+
+    def test_habit_content_is_created_lazily(self):
+        habit = Habit("Run", "2060-01-01 07:00:00", "01:00:00")
+        self.assertIsNone(habit._Habit__content)
+        self.assertEqual(habit.content.get_description(), "nothing written yet")
+        self.assertIs(habit.content, habit.content)
+
+    def test_status_lookup(self):
+        self.assertIs(HabitStatus.get_status("dead"), HabitStatus.DEAD)
+        self.assertIsNone(HabitStatus.get_status("unknown"))
+
+    def test_habit_footprint(self):
+        start = datetime(2060, 1, 1, 7)
+        self.assertLess(footprint(lambda: Habit("Run", start, "01:00:00")), BUDGETS["Habit"])
+
+    def test_habit_content_footprint(self):
+        self.assertLess(footprint(HabitContent), BUDGETS["HabitContent"])
+
+    def test_datetime_handler_footprint(self):
+        self.assertLess(footprint(DateTimeHandler), BUDGETS["DateTimeHandler"])
+
+
+if __name__ == "__main__":
+    unittest.main()
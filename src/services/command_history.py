@@ -0,0 +1,188 @@
+"""Bounded command history for the interactive consoles.
+
+prompt_toolkit's FileHistory appends every command to a file forever and
+parses the whole file whenever a session loads it. CompactHistory keeps a
+capped, deduplicated ring of the most recent commands instead:
+
+    - the file holds one command per line, oldest first, with backslashes
+      and newlines escaped;
+    - new commands are appended, so storing one is a single short write;
+    - once the file holds more than `compact_after` times `max_entries`
+      lines, it is rewritten with only the newest occurrence of each of the
+      `max_entries` most recent commands.
+
+The file therefore never grows past a fixed size, and loading it costs the
+same however long the install has been in use. `open_history` wraps it in
+CompactThreadedHistory, so the file is read in a background thread while the
+first prompt is already on screen, and the commands kept in memory are
+deduplicated and capped like the file.
+
+Appends and compactions of one CompactHistory are serialized by a lock, so a
+command stored while the loader thread compacts the file is not lost when
+the compacted copy replaces it.
+
+This module imports prompt_toolkit; services.word_prediction only imports
+it when the first prompt session is built.
+"""
+
+import os
+import threading
+
+from prompt_toolkit.history import History, ThreadedHistory
+
+MAX_ENTRIES = 1000
+COMPACT_AFTER = 2
+
+
+def escape(command):
+    """Encode a command as a single line of the history file."""
+    return command.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def unescape(line):
+    """Decode a line of the history file back into a command."""
+    parts = line.split("\\\\")
+    return "\\".join(part.replace("\\n", "\n") for part in parts)
+
+
+def newest_unique(commands, max_entries):
+    """Return the newest occurrence of each command, most recent first.
+
+    Args:
+        commands (iterable[str]): Commands, oldest first.
+        max_entries (int): Maximum number of commands returned.
+
+    Returns:
+        list[str]: At most `max_entries` distinct commands.
+    """
+    seen = set()
+    newest = []
+    for command in reversed(list(commands)):
+        if command in seen:
+            continue
+        seen.add(command)
+        newest.append(command)
+        if len(newest) == max_entries:
+            break
+    return newest
+
+
+class CompactHistory(History):
+    """A prompt_toolkit History kept in a capped, self-compacting file.
+
+    Attributes:
+        path (str): History file.
+        max_entries (int): Distinct commands kept.
+        compact_after (int): The file is compacted once it holds more than
+            `compact_after * max_entries` lines.
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, compact_after=COMPACT_AFTER):
+        """Create a history; nothing is read until it is loaded.
+
+        Args:
+            path (str): History file. Missing parent directories are created
+                on the first write.
+            max_entries (int): Distinct commands kept.
+            compact_after (int): Compaction threshold, as a multiple of
+                `max_entries`.
+        """
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.compact_after = compact_after
+        # lines in the file, known once it has been read
+        self.__lines = None
+        # held while the file is appended to or rewritten
+        self.__lock = threading.RLock()
+
+    def load_history_strings(self):
+        """Read the file and return its commands, most recent first.
+
+        The file is compacted when it holds duplicates or more than
+        `max_entries` commands.
+        """
+        with self.__lock:
+            try:
+                with open(self.path, encoding="utf-8") as history_file:
+                    commands = [unescape(line.rstrip("\n")) for line in history_file if line.strip()]
+            except FileNotFoundError:
+                commands = []
+            newest = newest_unique(commands, self.max_entries)
+            if len(newest) < len(commands):
+                self.compact(newest)
+            else:
+                self.__lines = len(commands)
+        return newest
+
+    def append_string(self, string):
+        """Add a command to the loaded history, dropping its older occurrence."""
+        if string in self._loaded_strings:
+            self._loaded_strings.remove(string)
+        self._loaded_strings.insert(0, string)
+        del self._loaded_strings[self.max_entries:]
+        self.store_string(string)
+
+    def store_string(self, string):
+        """Append a command to the file, compacting it when it grows too long."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.__lock:
+            with open(self.path, "a", encoding="utf-8") as history_file:
+                history_file.write(escape(string) + "\n")
+            if self.__lines is None:
+                # the next load counts and compacts the file
+                return
+            self.__lines += 1
+            if self.__lines > self.compact_after * self.max_entries:
+                self.compact()
+
+    def compact(self, newest=None):
+        """Rewrite the file with only the newest occurrence of the newest commands.
+
+        Args:
+            newest (list[str], optional): Commands to keep, most recent first.
+                Read from the file when omitted.
+        """
+        with self.__lock:
+            if newest is None:
+                with open(self.path, encoding="utf-8") as history_file:
+                    commands = [unescape(line.rstrip("\n")) for line in history_file if line.strip()]
+                newest = newest_unique(commands, self.max_entries)
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as history_file:
+                history_file.writelines(escape(command) + "\n" for command in reversed(newest))
+            os.replace(temporary, self.path)
+            self.__lines = len(newest)
+
+
+class CompactThreadedHistory(ThreadedHistory):
+    """ThreadedHistory of a CompactHistory, deduplicated and capped in memory too.
+
+    ThreadedHistory keeps its own list of loaded commands and adds to it
+    without calling the wrapped history's `append_string`, so without this
+    the commands of a session would pile up unbounded.
+    """
+
+    def append_string(self, string):
+        """Add a command to the loaded history, dropping its older occurrence."""
+        with self._lock:
+            if string in self._loaded_strings:
+                self._loaded_strings.remove(string)
+            self._loaded_strings.insert(0, string)
+            del self._loaded_strings[self.history.max_entries:]
+        self.store_string(string)
+
+
+def open_history(path, max_entries=MAX_ENTRIES):
+    """Return a CompactHistory for `path` that loads in a background thread.
+
+    Args:
+        path (str): History file.
+        max_entries (int): Distinct commands kept.
+
+    Returns:
+        CompactThreadedHistory: The wrapped history.
+    """
+    return CompactThreadedHistory(CompactHistory(path, max_entries))
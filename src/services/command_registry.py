@@ -0,0 +1,83 @@
+"""Commands whose handlers are imported and constructed on first use.
+
+The consoles run a command by looking its name up in a dict and calling the
+value. CommandRegistry is a read-only mapping with the same interface, but it
+only stores where each handler lives:
+
+    commands = CommandRegistry()
+    commands.register("get habits", "components.get_habit.view.get_habit_view:GetHabitView", "get_habit")
+    ManageMainLoop().command_loop(commands, switched_to="home")
+
+The module of a handler is imported, and its class instantiated, the first
+time one of its commands runs. Commands naming the same class share one
+instance.
+"""
+
+import importlib
+from collections.abc import Mapping
+
+
+def load_object(path):
+    """Import and return the object named by a "package.module:attribute" path.
+
+    Args:
+        path (str): Module path and attribute name separated by a colon.
+
+    Returns:
+        The attribute.
+
+    Raises:
+        ValueError: If `path` has no colon.
+    """
+    module_name, separator, attribute = path.partition(":")
+    if not separator:
+        raise ValueError(f"expected 'module:attribute', got '{path}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class CommandRegistry(Mapping):
+    """Maps command names to callables that build their handler on first use."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self.__commands = {}
+        self.__instances = {}
+
+    def register(self, name, factory, method):
+        """Add a command.
+
+        Args:
+            name (str): Command typed by the user.
+            factory (str): "package.module:Class" path of the handler class,
+                which must be constructible without arguments.
+            method (str): Handler method run by the command.
+        """
+        self.__commands[name] = (factory, method)
+
+    def instance(self, factory):
+        """Return the handler built from `factory`, constructing it if needed.
+
+        Args:
+            factory (str): "package.module:Class" path of the handler class.
+
+        Returns:
+            The handler instance.
+        """
+        if factory not in self.__instances:
+            self.__instances[factory] = load_object(factory)()
+        return self.__instances[factory]
+
+    def loaded(self):
+        """Return the factory paths whose handler has been constructed."""
+        return list(self.__instances)
+
+    def __getitem__(self, name):
+        """Return a callable running command `name`, building its handler first if needed."""
+        factory, method = self.__commands[name]
+        return lambda: getattr(self.instance(factory), method)()
+
+    def __iter__(self):
+        return iter(self.__commands)
+
+    def __len__(self):
+        return len(self.__commands)
@@ -0,0 +1,49 @@
+"""prompt_toolkit completers backed by a CompletionIndex.
+
+This module imports prompt_toolkit; services.word_prediction only imports
+it when the first prompt session is built.
+"""
+
+from prompt_toolkit.completion import Completer, Completion
+
+
+class IndexCompleter(Completer):
+    """Completes the input from stored values of some kinds.
+
+    The whole line is matched first, since habit names contain spaces. When
+    nothing matches it, the last word is completed instead, for prompts
+    taking several names such as "week1 skip week2".
+
+    Attributes:
+        index (CompletionIndex): Source of the values.
+        kinds (tuple[str]): Kinds of value offered, e.g. ("name",).
+        limit (int): Maximum completions offered per kind.
+    """
+
+    def __init__(self, index, kinds, limit=20):
+        """
+        Args:
+            index (CompletionIndex): Source of the values.
+            kinds (iterable[str]): Kinds of value offered.
+            limit (int): Maximum completions offered per kind.
+        """
+        self.index = index
+        self.kinds = tuple(kinds)
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        """Yield the stored values starting with the line, or else the last word, before the cursor."""
+        line = document.text_before_cursor
+        completions = self.__complete(line)
+        word = document.get_word_before_cursor(WORD=True)
+        if not completions and word and word != line:
+            completions = self.__complete(word)
+        yield from completions
+
+    def __complete(self, text):
+        """Return the completions replacing `text`."""
+        return [
+            Completion(value, start_position=-len(text), display_meta=kind)
+            for kind in self.kinds
+            for value in self.index.complete(kind, text, self.limit)
+        ]
@@ -0,0 +1,228 @@
+"""In-memory completion index of habit names, habit ids and pattern names.
+
+Prompts that ask for a stored value (a habit name to search, the id of the
+habit to update, a saved week or month pattern) complete from a
+CompletionIndex instead of a static list. The index is built once from the
+database and then kept current by listening to HabitFactory and
+PatternRepository writes, so completing never queries the database:
+
+    index = shared_completion_index()
+    index.complete("name", "morn")      # ["Morning run", "morning yoga"]
+
+Each kind of value is held in a PrefixIndex: the case-folded keys are kept
+in one sorted list, so a prefix lookup is a binary search followed by a
+short scan, whatever the number of keys. A dict-of-dicts trie answers the
+same queries but costs hundreds of bytes per character stored, which at
+100k habit names is far more than the names themselves.
+"""
+
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+KINDS = ("name", "id", "week", "month")
+
+# Completions returned when no limit is given.
+DEFAULT_LIMIT = 20
+
+
+class PrefixIndex:
+    """A case-insensitive multiset of strings answering prefix queries.
+
+    The same string may be added several times (many habits share a name);
+    it is offered as long as at least one copy remains. Strings differing
+    only by case are offered once, spelled as the first copy added.
+    """
+
+    __slots__ = ("__keys", "__entries")
+
+    def __init__(self, words=()):
+        """Create an index holding `words`.
+
+        Args:
+            words (iterable[str]): Initial strings.
+        """
+        self.__keys = []
+        # folded key -> [display string, copies]
+        self.__entries = {}
+        for word in words:
+            self.__count(word, 1)
+        self.__keys = sorted(self.__entries)
+
+    def __count(self, word, change):
+        """Adjust the copies of `word`; return True when its key appears or disappears."""
+        key = word.casefold()
+        entry = self.__entries.get(key)
+        if entry is None:
+            if change < 0:
+                return False
+            self.__entries[key] = [word, change]
+            return True
+        entry[1] += change
+        if entry[1] > 0:
+            return False
+        del self.__entries[key]
+        return True
+
+    def add(self, word):
+        """Add one copy of a string."""
+        if self.__count(word, 1):
+            insort(self.__keys, word.casefold())
+
+    def discard(self, word):
+        """Remove one copy of a string, if present."""
+        if self.__count(word, -1):
+            key = word.casefold()
+            del self.__keys[bisect_left(self.__keys, key)]
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Return the strings starting with `prefix`, in case-folded order.
+
+        Args:
+            prefix (str): Typed text; matching ignores case.
+            limit (int): Maximum number of strings returned.
+
+        Returns:
+            list[str]: Matching strings as first added.
+        """
+        prefix = prefix.casefold()
+        matches = []
+        for position in range(bisect_left(self.__keys, prefix), len(self.__keys)):
+            key = self.__keys[position]
+            if not key.startswith(prefix) or len(matches) == limit:
+                break
+            matches.append(self.__entries[key][0])
+        return matches
+
+    def __contains__(self, word):
+        return word.casefold() in self.__entries
+
+    def __len__(self):
+        return len(self.__keys)
+
+
+class CompletionIndex:
+    """Completions for habit names and ids and pattern names.
+
+    Implements the HabitFactory listener methods (`habit_added`,
+    `series_added`, `habit_updated`, `habit_deleted`) and the
+    PatternRepository ones (`pattern_saved`, `pattern_renamed`,
+    `pattern_deleted`). Like other listeners, its callbacks only touch memory.
+    """
+
+    def __init__(self):
+        """Create an empty index; see `load`."""
+        self.__indexes = {kind: PrefixIndex() for kind in KINDS}
+        # habit id -> name, to drop the right name when a habit changes
+        self.__names = {}
+
+    def load(self, habit_factory, pattern_repository=None):
+        """Rebuild the index from the database.
+
+        Args:
+            habit_factory (HabitFactory): Source of the habits, streamed in batches.
+            pattern_repository (PatternRepository, optional): Source of the
+                saved pattern names.
+        """
+        self.__names = {row[0]: row[2] for row in habit_factory.iter_habits()}
+        self.__indexes["name"] = PrefixIndex(self.__names.values())
+        self.__indexes["id"] = PrefixIndex(str(id) for id in self.__names)
+        if pattern_repository is not None:
+            self.__indexes["week"] = PrefixIndex(pattern_repository.week_names())
+            self.__indexes["month"] = PrefixIndex(pattern_repository.month_names())
+
+    def complete(self, kind, prefix, limit=DEFAULT_LIMIT):
+        """Return stored values of one kind starting with `prefix`.
+
+        Args:
+            kind (str): One of KINDS.
+            prefix (str): Typed text; matching ignores case.
+            limit (int): Maximum number of values returned.
+
+        Returns:
+            list[str]: Matching values.
+        """
+        return self.__indexes[kind].complete(prefix, limit)
+
+    def size(self, kind):
+        """Return the number of distinct values of one kind."""
+        return len(self.__indexes[kind])
+
+    def __add(self, id, name):
+        """Index a new habit."""
+        self.__names[id] = name
+        self.__indexes["name"].add(name)
+        self.__indexes["id"].add(str(id))
+
+    # -------------------- HabitFactory listener --------------------
+
+    def habit_added(self, habit):
+        """Index a newly added habit."""
+        self.__add(int(habit.get_id()), habit.get_name())
+
+    def series_added(self, series_id, ids, habit):
+        """Index every occurrence of a newly added series."""
+        for id in ids:
+            self.__add(id, habit.get_name())
+
+    def habit_updated(self, table_name, id, fields):
+        """Follow a renamed habit."""
+        id = int(id)
+        if table_name != "habit" or "name" not in fields or id not in self.__names:
+            return
+        self.__indexes["name"].discard(self.__names[id])
+        self.__names[id] = fields["name"]
+        self.__indexes["name"].add(fields["name"])
+
+    def habit_deleted(self, habit):
+        """Forget a deleted habit."""
+        id = int(habit.get_id())
+        name = self.__names.pop(id, None)
+        if name is not None:
+            self.__indexes["name"].discard(name)
+            self.__indexes["id"].discard(str(id))
+
+    # -------------------- PatternRepository listener --------------------
+
+    def pattern_saved(self, kind, name):
+        """Index a created pattern; replacing an existing one changes nothing."""
+        if name not in self.__indexes[kind]:
+            self.__indexes[kind].add(name)
+
+    def pattern_renamed(self, kind, name, new_name):
+        """Follow a renamed pattern."""
+        self.__indexes[kind].discard(name)
+        self.__indexes[kind].add(new_name)
+
+    def pattern_deleted(self, kind, name):
+        """Forget a deleted pattern."""
+        self.__indexes[kind].discard(name)
+
+
+@lru_cache(maxsize=None)
+def shared_completion_index(db_name=None):
+    """Return the process-wide CompletionIndex, building it on first use.
+
+    The index is loaded from the database once and registered as a
+    HabitFactory and PatternRepository listener.
+
+    Args:
+        db_name (str, optional): SQLite database file. Defaults to the
+            configured path (see data.config).
+
+    Returns:
+        CompletionIndex: The shared index.
+    """
+    from services.habit_factory import HabitFactory
+    from services.pattern_repository import PatternRepository
+
+    index = CompletionIndex()
+    habit_factory = HabitFactory(db_name)
+    pattern_repository = PatternRepository(db_name)
+    try:
+        index.load(habit_factory, pattern_repository)
+    finally:
+        habit_factory.close()
+        pattern_repository.close()
+    HabitFactory.add_listener(index)
+    PatternRepository.add_listener(index)
+    return index
@@ -1,5 +1,6 @@
 from data.database_interface import DatabaseInterface
 from models.habit import Habit
+from services.recurrence import format_datetimes
 
 class HabitFactory:
     """
@@ -9,13 +10,66 @@ class HabitFactory:
         - Add, update, delete, and retrieve Habit objects.
         - Interface with the underlying DatabaseInterface.
         - Provide convenience methods for searching and checking IDs.
+        - Notify registered listeners about successful writes.
+
+    Listeners are shared by every HabitFactory instance. A listener is any
+    object providing `habit_added(habit)`, `series_added(series_id, ids, habit)`,
+    `habit_updated(table_name, id, fields)` and `habit_deleted(habit)`.
     """
 
-    def __init__(self):
+    listeners = []
+    # markers around the matched words of content search snippets
+    HIGHLIGHT_START = DatabaseInterface.HIGHLIGHT_START
+    HIGHLIGHT_END = DatabaseInterface.HIGHLIGHT_END
+
+    def __init__(self, db_name=None):
         """
         Initialize the HabitFactory with a DatabaseInterface instance.
+
+        Args:
+            db_name (str, optional): SQLite database file. Defaults to the
+                configured path (see data.config).
+        """
+        self.db = DatabaseInterface(db_name)
+
+    def close(self):
+        """
+        Release the shared database connection held by this factory.
+        """
+        self.db.close()
+
+    @classmethod
+    def add_listener(cls, listener):
+        """
+        Register a listener notified after every successful add, update or delete.
+
+        Args:
+            listener: Object implementing the listener methods.
+        """
+        if listener not in cls.listeners:
+            cls.listeners.append(listener)
+
+    @classmethod
+    def remove_listener(cls, listener):
         """
-        self.db = DatabaseInterface()
+        Unregister a previously added listener.
+
+        Args:
+            listener: The listener to remove.
+        """
+        if listener in cls.listeners:
+            cls.listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        """
+        Call `event` on every registered listener.
+
+        Args:
+            event (str): Listener method name.
+            *args: Arguments passed to the listener method.
+        """
+        for listener in list(HabitFactory.listeners):
+            getattr(listener, event)(*args)
 
     def add_habit(self, habit: Habit):
         """
@@ -27,8 +81,104 @@ class HabitFactory:
         Returns:
             tuple: Result of the add operation, typically ("success", habit_id) or ("error", exception).
         """
-        return self.db.add_habit(habit)
-    
+        result = self.db.add_habit(habit)
+        if result[0] == "success":
+            self._notify("habit_added", habit)
+        return result
+
+    def add_habits(self, habits):
+        """
+        Add many habits to the database in one transaction.
+
+        Args:
+            habits (iterable[Habit]): Habit objects to be added.
+
+        Returns:
+            tuple: ("success", row_count) or ("error", exception). Nothing is stored on error.
+        """
+        habits = list(habits)
+        result = self.db.add_habits(habits)
+        if result[0] == "success":
+            for habit in habits:
+                self._notify("habit_added", habit)
+        return result
+
+    def add_series(self, habits, pattern=None):
+        """
+        Add the occurrences of a repeating habit as one series, storing the
+        shared name, description, duration and pattern only once.
+
+        Args:
+            habits (iterable[Habit]): The occurrences of the habit.
+            pattern (optional): Repeat pattern the occurrences came from.
+
+        Returns:
+            tuple: ("success", series_id) or ("error", exception). Nothing is stored on error.
+        """
+        habits = list(habits)
+        result = self.db.add_series(habits, pattern)
+        if result[0] == "success":
+            for habit in habits:
+                self._notify("habit_added", habit)
+        return result
+
+    def add_series_rule(self, habit, rule, pattern=None, end=None):
+        """
+        Add a repeating habit as one series, expanding its recurrence rule
+        straight into database rows instead of building a Habit per occurrence.
+
+        The start times come from `rule.occurrence_array`, vectorized when
+        NumPy is installed, and are formatted here for the database.
+
+        Args:
+            habit (Habit): The habit definition shared by the occurrences.
+            rule (RecurrenceRule): When the habit happens.
+            pattern (optional): Repeat pattern the rule was compiled from.
+            end (datetime, optional): End of the expansion; required for a repeating rule.
+
+        Returns:
+            tuple: ("success", (series_id, ids)) or ("error", exception). Nothing is stored on error.
+        """
+        try:
+            start_datetimes = format_datetimes(rule.occurrence_array(end=end))
+        except ValueError as e:
+            return "error", e
+        result = self.db.add_series_occurrences(habit, start_datetimes, pattern)
+        if result[0] == "success":
+            self._notify("series_added", *result[1], habit)
+        return result
+
+    def get_series(self, series_id):
+        """
+        Retrieve a habit series and its occurrences.
+
+        Args:
+            series_id (int): ID of the series.
+
+        Returns:
+            tuple: ("success", (series, occurrences)) or ("error", message).
+        """
+        return self.db.get_series(series_id)
+
+    def delete_series(self, series_id):
+        """
+        Delete a habit series and all of its occurrences.
+
+        Args:
+            series_id (int): ID of the series.
+
+        Returns:
+            tuple: ("success", None) or ("error", exception).
+        """
+        status, series = self.db.get_series(series_id)
+        if status == "error":
+            return status, series
+        result = self.db.delete_series(series_id)
+        if result[0] == "success":
+            for id, _, name, start_datetime, duration, *_ in series[1]:
+                self._notify("habit_deleted", Habit(name, start_datetime, duration, id))
+        return result
+
     def id_exists(self, id):
         """
         Check if a habit with a given ID exists in the database.
@@ -53,7 +203,25 @@ class HabitFactory:
         Returns:
             tuple: Result of the update operation, typically ("success", None) or ("error", exception).
         """
-        return self.db.update_habit(table_name, id, **kwargs)
+        result = self.db.update_habit(table_name, id, **kwargs)
+        if result[0] == "success":
+            self._notify("habit_updated", table_name, id, kwargs)
+        return result
+
+    def transition_status(self, id, status):
+        """
+        Change a habit's status only while it is still open. Used for automatic
+        time-based transitions so that completed habits are never overwritten.
+        Listeners are not notified.
+
+        Args:
+            id (int): ID of the habit.
+            status (str): New status.
+
+        Returns:
+            tuple: ("success", changed) or ("error", exception).
+        """
+        return self.db.transition_status(id, status)
     
     def delete_habit(self, habit: Habit):
         """
@@ -65,8 +233,20 @@ class HabitFactory:
         Returns:
             tuple: Result of the delete operation, typically ("success", None) or ("error", exception).
         """
-        return self.db.delete_habit(habit)
+        result = self.db.delete_habit(habit)
+        if result[0] == "success":
+            self._notify("habit_deleted", habit)
+        return result
     
+    def diagnostics(self):
+        """
+        Report the database path, performance profile, pragma values and schema version.
+
+        Returns:
+            dict: Diagnostic information about the database connection.
+        """
+        return self.db.diagnostics()
+
     def get_habits(self):
         """
         Retrieve all habits from the database.
@@ -75,6 +255,44 @@ class HabitFactory:
             list: List of all habits, each as a tuple of habit fields.
         """
         return self.db.get_all_habits()
+
+    def iter_habits(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits from the database in constant memory.
+
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Returns:
+            generator: Habit tuples, same shape as `get_habits`.
+        """
+        return self.db.iter_all_habits(batch_size, order_by)
+
+    def iter_habit_batches(self, batch_size=500, order_by="id"):
+        """
+        Stream all habits as the batches fetched from the database.
+
+        Output formats render a batch at a time, so a listing passes through
+        without building a list per row.
+
+        Args:
+            batch_size (int): Number of rows fetched per round trip.
+            order_by (str): Either "id" or "start_datetime".
+
+        Returns:
+            generator: Lists of up to `batch_size` habit tuples.
+        """
+        return self.db.iter_habit_batches(batch_size, order_by)
+
+    def count_habits(self):
+        """
+        Count all habits in the database.
+
+        Returns:
+            int: Number of habits.
+        """
+        return self.db.count_habits()
     
     def get_habit(self, id):
         """
@@ -100,6 +318,22 @@ class HabitFactory:
         """
         return self.db.get_habits_by_status(status)
     
+    def update_statuses(self, now=None, full=False):
+        """
+        Move open habits (UPCOMING, TO_BE_CONFIRMED, ONGOING) to the status
+        matching their schedule.
+
+        Args:
+            now (datetime, optional): Reference time. Defaults to the current time.
+            full (bool): Re-examine every open habit instead of only those that
+                can have changed since the last sweep.
+
+        Returns:
+            tuple: ("success", transitions) mapping (old_status, new_status)
+                to counts, or ("error", exception).
+        """
+        return self.db.update_statuses(now, full)
+
     def get_name_with_text(self, name):
         """
         Retrieve all habits whose names contain the given text.
@@ -111,3 +345,15 @@ class HabitFactory:
             list: List of habit tuples that match the search.
         """
         return self.db.get_name_with_text(name)
+
+    def get_by_name(self, name):
+        """
+        Retrieve all habits whose name is exactly the given name.
+
+        Args:
+            name (str): Full habit name.
+
+        Returns:
+            list: List of habit tuples with that name.
+        """
+        return self.db.get_by_name(name)
@@ -17,6 +17,8 @@ class DateTimeHandler:
         - Provide utility functions for weekdays and random time generation.
     """
 
+    __slots__ = ("__createdOn", "__duration", "__start_datetime")
+
     def __init__(self):
         """
         Initialize a DateTimeHandler object.
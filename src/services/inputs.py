@@ -1,6 +1,7 @@
 import time
 from services.colors import Colors
 from services.word_prediction import AutoCompleter
+from services.completion_index import shared_completion_index
 import functools
 import os
 
@@ -25,7 +26,7 @@ def prompt_input(message, commands=None):
         str: User input
     """
     commands = list(commands) if commands else []
-    autocompleter = AutoCompleter([*commands, "clear_screen"])
+    autocompleter = AutoCompleter.pooled([*commands, "clear_screen"])
     print(message)
     return autocompleter.get_session().prompt().strip()
 
@@ -43,19 +44,22 @@ def colored_input(message, color_name="INPUT"):
     colored_message = color.color_inputs(message)
     return input(colored_message).strip()   
 
-def prompt_input_for_commands(message, commands=None):
+def prompt_input_for_commands(message, commands=None, completion_kinds=()):
     """
     Displays a prompt with optional autocomplete commands.
 
     Parameters:
         message (str): Prompt message
         commands (iterable): Available commands for autocomplete
+        completion_kinds (iterable): Kinds of stored value also offered
+            ("name", "id", "week", "month"), see services.completion_index
 
     Returns:
         str: User input
     """
     commands = list(commands) if commands else []
-    autocompleter = AutoCompleter([*commands, "clear_screen","esc"])
+    index = shared_completion_index() if completion_kinds else None
+    autocompleter = AutoCompleter.pooled([*commands, "clear_screen","esc"], index=index, kinds=completion_kinds)
     print(color.color_inputs(message))
     return autocompleter.get_session().prompt().lower().strip()
 
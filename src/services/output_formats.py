@@ -0,0 +1,351 @@
+"""Output formats for habit result rows.
+
+Views and the batch CLI give their result rows to an OutputFormat rather
+than printing each field themselves:
+
+    pretty  the colorized blocks of the interactive consoles
+    table   plain aligned columns under a header line
+    tsv     every field separated by tabs, one row per line
+    json    a single JSON array of objects
+    ndjson  one JSON object per line
+
+Rows arrive in batches, which are lists of tuples. Each format renders a
+whole batch into one string and emits it with a single print. The cost per
+row is then the string building, not one print per field.
+
+HabitFactory.iter_habit_batches hands over the fetchmany batches of a
+database cursor directly. A listing of any size therefore streams in
+constant memory:
+
+    output = get_format("ndjson", sys.stdout)
+    output.write_batches(habit_factory.iter_habit_batches(), HABIT)
+
+A RowShape names the positions of one kind of result row. Those names are
+the keys of the JSON objects and the columns of tsv. The shape also lists
+which fields pretty and table show, and in what order.
+"""
+
+import json
+import os
+import sys
+from json.encoder import encode_basestring
+
+from data.queries import HIGHLIGHT_END, HIGHLIGHT_START
+
+OUTPUT_FORMAT_ENV = "HABIT_TRACKER_OUTPUT"
+DEFAULT_FORMAT = "pretty"
+
+# Widest column of the table format; longer values overflow their column.
+MAX_COLUMN_WIDTH = 40
+RULE = "-" * 107
+
+
+class RowShape:
+    """Field names of one kind of result row.
+
+    Attributes:
+        fields (tuple[str]): Name of each row position. Rows may be shorter,
+            e.g. searches return habits without their content.
+        shown (tuple[str]): Fields displayed by pretty and table, in order.
+    """
+
+    __slots__ = ("fields", "shown", "positions")
+
+    def __init__(self, fields, shown):
+        """Create a shape.
+
+        Args:
+            fields (tuple[str]): Name of each row position.
+            shown (tuple[str]): Fields displayed by pretty and table.
+        """
+        self.fields = fields
+        self.shown = shown
+        # (field, row position) of the shown fields
+        self.positions = tuple((field, fields.index(field)) for field in shown)
+
+
+HABIT_FIELDS = ("id", "content_id", "name", "start_datetime", "duration", "status", "description", "reflection")
+
+# Habit rows of listings and searches.
+HABIT = RowShape(HABIT_FIELDS, ("id", "name", "start_datetime", "duration", "status"))
+# One habit with its content.
+HABIT_DETAILS = RowShape(
+    HABIT_FIELDS, ("id", "name", "start_datetime", "duration", "description", "reflection", "status")
+)
+# Content search rows, see Database.search_by_content.
+CONTENT = RowShape(
+    ("content_id", "description", "reflection", "name", "start_datetime", "status", "match"),
+    ("content_id", "description", "reflection", "name", "match"),
+)
+
+
+def field_value(row, position):
+    """Return the value at `position`, or None when the row is shorter."""
+    return row[position] if position < len(row) else None
+
+
+def strip_highlight(text):
+    """Remove the highlight markers of a content search snippet."""
+    return text.replace(HIGHLIGHT_START, "").replace(HIGHLIGHT_END, "")
+
+
+def plain_text(value):
+    """Return a value as one line of text without highlight markers."""
+    if value is None:
+        return ""
+    return strip_highlight(str(value)).replace("\t", " ").replace("\n", " ")
+
+
+class OutputFormat:
+    """Writes result rows to a text stream; subclasses define the layout.
+
+    A listing is written as `begin`, then `render` for each batch, then
+    `end`. Each step returns the text to emit.
+    """
+
+    name = None
+
+    def __init__(self, out=None):
+        """Create a format.
+
+        Args:
+            out (file, optional): Stream written to. Defaults to whatever
+                sys.stdout is at the time of writing.
+        """
+        self.out = out
+
+    def write(self, rows, shape):
+        """Write an in-memory result.
+
+        Args:
+            rows (list[tuple]): Result rows.
+            shape (RowShape): Fields of the rows.
+        """
+        rows = list(rows)
+        self.write_batches([rows] if rows else [], shape, count=len(rows))
+
+    def write_batches(self, batches, shape, count=None):
+        """Write a streamed result, one print per batch.
+
+        Args:
+            batches (iterable[list[tuple]]): Result rows, batch by batch.
+            shape (RowShape): Fields of the rows.
+            count (int, optional): Number of rows, for formats showing it.
+        """
+        self._emit(self.begin(shape, count))
+        for rows in batches:
+            self._emit(self.render(rows, shape))
+        self._emit(self.end(shape, count))
+
+    def _emit(self, text):
+        if text:
+            print(text, end="", file=self.out if self.out is not None else sys.stdout)
+
+    def begin(self, shape, count):
+        """Return the text written before the rows."""
+        return ""
+
+    def render(self, rows, shape):
+        """Return the text of one batch of rows."""
+        raise NotImplementedError
+
+    def end(self, shape, count):
+        """Return the text written after the rows."""
+        return ""
+
+
+class PrettyFormat(OutputFormat):
+    """The colorized result blocks of the interactive consoles."""
+
+    name = "pretty"
+
+    def __init__(self, out=None):
+        super().__init__(out)
+        from services.colors import Colors
+
+        color = Colors()
+        bright = color.choose_brightness("BRIGHTEN")
+        self.__reset = color.STYLE.RESET_ALL
+        self.__white = bright + color.choose_color("WHITE")
+        self.__help = bright + color.choose_color("HELP")
+        self.__successful = bright + color.choose_color("SUCCESSFUL")
+        self.__unsuccessful = bright + color.choose_color("UNSUCCESSFUL")
+        self.__bar = color.BACK.CYAN + " " * 107 + self.__reset
+        self.__styles = {"start_datetime": self.__help, "duration": self.__successful}
+
+    def begin(self, shape, count):
+        if count is None:
+            return ""
+        header = f"{RULE}\n{self.__help}RESULTS {self.__white}: {self.__successful}{count}{self.__reset}\n{RULE}\n"
+        if not count:
+            header += f"{self.__unsuccessful}No results found!{self.__reset}\n{RULE}\n"
+        return header
+
+    def render(self, rows, shape):
+        lines = []
+        for row in rows:
+            lines.append(self.__bar + self.__white)
+            for field, position in shape.positions:
+                value = field_value(row, position)
+                if value is None or (field == "match" and not value):
+                    continue
+                lines.append(f"    {field.replace('_', ' '):<15}: {self.__style(field, value)}")
+            lines.append(self.__reset)
+        lines.append("")
+        return "\n".join(lines)
+
+    def end(self, shape, count):
+        return f"{RULE}\n" if count != 0 else ""
+
+    def __style(self, field, value):
+        """Color one value; matched words of a snippet are highlighted."""
+        if field == "match":
+            return (
+                str(value)
+                .replace(HIGHLIGHT_START, self.__successful)
+                .replace(HIGHLIGHT_END, self.__white)
+            )
+        style = self.__styles.get(field)
+        return f"{style}{value}{self.__white}" if style else str(value)
+
+
+class TableFormat(OutputFormat):
+    """Plain columns under a header line.
+
+    Column widths are taken from the first batch, so the table can be
+    streamed; later values longer than their column push the row along.
+    """
+
+    name = "table"
+
+    def __init__(self, out=None):
+        super().__init__(out)
+        self.__widths = None
+
+    def begin(self, shape, count):
+        self.__widths = None
+        return ""
+
+    def render(self, rows, shape):
+        cells = [[plain_text(field_value(row, position)) for _, position in shape.positions] for row in rows]
+        lines = []
+        if self.__widths is None:
+            self.__widths = [
+                min(max([len(field)] + [len(row[column]) for row in cells]), MAX_COLUMN_WIDTH)
+                for column, field in enumerate(shape.shown)
+            ]
+            lines.append(self.__line(shape.shown))
+        lines.extend(self.__line(row) for row in cells)
+        lines.append("")
+        return "\n".join(lines)
+
+    def end(self, shape, count):
+        if self.__widths is None:
+            # no rows: the header alone
+            return " ".join(shape.shown) + "\n"
+        return ""
+
+    def __line(self, cells):
+        return "  ".join(cell.ljust(width) for cell, width in zip(cells, self.__widths)).rstrip()
+
+
+class TsvFormat(OutputFormat):
+    """Every field of a row separated by tabs, for shell pipelines."""
+
+    name = "tsv"
+
+    def render(self, rows, shape):
+        return "".join("\t".join(plain_text(value) for value in row) + "\n" for row in rows)
+
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def json_objects(rows, shape):
+    """Return the rows as JSON object texts, keyed by field name.
+
+    Objects are assembled from pre-encoded keys, and the str, int and None
+    values of database rows are encoded inline. This is about twice as fast
+    as encoding a dict per row, which matters when a listing runs to
+    millions of rows.
+    """
+    keys = [encode_basestring(field) + ":" for field in shape.fields]
+    match = shape.fields.index("match") if "match" in shape.fields else -1
+    objects = []
+    for row in rows:
+        members = []
+        for position, (key, value) in enumerate(zip(keys, row)):
+            kind = type(value)
+            if kind is str:
+                if position == match:
+                    value = strip_highlight(value)
+                members.append(key + encode_basestring(value))
+            elif kind is int:
+                members.append(key + str(value))
+            elif value is None:
+                members.append(key + "null")
+            else:
+                members.append(key + _ENCODER.encode(value))
+        objects.append("{" + ",".join(members) + "}")
+    return objects
+
+
+class JsonFormat(OutputFormat):
+    """One JSON array holding an object per row."""
+
+    name = "json"
+
+    def __init__(self, out=None):
+        super().__init__(out)
+        self.__empty = True
+
+    def begin(self, shape, count):
+        self.__empty = True
+        return "["
+
+    def render(self, rows, shape):
+        if not rows:
+            return ""
+        separator = "\n" if self.__empty else ",\n"
+        self.__empty = False
+        return separator + ",\n".join(json_objects(rows, shape))
+
+    def end(self, shape, count):
+        return "]\n" if self.__empty else "\n]\n"
+
+
+class NdjsonFormat(OutputFormat):
+    """One JSON object per line, streamable into line-oriented tools."""
+
+    name = "ndjson"
+
+    def render(self, rows, shape):
+        objects = json_objects(rows, shape)
+        return "\n".join(objects) + "\n" if objects else ""
+
+
+FORMATS = {
+    output_format.name: output_format
+    for output_format in (PrettyFormat, TableFormat, TsvFormat, JsonFormat, NdjsonFormat)
+}
+
+
+def get_format(name=None, out=None):
+    """Return an output format by name.
+
+    Args:
+        name (str, optional): One of FORMATS. Defaults to the
+            HABIT_TRACKER_OUTPUT environment variable, then "pretty".
+        out (file, optional): Stream written to; defaults to sys.stdout.
+
+    Returns:
+        OutputFormat: A new format instance.
+
+    Raises:
+        ValueError: If the name is not a known format.
+    """
+    name = name or os.environ.get(OUTPUT_FORMAT_ENV) or DEFAULT_FORMAT
+    try:
+        return FORMATS[name.lower()](out)
+    except KeyError:
+        raise ValueError(f"unknown output format '{name}', expected one of {', '.join(FORMATS)}")
@@ -0,0 +1,265 @@
+"""Persistent library of named week and month repeat patterns.
+
+A week pattern is a set of weekdays, stored as a 7-bit mask (see
+services.recurrence). A month pattern is an ordered list of four week
+slots, stored as the ids of the week patterns it uses, None meaning a
+skipped week. Because month patterns refer to week patterns by id, renaming
+or editing a week pattern is picked up by every month pattern using it.
+
+PatternRepository reads the whole `pattern` table once and serves later
+lookups from memory; its own writes keep that cache current. Like
+HabitFactory, it notifies registered listeners after every successful write.
+
+Typical usage:
+    patterns = PatternRepository()
+    patterns.save_week_pattern("gym", ["mon", "wed", "fri"])
+    patterns.save_month_pattern("busy month", ["gym", "skip", "gym", "gym"])
+    patterns.week_patterns()    # {"gym": ["mon", "wed", "fri"]}
+"""
+
+from data.database_interface import DatabaseInterface
+from services.recurrence import weekday_mask, mask_weekdays, WEEKDAYS
+
+SKIP = "skip"
+
+
+class PatternRepository:
+    """Named week and month repeat patterns backed by the `pattern` table.
+
+    Listeners are shared by every PatternRepository instance. A listener is
+    any object providing `pattern_saved(kind, name)`,
+    `pattern_renamed(kind, name, new_name)` and `pattern_deleted(kind, name)`,
+    `kind` being "week" or "month".
+
+    Attributes:
+        db (DatabaseInterface): Database access.
+    """
+
+    listeners = []
+
+    def __init__(self, db_name=None):
+        """
+        Args:
+            db_name (str, optional): SQLite database file. Defaults to the
+                configured path (see data.config).
+        """
+        self.db = DatabaseInterface(db_name)
+        self.__weeks = None
+        self.__months = None
+
+    def close(self):
+        """Release the shared database connection."""
+        self.db.close()
+
+    @classmethod
+    def add_listener(cls, listener):
+        """Register a listener notified after every successful write.
+
+        Args:
+            listener: Object implementing the listener methods.
+        """
+        if listener not in cls.listeners:
+            cls.listeners.append(listener)
+
+    @classmethod
+    def remove_listener(cls, listener):
+        """Unregister a previously added listener.
+
+        Args:
+            listener: The listener to remove.
+        """
+        if listener in cls.listeners:
+            cls.listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        """Call `event` on every registered listener.
+
+        Args:
+            event (str): Listener method name.
+            *args: Arguments passed to the listener method.
+        """
+        for listener in list(PatternRepository.listeners):
+            getattr(listener, event)(*args)
+
+    def __load(self):
+        """Read every pattern into the cache, once."""
+        if self.__weeks is not None:
+            return
+        self.__weeks, self.__months = {}, {}
+        for id, kind, name, mask, weeks in self.db.get_patterns():
+            if kind == "week":
+                self.__weeks[name] = (id, mask)
+            else:
+                self.__months[name] = (id, weeks)
+
+    def refresh(self):
+        """Drop the cache so the next read sees writes made elsewhere."""
+        self.__weeks = self.__months = None
+
+    # -------------------- Reading --------------------
+
+    def week_names(self):
+        """Return the names of all week patterns, oldest first."""
+        self.__load()
+        return list(self.__weeks)
+
+    def month_names(self):
+        """Return the names of all month patterns, oldest first."""
+        self.__load()
+        return list(self.__months)
+
+    def week_mask(self, name):
+        """Return the weekday mask of a week pattern, or None if unknown."""
+        self.__load()
+        entry = self.__weeks.get(name)
+        return None if entry is None else entry[1]
+
+    def has_weekday(self, name, weekday):
+        """Tell whether a week pattern includes a weekday.
+
+        Args:
+            name (str): Week pattern name.
+            weekday (str|int): Weekday name from WEEKDAYS or its index, Monday = 0.
+
+        Returns:
+            bool: True if the weekday is part of the pattern.
+        """
+        index = WEEKDAYS.index(weekday) if isinstance(weekday, str) else weekday
+        return bool((self.week_mask(name) or 0) & (1 << index))
+
+    def week_patterns(self):
+        """Return every week pattern in HabitTimeRepeatsView's format.
+
+        Returns:
+            dict: Name -> list of weekday names, Monday first.
+        """
+        self.__load()
+        return {name: mask_weekdays(mask) for name, (_, mask) in self.__weeks.items()}
+
+    def month_patterns(self):
+        """Return every month pattern in HabitTimeRepeatsView's format.
+
+        Returns:
+            dict: Name -> list of single-entry dicts mapping a week pattern
+                name to its weekdays, {"skip": None} for a skipped week.
+        """
+        self.__load()
+        names = {id: (name, mask) for name, (id, mask) in self.__weeks.items()}
+        months = {}
+        for month_name, (_, week_ids) in self.__months.items():
+            weeks = []
+            for week_id in week_ids:
+                if week_id in names:
+                    name, mask = names[week_id]
+                    weeks.append({name: mask_weekdays(mask)})
+                else:
+                    weeks.append({SKIP: None})
+            months[month_name] = weeks
+        return months
+
+    # -------------------- Writing --------------------
+
+    def save_week_pattern(self, name, days):
+        """Create a week pattern or replace the days of an existing one.
+
+        Args:
+            name (str): Pattern name.
+            days (iterable[str]): Weekday names from WEEKDAYS.
+
+        Returns:
+            tuple: ("success", id) or ("error", exception).
+        """
+        try:
+            mask = weekday_mask(days)
+        except ValueError as e:
+            return "error", e
+        self.__load()
+        status, result = self.db.save_pattern("week", name, mask=mask)
+        if status == "success":
+            self.__weeks[name] = (result, mask)
+            self._notify("pattern_saved", "week", name)
+        return status, result
+
+    def save_month_pattern(self, name, week_names):
+        """Create a month pattern or replace the weeks of an existing one.
+
+        Args:
+            name (str): Pattern name.
+            week_names (iterable[str]): Saved week pattern names, or "skip".
+
+        Returns:
+            tuple: ("success", id) or ("error", message).
+        """
+        self.__load()
+        week_ids = []
+        for week_name in week_names:
+            if week_name == SKIP:
+                week_ids.append(None)
+            elif week_name in self.__weeks:
+                week_ids.append(self.__weeks[week_name][0])
+            else:
+                return "error", f"week pattern '{week_name}' does not exist"
+        status, result = self.db.save_pattern("month", name, weeks=week_ids)
+        if status == "success":
+            self.__months[name] = (result, week_ids)
+            self._notify("pattern_saved", "month", name)
+        return status, result
+
+    def rename_week_pattern(self, name, new_name):
+        """Rename a week pattern; month patterns using it follow the new name.
+
+        Args:
+            name (str): Current name.
+            new_name (str): New name.
+
+        Returns:
+            tuple: ("success", None) or ("error", message).
+        """
+        self.__load()
+        if name not in self.__weeks:
+            return "error", f"week pattern '{name}' does not exist"
+        status, result = self.db.rename_pattern("week", name, new_name)
+        if status == "success":
+            self.__weeks[new_name] = self.__weeks.pop(name)
+            self._notify("pattern_renamed", "week", name, new_name)
+        return status, result
+
+    def delete_week_pattern(self, name):
+        """Delete a week pattern that no month pattern uses.
+
+        Args:
+            name (str): Pattern name.
+
+        Returns:
+            tuple: ("success", None) or ("error", message).
+        """
+        self.__load()
+        entry = self.__weeks.get(name)
+        if entry is None:
+            return "error", f"week pattern '{name}' does not exist"
+        users = [month for month, (_, week_ids) in self.__months.items() if entry[0] in week_ids]
+        if users:
+            return "error", f"week pattern '{name}' is used by month pattern(s) {', '.join(users)}"
+        status, result = self.db.delete_pattern("week", name)
+        if status == "success":
+            del self.__weeks[name]
+            self._notify("pattern_deleted", "week", name)
+        return status, result
+
+    def delete_month_pattern(self, name):
+        """Delete a month pattern.
+
+        Args:
+            name (str): Pattern name.
+
+        Returns:
+            tuple: ("success", None) or ("error", message).
+        """
+        self.__load()
+        if name not in self.__months:
+            return "error", f"month pattern '{name}' does not exist"
+        status, result = self.db.delete_pattern("month", name)
+        if status == "success":
+            del self.__months[name]
+            self._notify("pattern_deleted", "month", name)
+        return status, result
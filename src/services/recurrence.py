@@ -0,0 +1,308 @@
+"""Compiled recurrence rules for repeating habits.
+
+HabitTimeRepeatsView collects a repeat pattern as nested structures: ordered
+month patterns, each made of four week slots, each slot naming the weekdays
+on which the habit happens (or None for a skipped week). RecurrenceRule
+compiles those into one 7-bit weekday mask per week slot and answers
+questions about the occurrences without materializing them:
+
+    rule = RecurrenceRule.from_patterns(start, ordered_monthly_patterns)
+    rule.count(start, end)          # O(1)
+    rule.next_after(moment)         # O(1)
+    for moment in rule.occurrences(start, end):
+        ...
+
+Week slots are consecutive 7-day windows starting on the anchor's day, the
+same windows AddHabitController always walked; every occurrence has the time
+of day of the anchor. A rule either runs through its slots once (the
+behaviour of the original pattern expansion) or, with `repeat=True`, cycles
+through them forever.
+
+For bulk work, `occurrence_array` and `expand_rules` build all occurrence
+times as one NumPy `datetime64[s]` array, and `format_datetimes` turns such
+an array into the text column the database stores. NumPy is optional: when
+it is not installed the same functions return plain lists built from
+`occurrences`.
+"""
+
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+WEEKDAYS = ["mon", "tue", "wed", "thurs", "fri", "sat", "sun"]
+WEEKS_PER_MONTH = 4
+DAYS_PER_WEEK = 7
+
+_ONE_DAY = timedelta(days=1)
+
+
+def weekday_mask(days):
+    """Compile weekday names into a 7-bit mask, Monday being bit 0.
+
+    Args:
+        days (iterable[str]|None): Names from WEEKDAYS; None for an empty week.
+
+    Returns:
+        int: The weekday mask.
+
+    Raises:
+        ValueError: If a name is not in WEEKDAYS.
+    """
+    mask = 0
+    for day in days or ():
+        if day not in WEEKDAYS:
+            raise ValueError(f"unknown weekday '{day}'")
+        mask |= 1 << WEEKDAYS.index(day)
+    return mask
+
+
+def mask_weekdays(mask):
+    """Return the weekday names set in a 7-bit mask, Monday first."""
+    return [day for bit, day in enumerate(WEEKDAYS) if mask & (1 << bit)]
+
+
+class RecurrenceRule:
+    """A repeating schedule of one or more week slots.
+
+    Attributes:
+        anchor (datetime): Start of the first week slot and time of day of
+            every occurrence.
+        week_masks (tuple[int]): Weekday mask of each 7-day slot, in order.
+        repeat (bool): Cycle through the slots forever instead of once.
+    """
+
+    def __init__(self, anchor, week_masks, repeat=False):
+        """Compile a rule and precompute its lookup tables.
+
+        Args:
+            anchor (datetime): Start of the first slot.
+            week_masks (iterable[int]): One 7-bit weekday mask per slot.
+            repeat (bool): Cycle through the slots forever.
+
+        Raises:
+            ValueError: If there are no slots or a mask is out of range.
+        """
+        self.anchor = anchor
+        self.week_masks = tuple(week_masks)
+        self.repeat = repeat
+        if not self.week_masks:
+            raise ValueError("a recurrence rule needs at least one week slot")
+        if any(not 0 <= mask < 1 << DAYS_PER_WEEK for mask in self.week_masks):
+            raise ValueError("week masks must be 7-bit integers")
+
+        self.__period = DAYS_PER_WEEK * len(self.week_masks)
+        first_weekday = anchor.weekday()
+        self.__days = [
+            bool(self.week_masks[day // DAYS_PER_WEEK] & (1 << (first_weekday + day) % DAYS_PER_WEEK))
+            for day in range(self.__period)
+        ]
+        # __prefix[d]: occurrences among the first d days of a cycle
+        self.__prefix = [0]
+        for happens in self.__days:
+            self.__prefix.append(self.__prefix[-1] + happens)
+        # __next[d]: first day >= d of the cycle with an occurrence, or None
+        self.__next = [None] * (self.__period + 1)
+        for day in range(self.__period - 1, -1, -1):
+            self.__next[day] = day if self.__days[day] else self.__next[day + 1]
+
+    @classmethod
+    def from_patterns(cls, anchor, ordered_monthly_patterns, repeat=False):
+        """Compile the patterns built by HabitTimeRepeatsView.
+
+        Args:
+            anchor (datetime): Start of the first week slot.
+            ordered_monthly_patterns (list): Month patterns in order. Each is
+                a list of single-entry dicts mapping a week pattern name to a
+                list of weekday names (None for a skipped week). A month that
+                is None counts as four skipped weeks.
+            repeat (bool): Cycle through the months forever.
+
+        Returns:
+            RecurrenceRule: The compiled rule.
+        """
+        week_masks = []
+        for monthly_pattern in ordered_monthly_patterns:
+            if monthly_pattern is None:
+                week_masks.extend([0] * WEEKS_PER_MONTH)
+                continue
+            for week_entry in monthly_pattern:
+                week_masks.append(weekday_mask(list(week_entry.values())[0]))
+        return cls(anchor, week_masks, repeat)
+
+    def per_cycle(self):
+        """Return the number of occurrences in one pass through the slots."""
+        return self.__prefix[-1]
+
+    def end(self):
+        """Return the end of the last slot, or None for a repeating rule."""
+        if self.repeat:
+            return None
+        return self.anchor + self.__period * _ONE_DAY
+
+    def __day(self, day):
+        """Return the occurrence datetime of a day offset from the anchor."""
+        return self.anchor + day * _ONE_DAY
+
+    def __days_before(self, moment):
+        """Return how many day offsets d have anchor + d days before `moment`."""
+        delta = moment - self.anchor
+        return delta.days + (1 if delta - timedelta(days=delta.days) else 0)
+
+    def __before(self, moment):
+        """Count the occurrences strictly before `moment`."""
+        days = self.__days_before(moment)
+        if days <= 0:
+            return 0
+        cycles, rest = divmod(days, self.__period)
+        if not self.repeat and cycles:
+            return self.per_cycle()
+        return cycles * self.per_cycle() + self.__prefix[rest]
+
+    def __first_day_from(self, day):
+        """Return the first day offset >= `day` with an occurrence, or None."""
+        day = max(day, 0)
+        cycles, rest = divmod(day, self.__period)
+        if cycles and not self.repeat:
+            return None
+        found = self.__next[rest]
+        if found is not None:
+            return cycles * self.__period + found
+        if not self.repeat or self.__next[0] is None:
+            return None
+        return (cycles + 1) * self.__period + self.__next[0]
+
+    def count(self, start=None, end=None):
+        """Count the occurrences in [start, end) in constant time.
+
+        Args:
+            start (datetime, optional): Defaults to the anchor.
+            end (datetime, optional): Defaults to the end of the rule.
+
+        Returns:
+            int: Number of occurrences.
+
+        Raises:
+            ValueError: If `end` is omitted for a repeating rule.
+        """
+        start = start or self.anchor
+        end = end or self.end()
+        if end is None:
+            raise ValueError("a repeating rule has no end, pass one")
+        return max(0, self.__before(end) - self.__before(start))
+
+    def next_after(self, moment):
+        """Return the first occurrence strictly after `moment`, or None.
+
+        Args:
+            moment (datetime): Reference time.
+
+        Returns:
+            datetime|None: The next occurrence.
+        """
+        delta = moment - self.anchor
+        day = self.__first_day_from(delta.days + 1)
+        return None if day is None else self.__day(day)
+
+    def occurrences(self, start=None, end=None):
+        """Yield the occurrences in [start, end), in order, one at a time.
+
+        Args:
+            start (datetime, optional): Defaults to the anchor.
+            end (datetime, optional): Defaults to the end of the rule; a
+                repeating rule without an end yields forever.
+
+        Yields:
+            datetime: Occurrence start times.
+        """
+        start = start or self.anchor
+        end = end or self.end()
+        day = self.__first_day_from(self.__days_before(start))
+        while day is not None:
+            moment = self.__day(day)
+            if end is not None and moment >= end:
+                return
+            yield moment
+            day = self.__first_day_from(day + 1)
+
+    def occurrence_array(self, start=None, end=None):
+        """Return every occurrence in [start, end) at once.
+
+        With NumPy the occurrence days of one cycle are tiled over all the
+        cycles in range and added to the anchor in a single vector operation.
+
+        Args:
+            start (datetime, optional): Defaults to the anchor.
+            end (datetime, optional): Defaults to the end of the rule.
+
+        Returns:
+            numpy.ndarray|list: `datetime64[s]` array, or a list of datetimes
+                when NumPy is not installed.
+
+        Raises:
+            ValueError: If `end` is omitted for a repeating rule.
+        """
+        start = start or self.anchor
+        end = end or self.end()
+        if end is None:
+            raise ValueError("a repeating rule has no end, pass one")
+        if not HAS_NUMPY:
+            return list(self.occurrences(start, end))
+
+        first = max(self.__days_before(start), 0)
+        stop = self.__days_before(end)
+        if not self.repeat:
+            stop = min(stop, self.__period)
+        cycle_days = np.flatnonzero(self.__days)
+        if stop <= first or not len(cycle_days):
+            return np.array([], dtype="datetime64[s]")
+        cycles = np.arange(first // self.__period, (stop - 1) // self.__period + 1, dtype=np.int64)
+        days = (cycles[:, None] * self.__period + cycle_days[None, :]).ravel()
+        days = days[(days >= first) & (days < stop)]
+        return np.datetime64(self.anchor.replace(microsecond=0), "s") + days * np.timedelta64(1, "D")
+
+    def __repr__(self) -> str:
+        """Return a compact developer-facing representation of the rule."""
+        weeks = " ".join(",".join(mask_weekdays(mask)) or "-" for mask in self.week_masks)
+        return f"RecurrenceRule({self.anchor}, [{weeks}], repeat={self.repeat})"
+
+
+def expand_rules(rules, start=None, end=None):
+    """Expand many rules over one date range into flat columns.
+
+    Args:
+        rules (list[RecurrenceRule]): Rules to expand.
+        start (datetime, optional): Start of the range; each rule's anchor by default.
+        end (datetime, optional): End of the range; each rule's end by default.
+
+    Returns:
+        tuple: (rule_index, start_times), parallel columns with one entry per
+            occurrence: the position of its rule in `rules` and its start time.
+            NumPy arrays when NumPy is installed, lists otherwise.
+    """
+    arrays = [rule.occurrence_array(start, end) for rule in rules]
+    if not HAS_NUMPY:
+        rule_index = [index for index, array in enumerate(arrays) for _ in array]
+        return rule_index, [moment for array in arrays for moment in array]
+    if not arrays:
+        return np.array([], dtype=np.int64), np.array([], dtype="datetime64[s]")
+    counts = np.fromiter((len(array) for array in arrays), dtype=np.int64, count=len(arrays))
+    return np.repeat(np.arange(len(arrays)), counts), np.concatenate(arrays)
+
+
+def format_datetimes(start_times):
+    """Format occurrence start times the way habit.start_datetime stores them.
+
+    Args:
+        start_times: A `datetime64` array or an iterable of datetimes.
+
+    Returns:
+        list[str]: "YYYY-MM-DD HH:MM:SS" strings.
+    """
+    if HAS_NUMPY and isinstance(start_times, np.ndarray):
+        return np.char.replace(np.datetime_as_string(start_times, unit="s"), "T", " ").tolist()
+    return [moment.strftime("%Y-%m-%d %H:%M:%S") for moment in start_times]
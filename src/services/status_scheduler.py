@@ -0,0 +1,287 @@
+"""Background scheduler that applies habit status transitions when they fall due.
+
+A habit only changes status at three moments: its start (UPCOMING -> ONGOING),
+its end (ONGOING -> TO_BE_CONFIRMED) and one day after its end
+(TO_BE_CONFIRMED -> MISSED). These follow the rules of
+DateTimeHandler.map_time_to_status. Instead of rescanning the habit table,
+StatusScheduler keeps a min-heap holding the next transition time of every
+open habit and sleeps until the earliest one is due.
+
+The heap is loaded from the database once, when the scheduler starts, and is
+then kept up to date from HabitFactory add/update/delete notifications.
+
+Typical usage:
+    scheduler = StatusScheduler()
+    scheduler.start()
+    ...
+    scheduler.stop()
+"""
+
+import heapq
+import threading
+from datetime import datetime, timedelta
+
+from services.habit_factory import HabitFactory
+
+OPEN_STATUSES = ("UPCOMING", "ONGOING", "TO_BE_CONFIRMED")
+
+
+def parse_schedule(start_datetime, duration):
+    """Convert stored start datetime and duration values into datetimes.
+
+    Args:
+        start_datetime: A datetime or a string in "YYYY-MM-DD HH:MM:SS" format.
+        duration (str): Duration in "HH:MM:SS" format.
+
+    Returns:
+        tuple: (start, end) datetimes, or None if the values cannot be parsed.
+    """
+    try:
+        if not isinstance(start_datetime, datetime):
+            start_datetime = datetime.strptime(str(start_datetime), "%Y-%m-%d %H:%M:%S")
+        hours, minutes, seconds = map(int, str(duration).split(":"))
+        return start_datetime, start_datetime + timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    except Exception:
+        return None
+
+
+def status_at(start, end, now):
+    """Return the status a habit should have at `now`.
+
+    Same rules as DateTimeHandler.map_time_to_status, for parsed datetimes.
+
+    Args:
+        start (datetime): Start of the habit session.
+        end (datetime): End of the habit session.
+        now (datetime): Reference time.
+
+    Returns:
+        str: One of "ONGOING", "UPCOMING", "MISSED", "TO_BE_CONFIRMED".
+    """
+    if start <= now < end:
+        return "ONGOING"
+    if start > now:
+        return "UPCOMING"
+    if now - end > timedelta(days=1):
+        return "MISSED"
+    return "TO_BE_CONFIRMED"
+
+
+def next_transition(start, end, now):
+    """Return the first moment after `now` at which the habit's status changes.
+
+    Args:
+        start (datetime): Start of the habit session.
+        end (datetime): End of the habit session.
+        now (datetime): Reference time.
+
+    Returns:
+        datetime|None: The next transition time, or None once the habit is MISSED.
+    """
+    # MISSED requires strictly more than one day after the end
+    for moment in (start, end, end + timedelta(days=1, microseconds=1)):
+        if moment > now:
+            return moment
+    return None
+
+
+class StatusScheduler:
+    """Applies habit status transitions from a min-heap of due times.
+
+    Attributes:
+        db_name (str): Database file used by the scheduler thread.
+
+    The scheduler registers itself as a HabitFactory listener while running.
+    Listener callbacks only touch the in-memory heap, so they are cheap and
+    safe to call from any thread; all database work happens on the scheduler
+    thread through its own HabitFactory.
+    """
+
+    def __init__(self, db_name=None, clock=datetime.now):
+        """Create a stopped scheduler.
+
+        Args:
+            db_name (str, optional): SQLite database file. Defaults to the
+                configured path (see data.config).
+            clock (callable): Returns the current datetime. Replaceable in tests.
+        """
+        self.db_name = db_name
+        self.__clock = clock
+        self.__heap = []
+        self.__scheduled = {}
+        self.__condition = threading.Condition()
+        self.__running = False
+        self.__thread = None
+
+    # -------------------- Heap --------------------
+
+    def __schedule(self, id, due):
+        """Set (or clear, when `due` is None) the next check time of a habit.
+
+        Outdated heap entries are left in place and skipped when popped, since
+        only the time recorded in `__scheduled` counts. Must hold the lock.
+        """
+        if due is None:
+            self.__scheduled.pop(id, None)
+            return
+        self.__scheduled[id] = due
+        heapq.heappush(self.__heap, (due, id))
+        self.__condition.notify()
+
+    def __pop_due(self):
+        """Remove and return the ids of all habits due by now. Must hold the lock."""
+        now = self.__clock()
+        due_ids = []
+        while self.__heap and self.__heap[0][0] <= now:
+            due, id = heapq.heappop(self.__heap)
+            if self.__scheduled.get(id) == due:
+                del self.__scheduled[id]
+                due_ids.append(id)
+        return due_ids
+
+    def __plan(self, row, now):
+        """Return when a habit row needs attention next, or None if never.
+
+        A row whose stored status is already out of date is due immediately.
+        """
+        id, _, _, start_datetime, duration, status = row[:6]
+        schedule = parse_schedule(start_datetime, duration)
+        if status not in OPEN_STATUSES or schedule is None:
+            return None
+        start, end = schedule
+        if status_at(start, end, now) != status:
+            return now
+        return next_transition(start, end, now)
+
+    def pending(self):
+        """Return the number of habits with a scheduled transition."""
+        with self.__condition:
+            return len(self.__scheduled)
+
+    def next_due(self):
+        """Return the earliest scheduled transition time, or None."""
+        with self.__condition:
+            return min(self.__scheduled.values(), default=None)
+
+    # -------------------- Database --------------------
+
+    def load(self, habit_factory):
+        """Fill the heap with the next transition of every open habit.
+
+        Args:
+            habit_factory (HabitFactory): Factory used to read the habits.
+        """
+        now = self.__clock()
+        with self.__condition:
+            for status in OPEN_STATUSES:
+                for row in habit_factory.get_habits_by_status(status):
+                    self.__schedule(row[0], self.__plan(row, now))
+
+    def process_due(self, habit_factory):
+        """Apply every transition that is due and schedule each habit's next one.
+
+        The habit is re-read before it is updated, so edits made since it was
+        scheduled are taken into account.
+
+        Args:
+            habit_factory (HabitFactory): Factory used to read and update habits.
+
+        Returns:
+            int: Number of habits whose status changed.
+        """
+        with self.__condition:
+            due_ids = self.__pop_due()
+
+        changed = 0
+        for id in due_ids:
+            row = habit_factory.get_habit(id)
+            if not row or row[5] not in OPEN_STATUSES:
+                continue
+            schedule = parse_schedule(row[3], row[4])
+            if schedule is None:
+                continue
+            now = self.__clock()
+            status = status_at(*schedule, now)
+            if status != row[5]:
+                message, result = habit_factory.transition_status(id, status)
+                if message == "success" and result:
+                    changed += 1
+            with self.__condition:
+                if id not in self.__scheduled:
+                    self.__schedule(id, next_transition(*schedule, now))
+        return changed
+
+    # -------------------- HabitFactory listener --------------------
+
+    def habit_added(self, habit):
+        """Schedule a newly added habit for an immediate check."""
+        with self.__condition:
+            self.__schedule(int(habit.get_id()), self.__clock())
+
+    def series_added(self, series_id, ids, habit):
+        """Schedule every occurrence of a newly added series for an immediate check."""
+        with self.__condition:
+            now = self.__clock()
+            for id in ids:
+                self.__schedule(id, now)
+
+    def habit_updated(self, table_name, id, fields):
+        """Re-check an updated habit, since its schedule or status may have changed."""
+        if table_name == "habit":
+            with self.__condition:
+                self.__schedule(int(id), self.__clock())
+
+    def habit_deleted(self, habit):
+        """Forget a deleted habit."""
+        with self.__condition:
+            self.__schedule(int(habit.get_id()), None)
+
+    # -------------------- Thread --------------------
+
+    def start(self):
+        """Start the background thread and listen to HabitFactory writes."""
+        if self.__running:
+            return
+        self.__running = True
+        HabitFactory.add_listener(self)
+        self.__thread = threading.Thread(target=self.__run, name="status-scheduler", daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=2):
+        """Stop listening and wait for the background thread to finish.
+
+        Args:
+            timeout (float): Seconds to wait for the thread.
+        """
+        HabitFactory.remove_listener(self)
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self):
+        """Thread body: run the scheduler loop with a factory owned by this thread."""
+        # sqlite connections cannot be shared between threads, so the
+        # scheduler thread uses its own factory
+        habit_factory = HabitFactory(self.db_name)
+        try:
+            self.__loop(habit_factory)
+        finally:
+            habit_factory.close()
+
+    def __loop(self, habit_factory):
+        """Load the heap, then apply transitions as they fall due until stopped."""
+        self.load(habit_factory)
+        while True:
+            with self.__condition:
+                while self.__running:
+                    due = self.__heap[0][0] if self.__heap else None
+                    now = self.__clock()
+                    if due is not None and due <= now:
+                        break
+                    self.__condition.wait(None if due is None else (due - now).total_seconds())
+                if not self.__running:
+                    break
+            self.process_due(habit_factory)
@@ -0,0 +1,51 @@
+import unittest
+
+from src.services.command_registry import CommandRegistry, load_object
+
+
+class Probe:
+    created = 0
+
+    def __init__(self):
+        Probe.created += 1
+
+    def run(self):
+        return "ran"
+
+    def stop(self):
+        return "done"
+
+
+PROBE = f"{__name__}:Probe"
+
+
+class TestCommandRegistry(unittest.TestCase):
+    def setUp(self):
+        Probe.created = 0
+        self.commands = CommandRegistry()
+        self.commands.register("run", PROBE, "run")
+        self.commands.register("stop", PROBE, "stop")
+
+    def test_behaves_like_a_command_dict(self):
+        self.assertEqual(list(self.commands.keys()), ["run", "stop"])
+        self.assertIn("run", self.commands)
+        self.assertNotIn("walk", self.commands)
+        self.assertEqual(len(self.commands), 2)
+
+    def test_handler_is_built_on_first_use_and_shared(self):
+        command = self.commands["run"]
+        self.assertEqual(Probe.created, 0)
+        self.assertEqual(self.commands.loaded(), [])
+        self.assertEqual(command(), "ran")
+        self.assertEqual(self.commands["stop"](), "done")
+        self.assertEqual(Probe.created, 1)
+        self.assertEqual(self.commands.loaded(), [PROBE])
+
+    def test_load_object(self):
+        self.assertIs(load_object(PROBE), Probe)
+        with self.assertRaises(ValueError):
+            load_object("no_colon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+
+from src.models.habit import Habit
+from src.services.completers import IndexCompleter
+from src.services.completion_index import CompletionIndex, PrefixIndex
+from src.services.habit_factory import HabitFactory
+from src.services.pattern_repository import PatternRepository
+from src.services.recurrence import RecurrenceRule, weekday_mask
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def test_prefix_queries_ignore_case(self):
+        index = PrefixIndex(["Morning run", "morning yoga", "Reading", "MORNING RUN"])
+        self.assertEqual(index.complete("morn"), ["Morning run", "morning yoga"])
+        self.assertEqual(index.complete("MORNING R"), ["Morning run"])
+        self.assertEqual(index.complete("x"), [])
+        self.assertEqual(index.complete("", limit=2), ["Morning run", "morning yoga"])
+        self.assertEqual(len(index), 3)
+
+    def test_copies_are_counted(self):
+        index = PrefixIndex()
+        index.add("Gym")
+        index.add("gym")
+        index.discard("Gym")
+        self.assertEqual(index.complete("g"), ["Gym"])
+        index.discard("gym")
+        index.discard("gym")
+        self.assertEqual(index.complete("g"), [])
+        self.assertNotIn("gym", index)
+
+
+class TestCompletionIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_completion.db"
+        self.habit_factory = HabitFactory(self.test_db_name)
+        self.patterns = PatternRepository(self.test_db_name)
+        self.habit_factory.add_habit(Habit("Morning run", "2060-01-01 07:00:00", "00:30:00"))
+        self.patterns.save_week_pattern("gym week", ["mon"])
+        self.index = CompletionIndex()
+        self.index.load(self.habit_factory, self.patterns)
+        HabitFactory.add_listener(self.index)
+        PatternRepository.add_listener(self.index)
+
+    def tearDown(self):
+        HabitFactory.remove_listener(self.index)
+        PatternRepository.remove_listener(self.index)
+        self.habit_factory.close()
+        self.patterns.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_loaded_from_the_database(self):
+        self.assertEqual(self.index.complete("name", "morning"), ["Morning run"])
+        self.assertEqual(self.index.complete("id", "1"), ["1"])
+        self.assertEqual(self.index.complete("week", "g"), ["gym week"])
+
+    def test_follows_habit_writes(self):
+        habit = Habit("Morning yoga", "2060-01-02 07:00:00", "00:30:00")
+        self.habit_factory.add_habit(habit)
+        self.assertEqual(self.index.complete("name", "morning"), ["Morning run", "Morning yoga"])
+
+        self.habit_factory.update_habit("habit", habit.get_id(), name="Evening yoga")
+        self.assertEqual(self.index.complete("name", "morning"), ["Morning run"])
+        self.assertEqual(self.index.complete("name", "eve"), ["Evening yoga"])
+
+        habit.set_name("Evening yoga")
+        self.habit_factory.delete_habit(habit)
+        self.assertEqual(self.index.complete("name", "eve"), [])
+        self.assertEqual(self.index.complete("id", str(habit.get_id())), [])
+
+    def test_follows_series_and_pattern_writes(self):
+        start = datetime(2060, 2, 1, 7)
+        rule = RecurrenceRule(start, [weekday_mask(["mon", "tue"])], repeat=True)
+        _, (_, ids) = self.habit_factory.add_series_rule(Habit("Swim", start, "00:45:00"), rule, end=start + timedelta(days=14))
+        self.assertEqual(self.index.complete("name", "sw"), ["Swim"])
+        self.assertEqual(self.index.size("id"), 1 + len(ids))
+
+        self.patterns.rename_week_pattern("gym week", "lifting")
+        self.patterns.save_month_pattern("busy", ["lifting", "skip", "skip", "skip"])
+        self.assertEqual(self.index.complete("week", ""), ["lifting"])
+        self.assertEqual(self.index.complete("month", "b"), ["busy"])
+        self.patterns.delete_month_pattern("busy")
+        self.assertEqual(self.index.complete("month", ""), [])
+
+    def test_prompt_toolkit_completer(self):
+        self.patterns.save_week_pattern("rest", ["sun"])
+        completer = IndexCompleter(self.index, ("name", "week"))
+
+        def complete(text):
+            return [completion.text for completion in completer.get_completions(Document(text), CompleteEvent())]
+
+        self.assertEqual(complete("morning r"), ["Morning run"])
+        # no value starts with the whole line: complete its last word
+        self.assertEqual(complete("gym week sk"), [])
+        self.assertEqual(complete("skip r"), ["rest"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -35,6 +35,9 @@ class FakeDB:
     def get_name_with_text(self, name):
         return [h for h in self.data if name.lower() in h[2].lower()]
 
+    def diagnostics(self):
+        return {"db_path": "fake.db"}
+
 
 class TestHabitFactory(unittest.TestCase):
 
@@ -65,6 +68,9 @@ class TestHabitFactory(unittest.TestCase):
         result = self.factory.get_name_with_text("read")
         self.assertEqual(result[0][2], "Reading")
 
+    def test_diagnostics(self):
+        self.assertEqual(self.factory.diagnostics(), {"db_path": "fake.db"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from src.components.search_habit.controller.search_habit_controller import SearchHabit
+from src.models.habit import Habit
+from src.services.habit_factory import HabitFactory
+from src.services.output_formats import CONTENT, FORMATS, HABIT, HABIT_DETAILS, OUTPUT_FORMAT_ENV, get_format
+
+ROWS = [
+    (1, 1, "Morning run", "2060-01-01 07:00:00", "00:30:00", "UPCOMING", "5k\nby the river", None),
+    (2, 2, "Café \"reading\"", "2060-01-02 21:00:00", "01:00:00", "DONE", "", "good\tbook"),
+]
+
+
+def render(name, rows, shape, batches=None):
+    out = io.StringIO()
+    output = get_format(name, out)
+    if batches is None:
+        output.write(rows, shape)
+    else:
+        output.write_batches(batches, shape)
+    return out.getvalue()
+
+
+class TestOutputFormats(unittest.TestCase):
+    def test_json_and_ndjson_hold_every_field(self):
+        expected = [dict(zip(HABIT.fields, row)) for row in ROWS]
+        self.assertEqual(json.loads(render("json", ROWS, HABIT)), expected)
+        lines = render("ndjson", ROWS, HABIT).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+        self.assertEqual(json.loads(render("json", [], HABIT)), [])
+        self.assertEqual(render("ndjson", [], HABIT), "")
+
+    def test_batches_stream_into_one_document(self):
+        batches = [ROWS[:1], [], ROWS[1:]]
+        self.assertEqual(render("json", None, HABIT, batches), render("json", ROWS, HABIT))
+        self.assertEqual(render("ndjson", None, HABIT, batches), render("ndjson", ROWS, HABIT))
+
+    def test_shorter_rows_omit_missing_fields(self):
+        self.assertEqual(json.loads(render("ndjson", [ROWS[0][:6]], HABIT)), dict(zip(HABIT.fields[:6], ROWS[0])))
+
+    def test_table_and_tsv_are_one_line_per_row(self):
+        table = render("table", ROWS, HABIT).splitlines()
+        self.assertEqual(table[0].split(), ["id", "name", "start_datetime", "duration", "status"])
+        self.assertEqual(table[1].index("Morning run"), table[0].index("name"))
+        self.assertEqual(table[2].split("  ")[0], "2")
+        self.assertEqual(render("table", [], HABIT), "id name start_datetime duration status\n")
+
+        tsv = [line.split("\t") for line in render("tsv", ROWS, HABIT).splitlines()]
+        self.assertEqual(tsv[0][6:], ["5k by the river", ""])
+        self.assertEqual(tsv[1][7], "good book")
+
+    def test_highlight_markers(self):
+        row = (4, "ran 5k", None, "Morning run", "2060-01-01 07:00:00", "DONE", f"{SearchHabit.HIGHLIGHT_START}ran{SearchHabit.HIGHLIGHT_END} 5k")
+        self.assertEqual(json.loads(render("json", [row], CONTENT))[0]["match"], "ran 5k")
+        pretty = render("pretty", [row], CONTENT)
+        self.assertNotIn(SearchHabit.HIGHLIGHT_START, pretty)
+        self.assertIn("ran", pretty)
+
+    def test_pretty_blocks(self):
+        pretty = render("pretty", ROWS[:1], HABIT_DETAILS)
+        self.assertIn("RESULTS", pretty)
+        for label in ("id", "name", "start datetime", "duration", "description", "status"):
+            self.assertIn(f"    {label:<15}: ", pretty)
+        self.assertNotIn("reflection", pretty)
+        self.assertIn("No results found!", render("pretty", [], HABIT))
+
+    def test_format_names(self):
+        self.assertEqual(set(FORMATS), {"pretty", "table", "tsv", "json", "ndjson"})
+        self.assertEqual(get_format("NDJSON").name, "ndjson")
+        with patch.dict(os.environ, {OUTPUT_FORMAT_ENV: "table"}):
+            self.assertEqual(get_format().name, "table")
+        with self.assertRaises(ValueError):
+            get_format("xml")
+
+
+class TestOutputListing(unittest.TestCase):
+    def test_listing_streams_from_the_database(self):
+        db_name = "test_habit_output.db"
+        habit_factory = HabitFactory(db_name)
+        try:
+            habits = [Habit(f"habit {number}", "2060-01-01 07:00:00", "00:30:00") for number in range(1200)]
+            habit_factory.add_habits(habits)
+            out = io.StringIO()
+            get_format("ndjson", out).write_batches(habit_factory.iter_habit_batches(), HABIT)
+        finally:
+            habit_factory.close()
+            os.remove(db_name)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 1200)
+        self.assertEqual(json.loads(lines[-1])["name"], "habit 1199")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+
+from src.services.pattern_repository import PatternRepository
+
+
+class TestPatternRepository(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_patterns.db"
+        self.patterns = PatternRepository(self.test_db_name)
+        self.patterns.save_week_pattern("gym", ["fri", "mon", "wed"])
+        self.patterns.save_week_pattern("rest", ["sun"])
+        self.patterns.save_month_pattern("busy", ["gym", "skip", "gym", "rest"])
+
+    def tearDown(self):
+        self.patterns.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def test_patterns_in_view_format(self):
+        self.assertEqual(self.patterns.week_patterns(), {"gym": ["mon", "wed", "fri"], "rest": ["sun"]})
+        self.assertEqual(
+            self.patterns.month_patterns(),
+            {"busy": [{"gym": ["mon", "wed", "fri"]}, {"skip": None}, {"gym": ["mon", "wed", "fri"]}, {"rest": ["sun"]}]},
+        )
+
+    def test_weekday_membership_is_a_mask(self):
+        self.assertEqual(self.patterns.week_mask("gym"), 0b10101)
+        self.assertTrue(self.patterns.has_weekday("gym", "wed"))
+        self.assertFalse(self.patterns.has_weekday("gym", 1))
+
+    def test_patterns_persist_across_sessions(self):
+        other = PatternRepository(self.test_db_name)
+        self.assertEqual(other.week_names(), ["gym", "rest"])
+        self.assertEqual(other.month_names(), ["busy"])
+        other.close()
+
+    def test_edit_and_rename_follow_into_months(self):
+        self.patterns.save_week_pattern("gym", ["tue"])
+        self.patterns.rename_week_pattern("gym", "lift")
+        self.patterns.refresh()
+        self.assertEqual(self.patterns.month_patterns()["busy"][0], {"lift": ["tue"]})
+
+    def test_week_in_use_cannot_be_deleted(self):
+        self.assertEqual(self.patterns.delete_week_pattern("rest")[0], "error")
+        self.assertEqual(self.patterns.delete_month_pattern("busy"), ("success", None))
+        self.assertEqual(self.patterns.delete_week_pattern("rest"), ("success", None))
+        self.patterns.refresh()
+        self.assertEqual(self.patterns.week_names(), ["gym"])
+
+    def test_invalid_input_is_rejected(self):
+        self.assertEqual(self.patterns.save_week_pattern("bad", ["funday"])[0], "error")
+        self.assertEqual(self.patterns.save_month_pattern("bad", ["missing"])[0], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from datetime import datetime, timedelta
+
+from src.services.recurrence import (
+    RecurrenceRule,
+    WEEKDAYS,
+    expand_rules,
+    format_datetimes,
+    mask_weekdays,
+    weekday_mask,
+)
+
+
+class TestRecurrenceRule(unittest.TestCase):
+    def setUp(self):
+        # 2060-01-07 is a Wednesday
+        self.anchor = datetime(2060, 1, 7, 6, 30)
+        self.patterns = [
+            [{"gym": ["mon", "wed"]}, {"skip": None}, {"gym": ["mon", "wed"]}, {"rest": ["sun"]}],
+            None,
+        ]
+        self.rule = RecurrenceRule.from_patterns(self.anchor, self.patterns)
+        self.repeating = RecurrenceRule.from_patterns(self.anchor, self.patterns, repeat=True)
+
+    def brute_force(self, rule, end):
+        moments = []
+        day = rule.anchor
+        while day < end:
+            slot = (day - rule.anchor).days // 7 % len(rule.week_masks)
+            if rule.week_masks[slot] & (1 << day.weekday()):
+                moments.append(day)
+            day += timedelta(days=1)
+        return moments
+
+    def test_masks(self):
+        self.assertEqual(weekday_mask(["mon", "sun"]), 0b1000001)
+        self.assertEqual(weekday_mask(None), 0)
+        self.assertEqual(mask_weekdays(weekday_mask(WEEKDAYS)), WEEKDAYS)
+        with self.assertRaises(ValueError):
+            weekday_mask(["funday"])
+
+    def test_single_pass_matches_walk(self):
+        expected = self.brute_force(self.rule, self.rule.end())
+        self.assertEqual(list(self.rule.occurrences()), expected)
+        self.assertEqual(self.rule.count(), len(expected))
+        self.assertEqual(self.rule.end(), self.anchor + timedelta(days=56))
+        self.assertTrue(all(moment.time() == self.anchor.time() for moment in expected))
+        self.assertEqual(expected[0], self.anchor)
+
+    def test_repeating_count_and_window(self):
+        end = self.anchor + timedelta(days=3 * 365)
+        expected = self.brute_force(self.repeating, end)
+        start = self.anchor + timedelta(days=100, hours=12)
+        window = [moment for moment in expected if start <= moment]
+        self.assertEqual(self.repeating.count(self.anchor, end), len(expected))
+        self.assertEqual(self.repeating.count(start, end), len(window))
+        self.assertEqual(list(self.repeating.occurrences(start, end)), window)
+        with self.assertRaises(ValueError):
+            self.repeating.count()
+
+    def test_next_after(self):
+        expected = self.brute_force(self.repeating, self.anchor + timedelta(days=200))
+        for before, after in zip(expected, expected[1:]):
+            self.assertEqual(self.repeating.next_after(before), after)
+            self.assertEqual(self.repeating.next_after(after - timedelta(seconds=1)), after)
+        self.assertEqual(self.rule.next_after(self.anchor - timedelta(days=30)), self.anchor)
+        self.assertIsNone(self.rule.next_after(self.rule.end()))
+
+    def test_empty_rule(self):
+        rule = RecurrenceRule(self.anchor, [0, 0], repeat=True)
+        self.assertEqual(rule.count(self.anchor, self.anchor + timedelta(days=900)), 0)
+        self.assertIsNone(rule.next_after(self.anchor))
+        self.assertEqual(list(rule.occurrences(end=self.anchor + timedelta(days=900))), [])
+
+
+class TestOccurrenceArrays(unittest.TestCase):
+    def setUp(self):
+        self.anchor = datetime(2060, 1, 7, 6, 30)
+        self.rule = RecurrenceRule(self.anchor, [weekday_mask(["mon", "wed"]), 0, weekday_mask(["sun"])])
+        self.repeating = RecurrenceRule(self.anchor, self.rule.week_masks, repeat=True)
+
+    def as_strings(self, moments):
+        return [moment.strftime("%Y-%m-%d %H:%M:%S") for moment in moments]
+
+    def test_array_matches_occurrences(self):
+        self.assertEqual(
+            format_datetimes(self.rule.occurrence_array()),
+            self.as_strings(self.rule.occurrences()),
+        )
+        start = self.anchor + timedelta(days=40, hours=3)
+        end = self.anchor + timedelta(days=400)
+        self.assertEqual(
+            format_datetimes(self.repeating.occurrence_array(start, end)),
+            self.as_strings(self.repeating.occurrences(start, end)),
+        )
+
+    def test_array_needs_an_end_when_repeating(self):
+        with self.assertRaises(ValueError):
+            self.repeating.occurrence_array()
+        self.assertEqual(len(RecurrenceRule(self.anchor, [0]).occurrence_array()), 0)
+
+    def test_expand_rules_columns(self):
+        end = self.anchor + timedelta(days=60)
+        rule_index, start_times = expand_rules([self.repeating, self.rule], end=end)
+        first = self.repeating.count(end=end)
+        self.assertEqual(list(rule_index), [0] * first + [1] * self.rule.count())
+        self.assertEqual(
+            format_datetimes(start_times),
+            self.as_strings(self.repeating.occurrences(end=end)) + self.as_strings(self.rule.occurrences()),
+        )
+        self.assertEqual([len(column) for column in expand_rules([])], [0, 0])
+
+    def test_ten_years_of_daily_habits(self):
+        end = self.anchor + timedelta(days=3652)
+        rules = [
+            RecurrenceRule(self.anchor + timedelta(minutes=index), [weekday_mask(WEEKDAYS)], repeat=True)
+            for index in range(100)
+        ]
+        rule_index, start_times = expand_rules(rules, end=end)
+        self.assertEqual(len(start_times), sum(rule.count(end=end) for rule in rules))
+        self.assertEqual(len(rule_index), len(start_times))
+        last = self.anchor + timedelta(days=3651, minutes=99)
+        self.assertEqual(format_datetimes(start_times[-1:]), self.as_strings([last]))
+
+
+if __name__ == "__main__":
+    unittest.main()
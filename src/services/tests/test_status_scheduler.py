@@ -0,0 +1,135 @@
+import unittest
+import os
+import time
+from datetime import datetime, timedelta
+
+from src.services.status_scheduler import StatusScheduler, status_at, next_transition, parse_schedule
+from src.services.habit_factory import HabitFactory
+from src.models.habit import Habit
+from src.services.recurrence import RecurrenceRule, weekday_mask, WEEKDAYS
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestStatusRules(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2060, 1, 1, 10, 0)
+        self.end = datetime(2060, 1, 1, 11, 0)
+
+    def test_status_at(self):
+        self.assertEqual(status_at(self.start, self.end, self.start - timedelta(seconds=1)), "UPCOMING")
+        self.assertEqual(status_at(self.start, self.end, self.start), "ONGOING")
+        self.assertEqual(status_at(self.start, self.end, self.end), "TO_BE_CONFIRMED")
+        self.assertEqual(status_at(self.start, self.end, self.end + timedelta(days=1)), "TO_BE_CONFIRMED")
+        self.assertEqual(status_at(self.start, self.end, self.end + timedelta(days=1, seconds=1)), "MISSED")
+
+    def test_next_transition(self):
+        self.assertEqual(next_transition(self.start, self.end, self.start - timedelta(hours=1)), self.start)
+        self.assertEqual(next_transition(self.start, self.end, self.start), self.end)
+        self.assertGreater(next_transition(self.start, self.end, self.end), self.end + timedelta(days=1))
+        self.assertIsNone(next_transition(self.start, self.end, self.end + timedelta(days=2)))
+
+    def test_parse_schedule_invalid(self):
+        self.assertIsNone(parse_schedule("2060-01-01, 10:00", "01:00:00"))
+
+
+class TestStatusScheduler(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = "test_habit_scheduler.db"
+        self.habit_factory = HabitFactory(self.test_db_name)
+        self.now = datetime.now().replace(microsecond=0)
+        self.clock = FakeClock(self.now)
+        self.scheduler = StatusScheduler(self.test_db_name, clock=self.clock)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.habit_factory.db.database.close()
+        try:
+            os.remove(self.test_db_name)
+        except:
+            pass
+
+    def add(self, start, duration="01:00:00"):
+        habit = Habit("Run", str(start), duration)
+        self.habit_factory.add_habit(habit)
+        return habit.get_id()
+
+    def status_of(self, id):
+        return self.habit_factory.get_habit(id)[5]
+
+    def test_transitions_applied_when_due(self):
+        id = self.add(self.now + timedelta(hours=1))
+        self.scheduler.load(self.habit_factory)
+        self.assertEqual(self.scheduler.next_due(), self.now + timedelta(hours=1))
+
+        self.assertEqual(self.scheduler.process_due(self.habit_factory), 0)
+        self.clock.now = self.now + timedelta(hours=1)
+        self.assertEqual(self.scheduler.process_due(self.habit_factory), 1)
+        self.assertEqual(self.status_of(id), "ONGOING")
+
+        self.clock.now = self.now + timedelta(hours=2)
+        self.scheduler.process_due(self.habit_factory)
+        self.assertEqual(self.status_of(id), "TO_BE_CONFIRMED")
+
+        self.clock.now = self.now + timedelta(days=2)
+        self.scheduler.process_due(self.habit_factory)
+        self.assertEqual(self.status_of(id), "MISSED")
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_completed_habit_not_overwritten(self):
+        id = self.add(self.now - timedelta(hours=3))
+        self.scheduler.load(self.habit_factory)
+        self.habit_factory.update_habit("habit", id, status="DONE")
+        self.scheduler.process_due(self.habit_factory)
+        self.assertEqual(self.status_of(id), "DONE")
+
+    def test_listener_updates_heap(self):
+        HabitFactory.add_listener(self.scheduler)
+        try:
+            id = self.add(self.now + timedelta(hours=1))
+            self.assertEqual(self.scheduler.pending(), 1)
+            self.scheduler.process_due(self.habit_factory)
+            self.assertEqual(self.scheduler.next_due(), self.now + timedelta(hours=1))
+
+            habit = Habit("Run", self.habit_factory.get_habit(id)[3], "01:00:00", id)
+            habit.content.set_description(self.habit_factory.get_habit(id)[6])
+            habit.content.set_reflections(self.habit_factory.get_habit(id)[7])
+            self.habit_factory.delete_habit(habit)
+            self.assertEqual(self.scheduler.pending(), 0)
+        finally:
+            HabitFactory.remove_listener(self.scheduler)
+
+    def test_listener_schedules_series(self):
+        HabitFactory.add_listener(self.scheduler)
+        try:
+            start = self.now - timedelta(days=1)
+            rule = RecurrenceRule(start, [weekday_mask(WEEKDAYS)], repeat=True)
+            status, (_, ids) = self.habit_factory.add_series_rule(
+                Habit("Run", str(start), "01:00:00"), rule, end=start + timedelta(days=3)
+            )
+            self.assertEqual(status, "success")
+            self.assertEqual(self.scheduler.pending(), 3)
+            self.scheduler.process_due(self.habit_factory)
+            self.assertEqual([self.status_of(id) for id in ids], ["TO_BE_CONFIRMED", "ONGOING", "UPCOMING"])
+        finally:
+            HabitFactory.remove_listener(self.scheduler)
+
+    def test_background_thread(self):
+        scheduler = StatusScheduler(self.test_db_name)
+        id = self.add(datetime.now().replace(microsecond=0) + timedelta(seconds=1))
+        scheduler.start()
+        try:
+            time.sleep(2)
+        finally:
+            scheduler.stop()
+        self.assertEqual(self.status_of(id), "ONGOING")
+
+
+if __name__ == "__main__":
+    unittest.main()
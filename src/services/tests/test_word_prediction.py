@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from src.services.command_history import CompactHistory, MAX_ENTRIES, escape, open_history, unescape
+from src.services.word_prediction import AutoCompleter, command_completer, history_path, shared_history
+
+
+def write_history(path, lines):
+    """Write a history file holding `lines` distinct commands."""
+    with open(path, "w") as history_file:
+        for line in range(lines):
+            history_file.write(f"get habits {line}\n")
+
+
+def line_count(path):
+    with open(path) as history_file:
+        return sum(1 for _ in history_file)
+
+
+def load(history):
+    """Load a history the way a prompt session does, returning its strings."""
+    async def drain():
+        return [item async for item in history.load()]
+    return asyncio.run(drain())
+
+
+class TestAutoCompleter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.directory.name, "command_history.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sessions_are_pooled_by_command_set(self):
+        first = AutoCompleter.pooled(["get habits", "esc"], self.history_file)
+        self.assertIs(AutoCompleter.pooled(("get habits", "esc"), self.history_file), first)
+        self.assertIsNot(AutoCompleter.pooled(["esc", "get habits"], self.history_file), first)
+        self.assertIs(first.get_session(), AutoCompleter.pooled(["get habits", "esc"], self.history_file).get_session())
+
+    def test_history_and_completers_are_shared(self):
+        one = AutoCompleter(["a", "b"], self.history_file)
+        two = AutoCompleter(["b", "c"], self.history_file)
+        self.assertIs(one.get_session().history, two.get_session().history)
+        self.assertIs(one.get_completer(), command_completer(("a", "b")))
+        self.assertEqual(one.get_commands(), ["a", "b"])
+
+    def test_history_file_is_read_once_across_prompts(self):
+        write_history(self.history_file, 10)
+        expected = [f"get habits {line}" for line in range(9, -1, -1)]
+        self.assertEqual(load(AutoCompleter.pooled(["a"], self.history_file).get_session().history), expected)
+        os.remove(self.history_file)
+        for prompt in range(5):
+            session = AutoCompleter.pooled([f"command {prompt % 2}"], self.history_file).get_session()
+            self.assertEqual(load(session.history), expected)
+
+    def test_history_path(self):
+        self.assertEqual(history_path(self.history_file), self.history_file)
+        self.assertEqual(history_path("~/history"), os.path.join(os.path.expanduser("~"), "history"))
+
+
+class TestCompactHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "nested", "history")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_escaping_round_trips(self):
+        for command in ["get habits", "a\\nb", "line\nbreak", "\\\n", "trailing\\"]:
+            self.assertNotIn("\n", escape(command))
+            self.assertEqual(unescape(escape(command)), command)
+
+    def test_commands_are_deduplicated_most_recent_first(self):
+        history = CompactHistory(self.path, max_entries=3)
+        for command in ["a", "b", "a", "c", "d", "b"]:
+            history.store_string(command)
+        self.assertEqual(list(CompactHistory(self.path, max_entries=3).load_history_strings()), ["b", "d", "c"])
+        # loading rewrote the file without the duplicates and the overflow
+        self.assertEqual(line_count(self.path), 3)
+
+    def test_appending_compacts_the_file(self):
+        history = CompactHistory(self.path, max_entries=5, compact_after=2)
+        self.assertEqual(load(history), [])
+        for command in range(30):
+            history.append_string(f"command {command % 7}")
+            self.assertLessEqual(line_count(self.path), 10)
+        self.assertEqual(history.get_strings(), [f"command {command % 7}" for command in range(25, 30)])
+        self.assertEqual(
+            list(CompactHistory(self.path, max_entries=5).load_history_strings()),
+            history.get_strings()[::-1],
+        )
+
+    def test_threaded_history_is_deduplicated_and_capped_in_memory(self):
+        history = open_history(self.path, max_entries=3)
+        self.assertEqual(load(history), [])
+        for command in ["a", "b", "a", "c", "d", "b"]:
+            history.append_string(command)
+        self.assertEqual(history.get_strings(), ["c", "d", "b"])
+        self.assertEqual(list(CompactHistory(self.path, max_entries=3).load_history_strings()), ["b", "d", "c"])
+
+    def test_commands_stored_during_compaction_are_kept(self):
+        history = CompactHistory(self.path, max_entries=10_000)
+        history.store_string("first")
+        history.load_history_strings()
+        stored = threading.Event()
+
+        def compact():
+            while not stored.is_set():
+                history.compact()
+
+        def store(writer):
+            for command in range(200):
+                history.store_string(f"writer {writer} command {command}")
+
+        compactor = threading.Thread(target=compact)
+        compactor.start()
+        writers = [threading.Thread(target=store, args=(writer,)) for writer in range(4)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        stored.set()
+        compactor.join()
+        self.assertEqual(len(CompactHistory(self.path, max_entries=10_000).load_history_strings()), 801)
+
+    def test_shared_history_loads_in_the_background(self):
+        os.makedirs(os.path.dirname(self.path))
+        write_history(self.path, 10)
+        history = shared_history(self.path)
+        self.assertEqual(load(history), [f"get habits {line}" for line in range(9, -1, -1)])
+
+    def test_long_history_is_capped_on_load(self):
+        os.makedirs(os.path.dirname(self.path))
+        write_history(self.path, 100_000)
+        self.assertEqual(len(CompactHistory(self.path).load_history_strings()), MAX_ENTRIES)
+        self.assertEqual(line_count(self.path), MAX_ENTRIES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,86 @@
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import WordCompleter, FuzzyCompleter
-from prompt_toolkit.history import FileHistory
+"""Command completion and prompt sessions for the interactive consoles.
+
+Consoles prompt in a loop, so the pieces of a prompt are built once and
+reused:
+
+    - one history object per history file and process, a bounded
+      CompactHistory (see services.command_history) loaded in a background
+      thread the first time a prompt needs it,
+    - one completer per command set,
+    - a pool of AutoCompleter sessions keyed by command set, history file and
+      completion kinds (`AutoCompleter.pooled`).
+
+A prompt asking for stored data (habit names, ids, pattern names) also
+completes from a CompletionIndex (see services.completion_index) by passing
+the kinds of value it expects.
+
+The history lives in `~/.habit_tracker_history` unless the
+HABIT_TRACKER_HISTORY environment variable names another file, so it no
+longer depends on the directory the program runs in.
+
+prompt_toolkit is imported when the first completer or session is built
+rather than when this module is imported, so programs only pay for it once
+they actually prompt.
+"""
+
+import os
+from functools import lru_cache
+
+HISTORY_FILE = os.path.join("~", ".habit_tracker_history")
+HISTORY_ENV = "HABIT_TRACKER_HISTORY"
+
+# Distinct command sets kept in the session pool.
+SESSION_POOL_SIZE = 64
+
+
+def history_path(history_file=None):
+    """Resolve the history file to use.
+
+    Args:
+        history_file (str, optional): Explicit path. Defaults to the
+            HABIT_TRACKER_HISTORY environment variable, then HISTORY_FILE.
+
+    Returns:
+        str: Absolute path of the history file.
+    """
+    history_file = history_file or os.environ.get(HISTORY_ENV) or HISTORY_FILE
+    return os.path.abspath(os.path.expanduser(history_file))
+
+
+def shared_history(history_file=None):
+    """Return the process-wide history object for a history file.
+
+    Args:
+        history_file (str, optional): Path of the history file, resolved by
+            `history_path`.
+
+    Returns:
+        CompactThreadedHistory: Shared by every session using the same file.
+    """
+    return _open_history(history_path(history_file))
+
+
+@lru_cache(maxsize=None)
+def _open_history(path):
+    """Open the history of one resolved path, once per process."""
+    from services.command_history import open_history
+
+    return open_history(path)
+
+
+@lru_cache(maxsize=SESSION_POOL_SIZE)
+def command_completer(commands):
+    """Return the fuzzy completer for a command set, built once per set.
+
+    Args:
+        commands (tuple[str]): Commands offered as suggestions.
+
+    Returns:
+        FuzzyCompleter: A fuzzy-matching completer for the commands.
+    """
+    from prompt_toolkit.completion import WordCompleter, FuzzyCompleter
+
+    return FuzzyCompleter(WordCompleter(list(commands), ignore_case=True))
 
 
 class AutoCompleter:
@@ -8,30 +88,65 @@ class AutoCompleter:
     Provides auto-completion functionality for command-line input using prompt_toolkit.
 
     Features:
-        - Maintains a command history in a file.
+        - Maintains a bounded command history in a file, shared by all sessions.
         - Provides fuzzy matching for command suggestions.
         - Returns a prompt session ready for input.
+
+    Use `AutoCompleter.pooled` to reuse the session of a command set instead
+    of building a new one for every prompt.
     """
 
-    def __init__(self, commands):
+    def __init__(self, commands, history_file=None, index=None, kinds=()):
         """
         Initialize the AutoCompleter with a list of commands.
 
         Args:
             commands (list[str]): List of command strings to provide as suggestions.
+            history_file (str, optional): Path of the command history file,
+                resolved by `history_path`.
+            index (CompletionIndex, optional): Stored values also offered.
+            kinds (iterable[str]): Kinds of stored value offered from `index`.
         """
-        self.__history = FileHistory("command_history.txt")
-        self.__commands = commands
+        from prompt_toolkit import PromptSession
+
+        self.__history = shared_history(history_file)
+        self.__commands = list(commands)
+        self.__index = index
+        self.__kinds = tuple(kinds)
         self.__session = PromptSession(completer=self.get_completer(), history=self.__history)
-        
+
+    @classmethod
+    def pooled(cls, commands, history_file=None, index=None, kinds=()):
+        """
+        Return the pooled AutoCompleter for a command set, creating it if needed.
+
+        Args:
+            commands (iterable[str]): Commands to provide as suggestions.
+            history_file (str, optional): Path of the command history file,
+                resolved by `history_path`.
+            index (CompletionIndex, optional): Stored values also offered.
+            kinds (iterable[str]): Kinds of stored value offered from `index`.
+
+        Returns:
+            AutoCompleter: Shared by every caller passing the same arguments.
+        """
+        return _pooled_completer(cls, tuple(commands), history_path(history_file), index, tuple(kinds))
+
     def get_completer(self):
         """
-        Get a FuzzyCompleter configured with the current list of commands.
+        Get a FuzzyCompleter configured with the current list of commands,
+        merged with the stored values of the requested kinds, if any.
 
         Returns:
-            FuzzyCompleter: A fuzzy-matching completer for command-line input.
+            Completer: A completer for command-line input.
         """
-        return FuzzyCompleter(WordCompleter(self.__commands, ignore_case=True))
+        completer = command_completer(tuple(self.__commands))
+        if self.__index is None or not self.__kinds:
+            return completer
+        from prompt_toolkit.completion import merge_completers
+        from services.completers import IndexCompleter
+
+        return merge_completers([IndexCompleter(self.__index, self.__kinds), completer])
 
     def get_commands(self):
         """
@@ -50,3 +165,9 @@ class AutoCompleter:
             PromptSession: A prompt_toolkit session ready for user input with history and auto-completion.
         """
         return self.__session
+
+
+@lru_cache(maxsize=SESSION_POOL_SIZE)
+def _pooled_completer(cls, commands, history_file, index, kinds):
+    """Build the AutoCompleter kept in the pool for a command set."""
+    return cls(commands, history_file, index, kinds)
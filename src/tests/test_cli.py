@@ -0,0 +1,140 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.cli import main
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "habit.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_cli(self, *argv, stdin=""):
+        out, err = io.StringIO(), io.StringIO()
+        status = main(["--db", self.db_path, *argv], stdin=io.StringIO(stdin), stdout=out, stderr=err)
+        return status, out.getvalue(), err.getvalue()
+
+    def rows(self, *argv):
+        status, out, err = self.run_cli(*argv)
+        self.assertEqual(status, 0, err)
+        return [line.split("\t") for line in out.splitlines()]
+
+    def test_add_and_list(self):
+        self.assertEqual(self.run_cli("add", "Run", "2060-01-01 07:00:00", "00:30:00", "--description", "5k")[0], 0)
+        status, out, _ = self.run_cli(
+            "add", "--file", "-",
+            stdin="Read,2020-01-01 07:00:00,01:00:00,book\n# comment\n\nYoga,2020-01-02 07:00:00,00:20:00\n",
+        )
+        self.assertEqual((status, out), (0, "added 2 habit(s)\n"))
+        self.assertEqual([row[2] for row in self.rows("list")], ["Run", "Read", "Yoga"])
+        self.assertEqual([row[2] for row in self.rows("list", "--order", "start_datetime")], ["Read", "Yoga", "Run"])
+        self.assertEqual(self.rows("list")[0][6], "5k")
+
+    def test_output_formats(self):
+        self.run_cli("add", "--file", "-", stdin="Read,2060-01-01 07:00:00,01:00:00,a book\nRun,2060-01-02 07:00:00,00:30:00\n")
+        status, out, _ = self.run_cli("--format", "json", "list")
+        self.assertEqual([habit["name"] for habit in json.loads(out)], ["Read", "Run"])
+        status, out, _ = self.run_cli("--format", "ndjson", "search", "--content", "book")
+        self.assertEqual(json.loads(out)["match"], "a book")
+        status, out, _ = self.run_cli("--format", "table", "list", "--status", "UPCOMING")
+        self.assertEqual(out.splitlines()[0].split(), ["id", "name", "start_datetime", "duration", "status"])
+
+    def test_bad_input_fails_without_writing(self):
+        status, _, err = self.run_cli("add", "--file", "-", stdin="Read,2020-01-01 07:00:00,01:00:00\nYoga,someday,00:20:00\n")
+        self.assertEqual(status, 1)
+        self.assertIn("invalid start datetime", err)
+        self.assertEqual(self.rows("list"), [])
+
+    def test_add_series(self):
+        status, out, _ = self.run_cli(
+            "add-series", "Gym", "2060-01-05 18:00:00", "01:00:00", "--week", "mon,wed", "--week", "skip",
+            "--until", "2060-03-01 00:00:00",
+        )
+        self.assertEqual((status, out), (0, "added series 1 with 8 habit(s)\n"))
+        self.assertEqual(self.run_cli("add-series", "Gym", "2060-01-05 18:00:00", "01:00:00", "--week", "funday")[0], 1)
+
+    def test_statuses_search_complete_delete_and_analytics(self):
+        ended = (datetime.now() - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M:%S")
+        self.run_cli(
+            "add", "--file", "-",
+            stdin=f"Read,2020-01-01 07:00:00,01:00:00\nRead,{ended},01:00:00\nRun,2060-01-01 07:00:00,00:30:00\n",
+        )
+        self.assertEqual(
+            self.rows("update-status"), [["UPCOMING -> MISSED", "1"], ["UPCOMING -> TO_BE_CONFIRMED", "1"]]
+        )
+        self.assertEqual([row[0] for row in self.rows("search", "--status", "missed")], ["1"])
+        self.assertEqual([row[0] for row in self.rows("search", "--month", "1", "2020")], ["1"])
+        self.assertEqual([row[0] for row in self.rows("search", "--name", "Run")], ["3"])
+
+        self.assertEqual(self.run_cli("complete", "--file", "-", stdin="2\n")[1], "completed 1 habit(s)\n")
+        self.assertEqual(self.rows("analytics"), [["Read", "1"]])
+        self.assertIn(["completion rate", "50.0%, Missed=1, Done=1"], self.rows("analytics", "--name", "Read"))
+
+        status, _, err = self.run_cli("delete", "1", "99", "98")
+        self.assertEqual((status, err), (1, "delete: habits 99, 98 not found\n"))
+        self.assertEqual([row[0] for row in self.rows("list")], ["1", "2", "3"])
+        self.assertEqual(self.run_cli("delete", "1", "3")[1], "deleted 2 habit(s)\n")
+        self.assertEqual([row[0] for row in self.rows("list")], ["2"])
+        status, _, err = self.run_cli("delete", "1")
+        self.assertEqual((status, err), (1, "delete: habit 1 not found\n"))
+
+
+    def test_search_by_month_checks_its_arguments(self):
+        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()) as err:
+            self.run_cli("search", "--month", "1", "abc")
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("invalid int value: 'abc'", err.getvalue())
+        status, _, err = self.run_cli("search", "--month", "13", "2020")
+        self.assertEqual((status, err), (1, "search: month must be between 1 and 12, got 13\n"))
+
+    def test_complete_only_habits_to_be_confirmed(self):
+        ended = (datetime.now() - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M:%S")
+        self.run_cli(
+            "add", "--file", "-",
+            stdin=f"Read,{ended},01:00:00\nRead,2020-01-01 07:00:00,01:00:00\nRun,2060-01-01 07:00:00,00:30:00\n",
+        )
+        self.run_cli("update-status")
+
+        status, out, err = self.run_cli("complete", "99")
+        self.assertEqual((status, out, err), (1, "", "complete: habit 99 not found\n"))
+        status, _, err = self.run_cli("complete", "1", "2", "3")
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            err, "complete: only TO_BE_CONFIRMED habits can be completed: 2 is MISSED, 3 is UPCOMING\n"
+        )
+        self.assertEqual([row[5] for row in self.rows("list")], ["TO_BE_CONFIRMED", "MISSED", "UPCOMING"])
+        self.assertEqual(self.run_cli("complete", "1")[:2], (0, "completed 1 habit(s)\n"))
+        self.assertEqual(self.rows("list")[0][5], "DONE")
+
+
+class TestCliProcess(unittest.TestCase):
+    """Bulk load and listing through the real entry point, without a tty."""
+
+    HABITS = 200
+
+    def test_bulk_add_and_list_without_a_tty(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=SRC_DIR)
+            command = [sys.executable, os.path.join(SRC_DIR, "cli.py"), "--db", os.path.join(directory, "habit.db")]
+            rows = "".join(f"habit {number},2060-01-01 07:{number % 60:02d}:00,00:30:00\n" for number in range(self.HABITS))
+            added = subprocess.run(command + ["add", "--file", "-"], input=rows, env=env, capture_output=True, text=True, timeout=120)
+            listed = subprocess.run(command + ["list"], env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120)
+
+        self.assertEqual(added.stdout, f"added {self.HABITS} habit(s)\n", added.stderr)
+        self.assertEqual(len(listed.stdout.splitlines()), self.HABITS, listed.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def subprocess_env(db_path):
+    """Return the environment for running the application on `db_path`."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([SRC_DIR, os.path.dirname(SRC_DIR)])
+    env["HABIT_TRACKER_DB"] = db_path
+    env["HABIT_TRACKER_HISTORY"] = os.path.join(os.path.dirname(db_path), "history")
+    return env
+
+
+def import_in_subprocess(statement, db_path):
+    """Run `statement` in a fresh interpreter and return its importtime report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SRC_DIR,
+        env=subprocess_env(db_path),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout, result.stderr
+
+
+def imported_modules(report):
+    """Return {module: cumulative microseconds} from an importtime report."""
+    modules = {}
+    for line in report.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[1].isdigit():
+            modules[fields[2]] = int(fields[1])
+    return modules
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "habit.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_imports_open_no_database(self):
+        stdout, _ = import_in_subprocess(
+            "import models.habit, src.components.analytics.view.analytics_habit_view",
+            self.db_path,
+        )
+        self.assertEqual(stdout, "")
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_main_import_opens_no_database(self):
+        stdout, _ = import_in_subprocess("import main", self.db_path)
+        self.assertEqual(stdout, "")
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_main_import_skips_consoles_and_prompt_toolkit(self):
+        _, report = import_in_subprocess("import main", self.db_path)
+        modules = imported_modules(report)
+        self.assertIn("services.inputs", modules)
+        for module in ("prompt_toolkit", "components.add_habit.controller.add_habit_controller"):
+            self.assertNotIn(module, modules)
+
+
+if __name__ == "__main__":
+    unittest.main()